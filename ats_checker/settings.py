@@ -77,6 +77,13 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Concurrent uploads write from many threads/processes: wait for SQLite's
+        # write lock instead of failing with "database is locked", and take it when
+        # a transaction begins so a read-then-write transaction can't deadlock
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
@@ -125,3 +132,105 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Resume analysis
+# Uploads are analyzed synchronously inside the upload request. Set to True to
+# queue them instead; they are then analyzed by
+# `python manage.py run_analysis_workers`, which must be running.
+ANALYSIS_USE_QUEUE = False
+
+# Uploads are hashed and validated while streaming: repeat uploads hit the content
+# cache, and bad files are dropped before they are stored or parsed
+FILE_UPLOAD_HANDLERS = [
+    'resume_analyzer.upload_handlers.ContentHashUploadHandler',
+    'resume_analyzer.upload_handlers.ValidatingUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Upload limits checked while the file streams in: size, PDF page count (when the
+# page tree is visible without decompressing), and the declared sizes of DOCX parts
+# (per-part compression ratio and total uncompressed size, against zip bombs).
+# PDFs must be unencrypted; PDF/DOCX signatures must match the extension.
+RESUME_UPLOAD_MAX_BYTES = 10 * 1024 * 1024
+RESUME_UPLOAD_MAX_PAGES = 50
+RESUME_UPLOAD_MAX_COMPRESSION_RATIO = 100
+RESUME_UPLOAD_MAX_UNCOMPRESSED_BYTES = 50 * 1024 * 1024
+
+# Extraction/analysis cache keyed by file content hash (least recently used entries are evicted)
+RESUME_CACHE_MAX_ENTRIES = 10000
+RESUME_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Eviction runs every N cache writes of a process; hits are written in batches
+# of N hits or every N seconds, whichever comes first
+RESUME_CACHE_EVICT_INTERVAL = 100
+RESUME_CACHE_FLUSH_HITS = 100
+RESUME_CACHE_FLUSH_SECONDS = 60
+
+# Text extraction stops early after this many PDF pages / characters;
+# truncation is recorded in ATSAnalysis.additional_data['extraction']
+RESUME_EXTRACTION_MAX_PAGES = 20
+RESUME_EXTRACTION_MAX_CHARS = 100000
+
+# Run PDF/DOCX parsing in recycled subprocesses with a wall-clock timeout and
+# address-space cap so malformed files can't hang or exhaust web workers.
+RESUME_EXTRACTION_ISOLATED = True
+RESUME_EXTRACTION_WORKERS = 2
+RESUME_EXTRACTION_TIMEOUT = 30  # seconds
+RESUME_EXTRACTION_MEMORY_LIMIT_MB = 512
+RESUME_EXTRACTION_MAX_JOBS_PER_WORKER = 50
+
+# Per-stage analysis latency histograms served at /metrics (Prometheus text format).
+# Each process reports the analyses it ran; queue workers can serve their own
+# with `run_analysis_workers --metrics-port`.
+ANALYSIS_METRICS_ENABLED = True
+
+# The analysis history is keyset-paginated; its total is approximate (planner
+# estimate on PostgreSQL, otherwise a COUNT(*) cached for this many seconds).
+ANALYSIS_LIST_SHOW_COUNT = True
+ANALYSIS_LIST_COUNT_TIMEOUT = 300
+
+# Analysis result pages are served with ETag/Last-Modified (304 on revalidation)
+# and kept rendered in a per-process LRU of at most this many bytes. Bump the
+# version after changing the result templates so clients refetch.
+ANALYSIS_PAGE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+ANALYSIS_PAGE_CACHE_VERSION = '3'
+
+# Each process rechecks the per-industry keyword revisions at most this often
+# (seconds) so keyword edits and imports made elsewhere reach compiled catalogs
+KEYWORD_CATALOG_CHECK_INTERVAL = 5
+
+# Uploads can be scored against a pasted/uploaded job description instead of an
+# industry: at most this many keywords are extracted from it, and compiled
+# job-description catalogs are kept in a per-process LRU of this many entries.
+JOB_DESCRIPTION_MAX_KEYWORDS = 40
+JOB_DESCRIPTION_CACHE_SIZE = 256
+JOB_DESCRIPTION_MAX_CHARS = 20000
+
+# Full-text search over analyzed resumes (/search/, /api/search/). None picks the
+# backend for the database (SQLite FTS5, PostgreSQL text search, else unindexed
+# icontains); set a dotted path to a SearchBackend subclass to plug in another.
+ANALYSIS_SEARCH_BACKEND = None
+
+# Stamped on new analyses as analysis_version. After changing the score weights
+# in resume_analyzer/scoring.py, bump it and run `manage.py rescore` to update
+# stored analyses (their result-page ETags change with the version).
+ANALYSIS_SCORING_VERSION = '1.0'
+
+# Readability is scored in-process (resume_analyzer/readability.py, matching
+# textstat's Flesch scores); syllable counts of at most this many distinct
+# words are kept in a per-process LRU.
+READABILITY_SYLLABLE_CACHE_SIZE = 50000
+
+# Under an ASGI server (e.g. `uvicorn ats_checker.asgi:application`) set this to
+# serve the home page from the async upload view (always at /upload/): analyses
+# without the queue then run in a shared pool of this many processes (None: one
+# per CPU) instead of on the request thread.
+ANALYSIS_ASYNC_UPLOADS = False
+ANALYSIS_PROCESS_WORKERS = None
+
+# JSON API (/api/batch/, /api/jobs/, /api/analyses/): limits on files per batch
+# and ids per bulk lookup. Set API_TOKEN to require an
+# "Authorization: Bearer <token>" header on every API request.
+API_BATCH_MAX_FILES = 50
+API_MAX_IDS = 500
+API_TOKEN = None
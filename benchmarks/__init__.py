@@ -0,0 +1 @@
+"""Performance benchmarks for the resume analyzer (run with ``python -m benchmarks.run``)"""
@@ -0,0 +1,66 @@
+"""Compare two benchmark reports written by benchmarks.run.
+
+    python -m benchmarks.compare before.json after.json [--threshold 10]
+
+Prints the median latency of every (stage, file type, pages, catalog size)
+present in both reports and flags changes larger than the threshold.
+"""
+import argparse
+import json
+import sys
+
+
+def _key(result):
+    return result['stage'], result['file_type'], result['pages'], result['catalog_size']
+
+
+def load_results(path):
+    with open(path) as file:
+        report = json.load(file)
+    return report.get('meta', {}), {_key(result): result for result in report.get('results', [])}
+
+
+def compare(before, after, threshold):
+    """Return rows of (key, before ms, after ms, percent change, flag) for shared keys"""
+    rows = []
+    for key in sorted(set(before) & set(after)):
+        old = before[key]['median_ms']
+        new = after[key]['median_ms']
+        change = (new - old) / old * 100 if old else 0.0
+        flag = ''
+        if change >= threshold:
+            flag = 'slower'
+        elif change <= -threshold:
+            flag = 'faster'
+        rows.append((key, old, new, change, flag))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent change in median latency to flag (default: 10)')
+    args = parser.parse_args()
+
+    before_meta, before = load_results(args.before)
+    after_meta, after = load_results(args.after)
+    print(f"before: {before_meta.get('commit') or args.before}   after: {after_meta.get('commit') or args.after}")
+    print(f"{'stage':16} {'type':5} {'pages':>5} {'terms':>6} {'before ms':>11} {'after ms':>11} {'change':>8}")
+
+    rows = compare(before, after, args.threshold)
+    for (stage, file_type, pages, catalog_size), old, new, change, flag in rows:
+        print(f'{stage:16} {file_type:5} {pages:>5} {catalog_size:>6} {old:>11.2f} {new:>11.2f} {change:>+7.1f}% {flag}')
+
+    only = len(set(before) ^ set(after))
+    if only:
+        print(f'{only} result(s) appear in only one report and were skipped')
+    slower = sum(1 for row in rows if row[4] == 'slower')
+    faster = sum(1 for row in rows if row[4] == 'faster')
+    print(f'{len(rows)} compared: {slower} slower, {faster} faster (threshold {args.threshold:g}%)')
+    return 1 if slower else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Compare concurrent uploads through the WSGI view and the async (ASGI) view.
+
+Posts distinct synthetic resumes (so the content cache never answers) with
+analysis in the request (ANALYSIS_USE_QUEUE off):
+
+- wsgi: the sync home view through Django's WSGI handler, from a pool of
+  --threads threads, like a threaded WSGI server;
+- asgi: the async upload view through Django's ASGI handler, all requests in
+  flight at once on one event loop, with the analysis in the process pool.
+  The event loop's worst stall is measured by a ticker task.
+
+Requests go through the handlers in-process (Django's test clients), so no
+server or network is involved. It uses a temporary database and media
+directory, so your data is never touched.
+
+    python -m benchmarks.concurrency --requests 200 --threads 8
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.corpus import resume_lines, synthetic_keywords, write_pdf
+from benchmarks.run import BENCHMARK_INDUSTRY
+
+
+SETTINGS_TEMPLATE = '''from ats_checker.settings import *  # noqa: F401,F403
+
+# The shipped database settings (OPTIONS included), on a throwaway file
+DATABASES = {{'default': dict(DATABASES['default'], NAME={database!r})}}
+MEDIA_ROOT = {media!r}
+ALLOWED_HOSTS = ['*']
+ANALYSIS_USE_QUEUE = False
+ANALYSIS_PROCESS_WORKERS = {workers!r}
+'''
+
+
+def setup_django(workdir, workers):
+    """Point Django (and the spawned analysis processes) at a throwaway database and media directory"""
+    with open(os.path.join(workdir, 'concurrency_settings.py'), 'w') as file:
+        file.write(SETTINGS_TEMPLATE.format(
+            database=os.path.join(workdir, 'db.sqlite3'), media=os.path.join(workdir, 'media'), workers=workers,
+        ))
+    # Spawned processes inherit sys.path and the environment
+    sys.path.insert(0, workdir)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'concurrency_settings'
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+    from benchmarks.run import load_catalog
+    load_catalog(synthetic_keywords(100))
+
+
+def make_uploads(directory, count, pages, seed=0):
+    """Return count distinct PDF resumes as (name, bytes)"""
+    keywords = synthetic_keywords(100, seed)
+    uploads = []
+    for index in range(count):
+        path = os.path.join(directory, f'resume_{index:04d}.pdf')
+        write_pdf(path, resume_lines(pages, keywords, seed + index))
+        with open(path, 'rb') as file:
+            uploads.append((os.path.basename(path), file.read()))
+        os.unlink(path)
+    return uploads
+
+
+def upload_data(upload):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    name, content = upload
+    return {'industry': BENCHMARK_INDUSTRY, 'file': SimpleUploadedFile(name, content, 'application/pdf')}
+
+
+def check(response):
+    """Raise unless the upload was analyzed (the views report failures as messages and redirect home)"""
+    if response.status_code != 302 or '/analysis/' not in response.get('Location', ''):
+        from django.contrib.messages import get_messages
+        errors = [str(message) for message in get_messages(response.wsgi_request)] if hasattr(response, 'wsgi_request') else []
+        raise RuntimeError(f'Upload failed with status {response.status_code}: {errors or response.get("Location")}')
+
+
+def run_wsgi(uploads, threads):
+    """Post every upload to the sync view from a thread pool; returns (wall seconds, latencies)"""
+    from django.db import connections
+    from django.test import Client
+
+    def post(upload):
+        started = time.perf_counter()
+        try:
+            check(Client().post('/', upload_data(upload)))
+        finally:
+            connections.close_all()
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(post, uploads))
+    return time.perf_counter() - started, latencies
+
+
+async def _run_asgi(uploads, tick):
+    from django.test import AsyncClient
+
+    client = AsyncClient()
+    stalls = []
+    done = asyncio.Event()
+
+    async def ticker():
+        # How late the loop wakes a task that asked to sleep `tick` seconds
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(tick)
+            stalls.append(time.perf_counter() - started - tick)
+
+    async def post(upload):
+        started = time.perf_counter()
+        check(await client.post('/upload/', upload_data(upload)))
+        return time.perf_counter() - started
+
+    ticking = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(post(upload) for upload in uploads))
+    wall = time.perf_counter() - started
+    done.set()
+    await ticking
+    return wall, list(latencies), max(stalls, default=0.0)
+
+
+def run_asgi(uploads, tick=0.01):
+    """Post every upload to the async view at once; returns (wall seconds, latencies, worst loop stall)"""
+    return asyncio.run(_run_asgi(uploads, tick))
+
+
+def summarize(wall, latencies):
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'wall_s': round(wall, 3),
+        'requests_per_s': round(len(ordered) / wall, 2) if wall else None,
+        'median_ms': round(statistics.median(ordered) * 1000, 1),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] * 1000, 1),
+        'max_ms': round(ordered[-1] * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200, help='Uploads per mode')
+    parser.add_argument('--threads', type=int, default=8, help='WSGI server threads')
+    parser.add_argument('--workers', type=int, default=None, help='Analysis processes (default: one per CPU)')
+    parser.add_argument('--pages', type=int, default=2, help='Pages per resume')
+    parser.add_argument('--modes', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='ats-concurrency-')
+    try:
+        setup_django(workdir, args.workers)
+        from resume_analyzer.warmup import warmup
+        warmup(industries=[BENCHMARK_INDUSTRY], nltk_data=False)
+
+        # One untimed upload per mode starts the extraction workers / analysis processes
+        uploads = make_uploads(workdir, args.requests + 1, args.pages)
+        print(f'{args.requests} uploads of {args.pages} pages '
+              f'({sum(len(content) for _, content in uploads[1:]) / 1024:.0f} KB)', file=sys.stderr)
+
+        print(f"{'mode':6} {'requests':>8} {'wall s':>8} {'req/s':>8} {'median ms':>10} {'p95 ms':>10} "
+              f"{'max ms':>10} {'loop stall ms':>14}")
+        for mode in args.modes:
+            if mode == 'wsgi':
+                run_wsgi(uploads[:1], 1)
+                wall, latencies = run_wsgi(uploads[1:], args.threads)
+                stall = ''
+            else:
+                run_asgi(uploads[:1])
+                wall, latencies, worst = run_asgi(uploads[1:])
+                stall = f'{worst * 1000:.1f}'
+            result = summarize(wall, latencies)
+            print(f"{mode:6} {result['requests']:>8} {result['wall_s']:>8.2f} {result['requests_per_s']:>8.2f} "
+                  f"{result['median_ms']:>10.1f} {result['p95_ms']:>10.1f} {result['max_ms']:>10.1f} {stall:>14}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""Reproducible synthetic resume corpus (PDF and DOCX) for benchmarks.
+
+Files are written with the standard library only, so the corpus can be
+generated anywhere the app runs. The same seed always gives the same files.
+
+    python -m benchmarks.corpus --out /tmp/corpus --pages 1 5 20 50
+"""
+import argparse
+import os
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+
+SYLLABLES = [
+    'ka', 'lo', 'mi', 'ra', 'te', 'su', 'no', 'vi', 'ze', 'pa', 'dor', 'lin', 'tek', 'mar', 'sol',
+    'ven', 'qua', 'rix', 'bel', 'tor', 'nex', 'pro', 'dat', 'ops', 'lyt',
+]
+
+FILLER_WORDS = [
+    'the', 'team', 'project', 'customer', 'system', 'platform', 'process', 'quality', 'reporting',
+    'service', 'design', 'support', 'analysis', 'delivery', 'product', 'stakeholders', 'operations',
+    'budget', 'pipeline', 'release', 'roadmap', 'migration', 'training', 'strategy', 'performance',
+]
+
+VERBS = [
+    'Led', 'Built', 'Designed', 'Improved', 'Reduced', 'Managed', 'Delivered', 'Increased',
+    'Responsible for', 'Worked on', 'Helped with', 'Created', 'Implemented', 'Coordinated',
+]
+
+SOFT_PHRASES = ['team player', 'hard worker', 'detail oriented', 'fast learner', 'go-getter']
+
+SECTION_HEADINGS = ['Professional Experience', 'Education', 'Technical Skills', 'Certifications', 'Projects']
+
+LINES_PER_PAGE = 48
+
+
+def synthetic_keywords(count, seed=0):
+    """Return count unique (keyword, weight) pairs of one to three made-up words"""
+    rng = random.Random(f'keywords-{seed}')
+    keywords = {}
+    while len(keywords) < count:
+        words = [
+            ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+            for _ in range(rng.choice((1, 1, 2, 2, 3)))
+        ]
+        keyword = ' '.join(words).title()
+        keywords.setdefault(keyword, round(rng.uniform(1.0, 2.0), 1))
+    return list(keywords.items())
+
+
+def resume_lines(pages, keywords, seed=0):
+    """Return the lines of a synthetic resume of roughly the given number of pages"""
+    rng = random.Random(f'resume-{pages}-{seed}')
+    keyword_names = [keyword for keyword, _ in keywords]
+    lines = [
+        'Jordan Example',
+        'jordan.example@example.com | (555) 123-4567 | Springfield',
+        '',
+    ]
+
+    while len(lines) < pages * LINES_PER_PAGE:
+        lines.append(rng.choice(SECTION_HEADINGS))
+        for _ in range(rng.randint(6, 12)):
+            words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(6, 14))]
+            if keyword_names and rng.random() < 0.6:
+                words.insert(rng.randrange(len(words)), rng.choice(keyword_names))
+            if rng.random() < 0.3:
+                words.append(f'by {rng.randint(5, 60)}%')
+            if rng.random() < 0.1:
+                words.append(rng.choice(SOFT_PHRASES))
+            lines.append(f'- {rng.choice(VERBS)} ' + ' '.join(words) + '.')
+        lines.append('')
+
+    return lines[:pages * LINES_PER_PAGE]
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, lines):
+    """Write a minimal text-only PDF with LINES_PER_PAGE lines per page"""
+    pages = [lines[start:start + LINES_PER_PAGE] for start in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then (page, content) pairs
+    objects = {
+        1: b'<< /Type /Catalog /Pages 2 0 R >>',
+        3: b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    }
+    page_refs = []
+    for index, page_lines in enumerate(pages):
+        page_number = 4 + index * 2
+        content_number = page_number + 1
+        commands = ['BT', '/F1 10 Tf', '14 TL', '50 760 Td']
+        for line in page_lines:
+            commands.append(f'({_pdf_escape(line)}) Tj T*')
+        commands.append('ET')
+        stream = '\n'.join(commands).encode('latin-1', 'replace')
+        objects[content_number] = b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream)
+        objects[page_number] = (
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_number
+        )
+        page_refs.append(b'%d 0 R' % page_number)
+    objects[2] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(page_refs), len(pages))
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(output)
+        output += b'%d 0 obj\n%s\nendobj\n' % (number, objects[number])
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for number in sorted(objects):
+        output += b'%010d 00000 n \n' % offsets[number]
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+
+    with open(path, 'wb') as file:
+        file.write(output)
+
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def write_docx(path, lines):
+    """Write a minimal DOCX with one paragraph per line"""
+    paragraphs = ''.join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx_zip:
+        docx_zip.writestr('[Content_Types].xml', DOCX_CONTENT_TYPES)
+        docx_zip.writestr('_rels/.rels', DOCX_RELS)
+        docx_zip.writestr('word/document.xml', document)
+
+
+def generate_corpus(directory, pages_list, keywords, seed=0, file_types=('pdf', 'docx')):
+    """Write one resume per (file type, page count) and return [(file type, pages, path)]"""
+    os.makedirs(directory, exist_ok=True)
+    writers = {'pdf': write_pdf, 'docx': write_docx}
+    corpus = []
+    for pages in pages_list:
+        lines = resume_lines(pages, keywords, seed)
+        for file_type in file_types:
+            path = os.path.join(directory, f'resume_{pages:02d}p.{file_type}')
+            writers[file_type](path, lines)
+            corpus.append((file_type, pages, path))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', required=True, help='Directory to write the corpus to')
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 2, 5, 10, 20, 50])
+    parser.add_argument('--keywords', type=int, default=100, help='Size of the keyword catalog to draw from')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    keywords = synthetic_keywords(args.keywords, args.seed)
+    for file_type, pages, path in generate_corpus(args.out, args.pages, keywords, args.seed):
+        print(f'{file_type:5} {pages:3} pages  {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Compare the in-house readability engine with textstat on the synthetic corpus.
+
+Checks that every score is within READABILITY_TOLERANCE of textstat's and
+times both, with cold caches (new words, as on a fresh worker) and warm
+ones (words already seen, as on a long-running worker).
+
+    python -m benchmarks.readability --pages 1 5 20 --documents 20
+"""
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.corpus import resume_lines, synthetic_keywords
+
+
+# Largest difference allowed between our scores and textstat's (both round
+# to 2 decimals for reading ease and 1 for grade)
+READABILITY_TOLERANCE = 0.01
+
+
+def corpus_texts(pages_list, documents, seed=0):
+    """Plain text of `documents` synthetic resumes of each size"""
+    keywords = synthetic_keywords(100, seed)
+    return [
+        '\n'.join(resume_lines(pages, keywords, seed + index))
+        for pages in pages_list for index in range(documents)
+    ]
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def run(texts):
+    """Return the comparison as a dict of timings (ms) and the largest score differences"""
+    import textstat
+    from resume_analyzer.readability import batch_readability_scores, get_syllable_counter
+
+    engine = textstat.textstat
+
+    def textstat_scores():
+        return [(textstat.flesch_reading_ease(text), textstat.flesch_kincaid_grade(text)) for text in texts]
+
+    def clear_textstat():
+        engine._cache_clear()
+        engine.pyphen.hd.cache.clear()
+
+    clear_textstat()
+    expected, textstat_cold = timed(textstat_scores)
+    # textstat memoizes whole texts; only pyphen's per-word cache is kept warm
+    engine._cache_clear()
+    _, textstat_warm = timed(textstat_scores)
+
+    get_syllable_counter().cache_clear()
+    actual, ours_cold = timed(lambda: batch_readability_scores(texts))
+    _, ours_warm = timed(lambda: batch_readability_scores(texts))
+
+    return {
+        'documents': len(texts),
+        'characters': sum(len(text) for text in texts),
+        'textstat_cold_ms': textstat_cold,
+        'textstat_warm_ms': textstat_warm,
+        'cold_ms': ours_cold,
+        'warm_ms': ours_warm,
+        'max_ease_difference': max(abs(score.flesch_reading_ease - ease) for score, (ease, _) in zip(actual, expected)),
+        'max_grade_difference': max(abs(score.flesch_kincaid_grade - grade) for score, (_, grade) in zip(actual, expected)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 2, 5, 10, 20])
+    parser.add_argument('--documents', type=int, default=10, help='Resumes of each size')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ats_checker.settings')
+    import django
+    django.setup()
+
+    result = run(corpus_texts(args.pages, args.documents, args.seed))
+    print(f"{result['documents']} documents, {result['characters']:,} characters")
+    print(f"{'':10} {'textstat ms':>12} {'in-house ms':>12} {'speedup':>8}")
+    for label in ('cold', 'warm'):
+        before, after = result[f'textstat_{label}_ms'], result[f'{label}_ms']
+        print(f'{label:10} {before:>12.1f} {after:>12.1f} {before / after:>7.1f}x')
+    print(f"max difference: reading ease {result['max_ease_difference']:.2f}, "
+          f"grade {result['max_grade_difference']:.2f} (tolerance {READABILITY_TOLERANCE})")
+
+    if max(result['max_ease_difference'], result['max_grade_difference']) > READABILITY_TOLERANCE:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
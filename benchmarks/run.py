@@ -0,0 +1,240 @@
+"""Time each analysis stage on a synthetic corpus and write a JSON report.
+
+Runs against a throwaway in-memory database and media directory, so it never
+touches db.sqlite3 or media/.
+
+    python -m benchmarks.run --out report.json
+    python -m benchmarks.run --quick
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.corpus import generate_corpus, synthetic_keywords
+
+
+BENCHMARK_INDUSTRY = 'tech'
+
+DEFAULT_PAGES = [1, 2, 5, 10, 20, 50]
+DEFAULT_CATALOG_SIZES = [10, 100, 1000, 10000]
+QUICK_PAGES = [1, 10]
+QUICK_CATALOG_SIZES = [10, 1000]
+
+
+def setup_django(media_root):
+    """Configure Django with an in-memory database and create the schema"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ats_checker.settings')
+    import django
+    from django.conf import settings
+
+    settings.DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}}
+    settings.MEDIA_ROOT = media_root
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def load_catalog(keywords):
+    """Replace the benchmark industry's keywords and return the time to compile them (ms)"""
+    from resume_analyzer.keyword_catalog import get_catalog, invalidate_catalog
+    from resume_analyzer.models import JobKeyword
+
+    JobKeyword.objects.filter(industry=BENCHMARK_INDUSTRY).delete()
+    JobKeyword.objects.bulk_create(
+        JobKeyword(industry=BENCHMARK_INDUSTRY, keyword=keyword, weight=weight) for keyword, weight in keywords
+    )
+    # bulk_create does not send post_save, so drop the compiled catalog by hand
+    invalidate_catalog(BENCHMARK_INDUSTRY)
+
+    started = time.perf_counter()
+    get_catalog(BENCHMARK_INDUSTRY)
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(func, repeat):
+    """Call func repeat times; return per-call milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def summarize(timings, characters):
+    ordered = sorted(timings)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    mean_ms = statistics.fmean(ordered)
+    return {
+        'runs': len(ordered),
+        'mean_ms': round(mean_ms, 3),
+        'median_ms': round(statistics.median(ordered), 3),
+        'min_ms': round(ordered[0], 3),
+        'max_ms': round(ordered[-1], 3),
+        'p95_ms': round(ordered[p95_index], 3),
+        'stdev_ms': round(statistics.stdev(ordered), 3) if len(ordered) > 1 else 0.0,
+        'docs_per_s': round(1000 / mean_ms, 2) if mean_ms else None,
+        'chars_per_s': round(characters * 1000 / mean_ms) if mean_ms else None,
+    }
+
+
+def stage_benchmarks(path, repeat):
+    """Time each stage of the analysis on one file; yields (stage, timings)"""
+    from resume_analyzer import utils
+    from resume_analyzer.analysis_context import AnalysisContext
+    from resume_analyzer.extraction import extract_file
+
+    # Extraction is timed without page or character limits so every page is parsed
+    yield 'extraction', measure(lambda: extract_file(path, None, None), repeat)
+
+    text, extraction = extract_file(path, None, None)
+
+    # Each stage gets a fresh context so it pays for its own lowercasing and keyword scan
+    yield 'keyword_density', measure(
+        lambda: utils.calculate_keyword_density(AnalysisContext(text), BENCHMARK_INDUSTRY), repeat
+    )
+    yield 'text_issues', measure(
+        lambda: utils.analyze_text_issues(AnalysisContext(text), BENCHMARK_INDUSTRY), repeat
+    )
+    yield 'readability', measure(lambda: utils.calculate_readability(text), repeat)
+
+    analysis = utils.build_analysis(text, BENCHMARK_INDUSTRY, extraction)
+
+    def score():
+        utils.calculate_overall_score(analysis)
+        utils.generate_recommendations(analysis)
+        utils.analyze_section_improvements(analysis)
+
+    yield 'scoring', measure(score, repeat)
+    yield 'build_analysis', measure(lambda: utils.build_analysis(text, BENCHMARK_INDUSTRY, extraction), repeat)
+    yield 'analyze_resume', measure_analyze_resume(path, repeat)
+
+
+def measure_analyze_resume(path, repeat):
+    """Time analyze_resume end to end on a stored resume, with the content cache emptied each run"""
+    from django.core.files import File
+    from django.core.files.storage import default_storage
+
+    from resume_analyzer.content_cache import purge
+    from resume_analyzer.models import ATSAnalysis, Resume
+    from resume_analyzer.utils import analyze_resume
+
+    with open(path, 'rb') as source:
+        storage_name = default_storage.save(f'resumes/{os.path.basename(path)}', File(source))
+    resume = Resume.objects.create(name='Benchmark', file=storage_name, original_filename=os.path.basename(path))
+
+    timings = []
+    for _ in range(repeat):
+        purge()
+        ATSAnalysis.objects.filter(resume=resume).delete()
+        resume.content_hash = ''
+        started = time.perf_counter()
+        analyze_resume(resume, BENCHMARK_INDUSTRY)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    resume.delete()
+    default_storage.delete(storage_name)
+    return timings
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run(pages_list, catalog_sizes, repeat, seed, file_types, log=print):
+    """Run the full matrix and return the report dict"""
+    workdir = tempfile.mkdtemp(prefix='ats-bench-')
+    try:
+        setup_django(os.path.join(workdir, 'media'))
+        from resume_analyzer.extraction import extract_file
+        from resume_analyzer.warmup import warmup
+        warmup(industries=[BENCHMARK_INDUSTRY])
+
+        results = []
+        catalogs = []
+        for catalog_size in catalog_sizes:
+            keywords = synthetic_keywords(catalog_size, seed)
+            compile_ms = load_catalog(keywords)
+            catalogs.append({'catalog_size': catalog_size, 'compile_ms': round(compile_ms, 3)})
+            log(f'catalog {catalog_size:>6} terms: compiled in {compile_ms:.1f} ms')
+
+            corpus_dir = os.path.join(workdir, f'corpus-{catalog_size}')
+            for file_type, pages, path in generate_corpus(corpus_dir, pages_list, keywords, seed, file_types):
+                characters = len(extract_file(path, None, None)[0])
+                for stage, timings in stage_benchmarks(path, repeat):
+                    result = {
+                        'stage': stage,
+                        'file_type': file_type,
+                        'pages': pages,
+                        'catalog_size': catalog_size,
+                        'file_bytes': os.path.getsize(path),
+                        'characters': characters,
+                    }
+                    result.update(summarize(timings, characters))
+                    results.append(result)
+                    log(f'  {file_type:4} {pages:>3}p {stage:16} median {result["median_ms"]:>10.2f} ms')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'pages': pages_list,
+            'catalog_sizes': catalog_sizes,
+            'file_types': list(file_types),
+        },
+        'catalogs': catalogs,
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', help='Write the JSON report here (default: stdout)')
+    parser.add_argument('--pages', type=int, nargs='+', help=f'Resume sizes in pages (default: {DEFAULT_PAGES})')
+    parser.add_argument('--catalog-sizes', type=int, nargs='+',
+                        help=f'Keyword catalog sizes (default: {DEFAULT_CATALOG_SIZES})')
+    parser.add_argument('--file-types', nargs='+', choices=['pdf', 'docx'], default=['pdf', 'docx'])
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per stage')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quick', action='store_true', help='Small matrix for a fast sanity check')
+    args = parser.parse_args()
+
+    pages_list = args.pages or (QUICK_PAGES if args.quick else DEFAULT_PAGES)
+    catalog_sizes = args.catalog_sizes or (QUICK_CATALOG_SIZES if args.quick else DEFAULT_CATALOG_SIZES)
+    repeat = 2 if args.quick and args.repeat == 5 else max(1, args.repeat)
+
+    report = run(pages_list, catalog_sizes, repeat, args.seed, args.file_types, log=lambda line: print(line, file=sys.stderr))
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as file:
+            file.write(output + '\n')
+        print(f'Wrote {len(report["results"])} results to {args.out}', file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+import re
+from bisect import bisect_right
+from functools import cached_property
+
+from .keyword_catalog import resolve_catalog
+from .text_rules import get_rule_set
+
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE)
+PHONE_PATTERN = re.compile(
+    r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b'  # US format
+    r'|\(\d{3}\)\s?\d{3}[-.\s]?\d{4}'  # (123) 456-7890
+    r'|\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}'  # International
+)
+TABLE_LAYOUT_PATTERN = re.compile(r'\t{2,}|\s{5,}')
+SPECIAL_CHAR_PATTERN = re.compile(r'[^\w\s\-.,;:!?()@]')
+METRICS_PATTERN = re.compile(r'\d+%|\$\d+|\d+\+|increased by \d+|reduced \d+|managed \d+')
+
+
+def lower_aligned(text):
+    """text.lower(), keeping every character at its offset in text
+
+    A few characters lowercase to more than one ("İ" to "i" and a combining
+    dot); only the first is kept, so offsets found in the lowercased text
+    also index the original.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(char.lower()[0] for char in text)
+
+
+class AnalysisContext:
+    """Text derived once from a resume and shared by every analysis check
+
+    Each property is computed on first access and reused, so the checks in
+    utils.py never lowercase, split or rescan the same text twice.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self._keyword_scans = {}
+
+    @classmethod
+    def of(cls, text_or_context):
+        """Return the given context, or build one from raw text"""
+        if isinstance(text_or_context, cls):
+            return text_or_context
+        return cls(text_or_context or '')
+
+    @cached_property
+    def text_lower(self):
+        # Offsets of rule and keyword matches slice the original-case lines
+        return lower_aligned(self.text)
+
+    @cached_property
+    def lines(self):
+        return self.text.split('\n')
+
+    @cached_property
+    def lines_lower(self):
+        # lower() never adds or removes newlines, so these align with self.lines
+        return self.text_lower.split('\n')
+
+    @cached_property
+    def line_offsets(self):
+        """(start, end) of each line within text_lower"""
+        offsets = []
+        offset = 0
+        for line in self.lines_lower:
+            offsets.append((offset, offset + len(line)))
+            offset += len(line) + 1
+        return offsets
+
+    @cached_property
+    def _line_starts(self):
+        return [start for start, _ in self.line_offsets]
+
+    @cached_property
+    def words(self):
+        return self.text.split()
+
+    @cached_property
+    def word_count(self):
+        return len(self.words)
+
+    @cached_property
+    def has_email(self):
+        return bool(EMAIL_PATTERN.search(self.text))
+
+    @cached_property
+    def has_phone(self):
+        return bool(PHONE_PATTERN.search(self.text))
+
+    @cached_property
+    def has_table_layout(self):
+        return bool(TABLE_LAYOUT_PATTERN.search(self.text))
+
+    @cached_property
+    def special_char_count(self):
+        return len(SPECIAL_CHAR_PATTERN.findall(self.text))
+
+    @cached_property
+    def has_metrics(self):
+        return bool(METRICS_PATTERN.search(self.text))
+
+    def line_index(self, position):
+        """Return the index of the line containing a text_lower offset"""
+        return bisect_right(self._line_starts, position) - 1
+
+    @cached_property
+    def rule_matches_by_line(self):
+        """Text rule matches (see text_rules.py) grouped by line index, each line's in text order
+
+        One scan of the whole text finds every occurrence of every rule.
+        """
+        by_line = {}
+        for match in get_rule_set().scan(self.text_lower):
+            by_line.setdefault(self.line_index(match.start), []).append(match)
+        return by_line
+
+    def keyword_scan(self, source):
+        """Return the (memoized) scan of this text against an industry's (or a given) keyword catalog"""
+        scan = self._keyword_scans.get(source)
+        if scan is None:
+            scan = resolve_catalog(source).scan(self.text_lower)
+            self._keyword_scans[source] = scan
+        return scan
@@ -0,0 +1,92 @@
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .metrics import StageTimer, file_type_of, observe_timings
+
+
+def _init_worker(memory_limit_mb):
+    """Set up Django in a spawned analysis process and cap its memory"""
+    import django
+    django.setup()
+
+    from .extraction_pool import guard_process
+    guard_process(memory_limit_mb)
+
+
+def _build_analysis(file_path, industry, content_hash, job_description, content):
+    """Extract and analyze one resume in a pool process; returns (unsaved analysis, content hash, timings)"""
+    from .utils import build_analysis_for_file
+
+    timer = StageTimer()
+    analysis, content_hash = build_analysis_for_file(
+        file_path, industry, content_hash, timer, job_description, content
+    )
+    return analysis, content_hash, timer.timings
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_analysis_executor():
+    """Return the process-wide analysis pool, creating it from settings on first use
+
+    Workers are spawned (not forked from a server with an event loop and
+    threads) and run extraction in-process under RESUME_EXTRACTION_MEMORY_LIMIT_MB.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=getattr(settings, 'ANALYSIS_PROCESS_WORKERS', None) or os.cpu_count(),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(getattr(settings, 'RESUME_EXTRACTION_MEMORY_LIMIT_MB', 512),),
+                )
+                atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+    return _executor
+
+
+def _discard_executor(executor):
+    """Forget a broken pool (a worker was killed) so the next analysis starts a new one"""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def analyze_resume_async(resume, industry='general', job_description='', upload=None):
+    """analyze_resume for async views: the event loop only waits
+
+    Extraction and the CPU-bound analysis stages run in the analysis process
+    pool and the database write goes through sync_to_async, so one ASGI
+    process can hold many uploads in flight.
+    """
+    from .utils import resume_source, save_analysis
+
+    file_path, content = resume_source(resume, upload)
+    executor = get_analysis_executor()
+    try:
+        analysis, content_hash, timings = await asyncio.get_running_loop().run_in_executor(
+            executor, _build_analysis, file_path, industry, resume.content_hash, job_description, content
+        )
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        raise
+
+    timer = StageTimer()
+    timer.timings = timings
+    await sync_to_async(save_analysis)(resume, analysis, content_hash, timer)
+
+    observe_timings(timer.timings, file_type_of(resume.file.name))
+    return analysis
@@ -0,0 +1,316 @@
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.csrf import csrf_exempt
+
+from .metrics import StageTimer, file_type_of, observe_timings
+from .models import AnalysisJob, ATSAnalysis, JobKeyword, Resume
+from .utils import build_analysis_for_file, bulk_save_analyses, resume_source
+
+
+def api_view(methods):
+    """JSON API view: CSRF-exempt, limited to methods, and guarded by API_TOKEN when it is set"""
+    def decorator(view_func):
+        @csrf_exempt
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                response = JsonResponse({'error': f'Method {request.method} not allowed'}, status=405)
+                response['Allow'] = ', '.join(methods)
+                return response
+            # Checked before the body (and any upload) is read
+            token = getattr(settings, 'API_TOKEN', None)
+            if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+                return JsonResponse({'error': 'Invalid or missing API token'}, status=401)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def score_grade(score):
+    return ATSAnalysis(overall_score=score).get_score_grade()
+
+
+def _value(lookup, convert=None):
+    """A document field read from one values() lookup"""
+    if convert is None:
+        return (lookup,), lambda row: row[lookup]
+    return (lookup,), lambda row: convert(row[lookup])
+
+
+def _flags(**lookups):
+    """A document field grouping boolean columns under shorter names"""
+    return tuple(lookups.values()), lambda row: {name: row[lookup] for name, lookup in lookups.items()}
+
+
+# Result document fields: name -> (values() lookups, builder). additional_data
+# entries are read with JSON key lookups, so excluded ones (and extracted_text)
+# are never loaded from the database.
+DOCUMENT_FIELDS = {
+    'id': _value('id'),
+    'resume_id': _value('resume_id'),
+    'filename': _value('resume__original_filename'),
+    'overall_score': _value('overall_score'),
+    'grade': _value('overall_score', score_grade),
+    'industry': _value('industry'),
+    'keyword_catalog': _value('keyword_catalog'),
+    'keyword_catalog_version': _value('keyword_catalog_version'),
+    'analysis_version': _value('analysis_version'),
+    'analyzed_at': _value('analyzed_at', lambda value: value.isoformat()),
+    'extraction_status': _value('extraction_status'),
+    'word_count': _value('word_count'),
+    'keyword_density': _value('keyword_density'),
+    'readability_score': _value('readability_score'),
+    'sections': _flags(
+        clear_sections='has_clear_sections',
+        contact_info='has_contact_info',
+        work_experience='has_work_experience',
+        education='has_education',
+        skills='has_skills',
+    ),
+    'formatting': _flags(
+        images='has_images',
+        tables='has_tables',
+        special_characters='has_special_characters',
+    ),
+    'recommendations': _value('recommendations'),
+    'missing_keywords': _value('additional_data__missing_keywords'),
+    'present_keywords': _value('additional_data__present_keywords'),
+    'content_gaps': _value('additional_data__content_gaps'),
+    'section_improvements': _value('additional_data__section_improvements'),
+    'text_issues': _value('additional_data__text_issues'),
+    'extraction': _value('additional_data__extraction'),
+    'job_description': _value('additional_data__job_description'),
+    'timings': _value('additional_data__timings'),
+    'extracted_text': _value('extracted_text'),
+    'url': (('id',), lambda row: reverse('analysis_result', args=[row['id']])),
+}
+
+
+def _names(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def select_fields(fields='', exclude=''):
+    """Document fields to return: the comma-separated fields (all by default) minus the excluded ones
+
+    Raises ValueError naming unknown fields.
+    """
+    selected, excluded = _names(fields), _names(exclude)
+    unknown = [name for name in selected + excluded if name not in DOCUMENT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)} (available: {', '.join(DOCUMENT_FIELDS)})")
+    return [name for name in dict.fromkeys(selected or DOCUMENT_FIELDS) if name not in excluded]
+
+
+def parse_ids(value):
+    """Unique ids, in order, from a comma-separated list (at most API_MAX_IDS); raises ValueError"""
+    try:
+        ids = list(dict.fromkeys(int(item) for item in _names(value)))
+    except ValueError:
+        raise ValueError('ids must be a comma-separated list of integers')
+    max_ids = getattr(settings, 'API_MAX_IDS', 500)
+    if len(ids) > max_ids:
+        raise ValueError(f'At most {max_ids} ids can be requested at once')
+    return ids
+
+
+def analysis_documents(ids, fields):
+    """Compact result documents of the given analyses, keyed by id, in one query"""
+    lookups = dict.fromkeys(['id', *(lookup for name in fields for lookup in DOCUMENT_FIELDS[name][0])])
+    rows = ATSAnalysis.objects.filter(id__in=ids).values(*lookups)
+    return {row['id']: {name: DOCUMENT_FIELDS[name][1](row) for name in fields} for row in rows}
+
+
+def job_documents(ids):
+    """Status documents of the given analysis jobs, keyed by id, in one query"""
+    rows = AnalysisJob.objects.filter(id__in=ids).values(
+        'id', 'resume_id', 'status', 'analysis_id', 'error', 'created_at', 'finished_at'
+    )
+    documents = {}
+    for row in rows:
+        document = {
+            'id': row['id'],
+            'resume_id': row['resume_id'],
+            'status': row['status'],
+            'analysis_id': row['analysis_id'],
+            'created_at': row['created_at'].isoformat(),
+            'finished_at': row['finished_at'].isoformat() if row['finished_at'] else None,
+        }
+        if row['status'] == AnalysisJob.STATUS_FAILED:
+            document['error'] = row['error']
+        documents[row['id']] = document
+    return documents
+
+
+def ordered_results(documents, ids):
+    """Documents in the requested order, and the ids that were not found"""
+    return [documents[id] for id in ids if id in documents], [id for id in ids if id not in documents]
+
+
+# Per-file options a batch request or its manifest may set
+BATCH_OPTIONS = ('industry', 'job_description', 'name', 'email', 'reference')
+
+
+def parse_manifest(text, file_count):
+    """Per-file options from the manifest field: a JSON list with one object per posted file, in order
+
+    Raises ValueError if it is malformed.
+    """
+    if not text:
+        return []
+    try:
+        manifest = json.loads(text)
+    except ValueError:
+        raise ValueError('manifest is not valid JSON')
+    if not isinstance(manifest, list) or not all(isinstance(entry, dict) for entry in manifest):
+        raise ValueError('manifest must be a list of objects, one per file')
+    if len(manifest) > file_count:
+        raise ValueError(f'manifest has {len(manifest)} entries for {file_count} files')
+    return manifest
+
+
+def batch_options(defaults, entry):
+    """A file's analysis options: its manifest entry over the request's defaults; raises ValueError"""
+    unknown = [key for key in entry if key not in BATCH_OPTIONS]
+    if unknown:
+        raise ValueError(f"Unknown options: {', '.join(unknown)}")
+    options = dict(defaults, **entry)
+
+    industry = options.get('industry') or 'general'
+    if industry not in dict(JobKeyword.INDUSTRY_CHOICES):
+        raise ValueError(f'Unknown industry: {industry}')
+
+    job_description = str(options.get('job_description') or '').strip()
+    max_chars = getattr(settings, 'JOB_DESCRIPTION_MAX_CHARS', 20000)
+    if len(job_description) > max_chars:
+        raise ValueError(f'Job descriptions are limited to {max_chars} characters.')
+
+    email = str(options.get('email') or '').strip()
+    if email:
+        try:
+            validate_email(email)
+        except ValidationError:
+            raise ValueError(f'Invalid email address: {email}')
+
+    return {
+        'industry': industry,
+        'job_description': job_description,
+        'name': str(options.get('name') or '')[:Resume._meta.get_field('name').max_length],
+        'email': email or None,
+    }
+
+
+def check_resume_file(uploaded):
+    """Raise ValueError unless the uploaded file is a resume the form would accept"""
+    try:
+        Resume._meta.get_field('file').run_validators(uploaded)
+    except ValidationError as e:
+        raise ValueError(' '.join(e.messages))
+
+
+def submit_batch(posted, defaults, manifest, use_queue=True):
+    """Store every accepted file of a batch and queue (or run) its analysis
+
+    posted is posted_files() output. Resumes (and jobs) are inserted with one
+    bulk INSERT per table; without the queue the files are analyzed in turn
+    and the analyses saved the same way. If storing or inserting fails, the
+    files stored so far are deleted before the error propagates. Returns one
+    result dict per posted file, in order.
+    """
+    items = []
+    accepted = []
+    try:
+        for index, (file_name, uploaded, error, content_hash) in enumerate(posted):
+            entry = manifest[index] if index < len(manifest) else {}
+            item = {'index': index, 'filename': file_name, 'reference': entry.get('reference')}
+            items.append(item)
+            try:
+                if error:
+                    raise ValueError(error)
+                options = batch_options(defaults, entry)
+                check_resume_file(uploaded)
+            except ValueError as e:
+                item.update(status='rejected', error=str(e))
+                continue
+
+            resume = Resume(
+                name=options['name'],
+                email=options['email'],
+                original_filename=file_name,
+                content_hash=content_hash,
+            )
+            resume.file.save(file_name, uploaded, save=False)
+            accepted.append((item, resume, uploaded, options))
+
+        results = _queue_batch(accepted) if use_queue else _analyze_batch(accepted)
+    except BaseException:
+        # No row of the batch was committed: don't leave its files behind in storage
+        for _, resume, _, _ in accepted:
+            resume.file.delete(save=False)
+        raise
+
+    for item, fields, timings in results:
+        item.update(fields)
+        if timings is not None:
+            observe_timings(timings, file_type_of(item['filename']))
+    return items
+
+
+def _queue_batch(accepted):
+    """Insert the resumes and their jobs; returns (item, result fields, None) per resume"""
+    with transaction.atomic():
+        resumes = Resume.objects.bulk_create([resume for _, resume, _, _ in accepted])
+        jobs = AnalysisJob.objects.bulk_create([
+            AnalysisJob(resume=resume, industry=options['industry'], job_description=options['job_description'])
+            for resume, (_, _, _, options) in zip(resumes, accepted)
+        ])
+    return [
+        (item, {'status': AnalysisJob.STATUS_QUEUED, 'resume_id': job.resume_id, 'job_id': job.id}, None)
+        for (item, _, _, _), job in zip(accepted, jobs)
+    ]
+
+
+def _analyze_batch(accepted):
+    """Analyze each file, then insert the resumes and analyses; returns (item, result fields, timings) per analysis
+
+    Files that fail to analyze are marked failed on their item and deleted
+    from storage.
+    """
+    pairs = []
+    analyzed = []
+    for item, resume, uploaded, options in accepted:
+        timer = StageTimer()
+        try:
+            file_path, content = resume_source(resume, uploaded)
+            analysis, content_hash = build_analysis_for_file(
+                file_path, options['industry'], resume.content_hash, timer, options['job_description'], content
+            )
+        except Exception as e:
+            resume.file.delete(save=False)
+            item.update(status=AnalysisJob.STATUS_FAILED, error=f'Error analyzing resume: {e}')
+            continue
+        resume.content_hash = content_hash
+        pairs.append((resume, analysis))
+        analyzed.append((item, timer))
+
+    return [
+        (
+            item,
+            {
+                'status': AnalysisJob.STATUS_DONE,
+                'resume_id': analysis.resume_id,
+                'analysis_id': analysis.id,
+                'overall_score': analysis.overall_score,
+            },
+            timer.timings,
+        )
+        for (item, timer), analysis in zip(analyzed, bulk_save_analyses(pairs))
+    ]
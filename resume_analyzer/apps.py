@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ResumeAnalyzerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'resume_analyzer'
+
+    def ready(self):
+        # Register signal handlers (keyword catalog invalidation, search index upkeep)
+        from . import signals  # noqa: F401
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .extraction import extraction_limits
+from .models import ATSAnalysis, CachedResult
+from .scoring import scoring_version
+
+
+logger = logging.getLogger(__name__)
+
+# Fields copied between an ATSAnalysis and its cached payload
+_EXCLUDED_FIELDS = {'id', 'resume', 'analyzed_at', 'updated_at'}
+
+# Reads don't write: hits are counted here (entry id -> hits) and written,
+# with last_used_at for eviction, in one batch every RESUME_CACHE_FLUSH_HITS
+# hits or RESUME_CACHE_FLUSH_SECONDS. Eviction runs every
+# RESUME_CACHE_EVICT_INTERVAL writes of this process.
+_pending_hits = defaultdict(int)
+_pending_since = None
+_writes = 0
+_lock = threading.Lock()
+
+
+def hash_file(file, chunk_size=64 * 1024):
+    """Return the SHA-256 hex digest of a file object, reading it in chunks"""
+    hasher = hashlib.sha256()
+    if hasattr(file, 'chunks'):
+        for chunk in file.chunks(chunk_size):
+            hasher.update(chunk)
+    else:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def hash_bytes(content):
+    """Return the SHA-256 hex digest of file contents already in memory"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_path(file_path):
+    """Return the SHA-256 hex digest of a file on disk"""
+    with open(file_path, 'rb') as file:
+        return hash_file(file)
+
+
+def _limits_tag():
+    # Results extracted under different page/character limits must not be mixed
+    max_pages, max_chars = extraction_limits()
+    return f'p{max_pages}c{max_chars}'
+
+
+def text_key(content_hash):
+    return f'text:{content_hash}:{_limits_tag()}'
+
+
+def analysis_key(content_hash, industry, catalog_version):
+    # Analyses scored with older weights (see scoring.py) are not reused
+    return f'analysis:{content_hash}:{_limits_tag()}:{industry}:{catalog_version}:s{scoring_version()}'
+
+
+def _get(key):
+    try:
+        entry = CachedResult.objects.filter(key=key).values('id', 'payload').first()
+    except OperationalError as e:
+        logger.warning('Content cache read failed, treating it as a miss: %s', e)
+        return None
+    if entry is None:
+        return None
+    record_hit(entry['id'])
+    return entry['payload']
+
+
+def _set(kind, key, payload):
+    """Store an entry, replacing any under the same key; best effort, a failure is only logged"""
+    global _writes
+    entry = CachedResult(kind=kind, key=key, payload=payload, size=len(json.dumps(payload)),
+                         last_used_at=timezone.now())
+    try:
+        # A savepoint, so a failure doesn't break a surrounding transaction
+        with transaction.atomic():
+            CachedResult.objects.bulk_create(
+                [entry], update_conflicts=True, unique_fields=['key'],
+                update_fields=['kind', 'payload', 'size', 'last_used_at'],
+            )
+    except OperationalError as e:
+        logger.warning('Content cache write failed: %s', e)
+        return
+
+    with _lock:
+        _writes += 1
+        due = _writes % getattr(settings, 'RESUME_CACHE_EVICT_INTERVAL', 100) == 0
+    if due:
+        try:
+            flush_hits()
+            evict()
+        except OperationalError as e:
+            logger.warning('Content cache eviction failed: %s', e)
+
+
+def record_hit(entry_id):
+    """Count a cache hit, writing the pending counts once enough have built up"""
+    global _pending_since
+    with _lock:
+        _pending_hits[entry_id] += 1
+        if _pending_since is None:
+            _pending_since = time.monotonic()
+        due = (
+            sum(_pending_hits.values()) >= getattr(settings, 'RESUME_CACHE_FLUSH_HITS', 100)
+            or time.monotonic() - _pending_since >= getattr(settings, 'RESUME_CACHE_FLUSH_SECONDS', 60)
+        )
+    if due:
+        flush_hits()
+
+
+def flush_hits():
+    """Write the hits counted in this process: one UPDATE per distinct hit count; best effort"""
+    global _pending_since
+    with _lock:
+        pending = dict(_pending_hits)
+        _pending_hits.clear()
+        _pending_since = None
+    if not pending:
+        return
+
+    by_count = defaultdict(list)
+    for entry_id, hits in pending.items():
+        by_count[hits].append(entry_id)
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            for hits, ids in by_count.items():
+                CachedResult.objects.filter(id__in=ids).update(hits=F('hits') + hits, last_used_at=now)
+    except OperationalError as e:
+        # Dropped rather than retried: the counts only steer eviction
+        logger.warning('Content cache hit counts were not recorded: %s', e)
+
+
+def get_cached_text(content_hash):
+    """Return cached (extracted text, extraction info) for file contents, or None"""
+    payload = _get(text_key(content_hash))
+    return None if payload is None else (payload.get('text', ''), payload.get('extraction', {}))
+
+
+def cache_text(content_hash, text, extraction=None):
+    _set(CachedResult.KIND_TEXT, text_key(content_hash), {'text': text, 'extraction': extraction or {}})
+
+
+def get_cached_analysis(content_hash, industry, catalog_version):
+    """Return an unsaved ATSAnalysis rebuilt from the cache, or None"""
+    payload = _get(analysis_key(content_hash, industry, catalog_version))
+    return None if payload is None else ATSAnalysis(**payload)
+
+
+def cache_analysis(content_hash, industry, catalog_version, analysis):
+    payload = {
+        field.attname: getattr(analysis, field.attname)
+        for field in ATSAnalysis._meta.concrete_fields
+        if field.name not in _EXCLUDED_FIELDS
+    }
+    _set(CachedResult.KIND_ANALYSIS, analysis_key(content_hash, industry, catalog_version), payload)
+
+
+def cache_limits():
+    """(max entries, max bytes) from settings"""
+    return (
+        getattr(settings, 'RESUME_CACHE_MAX_ENTRIES', 10000),
+        getattr(settings, 'RESUME_CACHE_MAX_BYTES', 256 * 1024 * 1024),
+    )
+
+
+def cache_stats():
+    """Entry counts, sizes and hits per kind"""
+    flush_hits()
+    stats = {}
+    for kind, _ in CachedResult.KIND_CHOICES:
+        entries = CachedResult.objects.filter(kind=kind)
+        totals = entries.aggregate(size=Sum('size'), hits=Sum('hits'))
+        stats[kind] = {
+            'entries': entries.count(),
+            'bytes': totals['size'] or 0,
+            'hits': totals['hits'] or 0,
+        }
+    return stats
+
+
+def evict(max_entries=None, max_bytes=None):
+    """Delete least recently used entries until the cache fits its limits
+
+    The count, the size total and the walk in last-used order are all read
+    from the (last_used_at, size) index, never from the payloads.
+    """
+    default_entries, default_bytes = cache_limits()
+    max_entries = default_entries if max_entries is None else max_entries
+    max_bytes = default_bytes if max_bytes is None else max_bytes
+
+    deleted = 0
+    excess = CachedResult.objects.count() - max_entries
+    if excess > 0:
+        stale_ids = list(CachedResult.objects.order_by('last_used_at').values_list('id', flat=True)[:excess])
+        deleted += CachedResult.objects.filter(id__in=stale_ids).delete()[0]
+
+    total = CachedResult.objects.aggregate(size=Sum('size'))['size'] or 0
+    if total > max_bytes:
+        stale_ids = []
+        for entry_id, size in CachedResult.objects.order_by('last_used_at').values_list('id', 'size').iterator():
+            if total <= max_bytes:
+                break
+            stale_ids.append(entry_id)
+            total -= size
+        deleted += CachedResult.objects.filter(id__in=stale_ids).delete()[0]
+
+    return deleted
+
+
+def purge(kind=None, older_than=None):
+    """Delete cache entries, optionally only of one kind or unused since a datetime"""
+    entries = CachedResult.objects.all()
+    if kind:
+        entries = entries.filter(kind=kind)
+    if older_than is not None:
+        entries = entries.filter(last_used_at__lt=older_than)
+    return entries.delete()[0]
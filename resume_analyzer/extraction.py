@@ -0,0 +1,282 @@
+import io
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from django.conf import settings
+
+
+# Outcomes recorded in extraction info and ATSAnalysis.extraction_status
+OUTCOME_OK = 'ok'
+OUTCOME_ERROR = 'error'
+OUTCOME_TIMEOUT = 'timeout'
+OUTCOME_MEMORY_LIMIT = 'memory_limit'
+OUTCOME_CRASHED = 'crashed'
+OUTCOME_UNSUPPORTED = 'unsupported'
+
+# File signatures
+OLE2_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'  # legacy Word .doc (and other Office binaries)
+
+# WordprocessingML tags read by the streaming DOCX extractor
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_P = W_NS + 'p'
+W_T = W_NS + 't'
+W_TAB = W_NS + 'tab'
+W_BR = W_NS + 'br'
+W_CR = W_NS + 'cr'
+W_TBL = W_NS + 'tbl'
+W_TXBX = W_NS + 'txbxContent'
+# Text boxes are stored twice (DrawingML and a VML fallback); only the first copy is read
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+DOCX_HEADER_PART = re.compile(r'word/header\d*\.xml$')
+DOCX_FOOTER_PART = re.compile(r'word/footer\d*\.xml$')
+
+
+class ExtractionTimeout(Exception):
+    """Raised inside an extraction that ran past its time limit"""
+
+
+def extraction_limits():
+    """Return (max pages, max characters) for text extraction from settings"""
+    return (
+        getattr(settings, 'RESUME_EXTRACTION_MAX_PAGES', 20),
+        getattr(settings, 'RESUME_EXTRACTION_MAX_CHARS', 100000),
+    )
+
+
+def iter_pdf_pages(pdf_reader):
+    """Yield the text of each PDF page, parsing pages only as they are consumed"""
+    for page in pdf_reader.pages:
+        yield page.extract_text() or ""
+
+
+def docx_text_parts(docx_zip):
+    """Return the XML parts holding document text, in reading order: headers, body, footers"""
+    names = docx_zip.namelist()
+    headers = sorted(name for name in names if DOCX_HEADER_PART.match(name))
+    footers = sorted(name for name in names if DOCX_FOOTER_PART.match(name))
+    return headers + ['word/document.xml'] + footers
+
+
+def iter_docx_xml_paragraphs(xml_file, counts=None):
+    """Stream the text of each paragraph in a WordprocessingML part, in document order
+    
+    Paragraphs inside tables and text boxes are included. Parsed elements are
+    cleared as soon as they are read, so memory stays flat on large documents.
+    ``counts`` (optional dict) is updated with the number of tables and text boxes seen.
+    """
+    paragraphs = []  # text buffers for open (possibly nested) paragraphs
+    fallback_depth = 0
+    
+    for event, element in ElementTree.iterparse(xml_file, events=('start', 'end')):
+        tag = element.tag
+        if tag == MC_FALLBACK:
+            fallback_depth += 1 if event == 'start' else -1
+            continue
+        if fallback_depth:
+            continue
+        
+        if event == 'start':
+            if tag == W_P:
+                paragraphs.append([])
+            elif counts is not None and tag in (W_TBL, W_TXBX):
+                counts[tag] = counts.get(tag, 0) + 1
+            continue
+        
+        if tag == W_T:
+            if paragraphs:
+                paragraphs[-1].append(element.text or "")
+        elif tag == W_TAB:
+            if paragraphs:
+                paragraphs[-1].append("\t")
+        elif tag in (W_BR, W_CR):
+            if paragraphs:
+                paragraphs[-1].append("\n")
+        elif tag == W_P:
+            text = "".join(paragraphs.pop())
+            if not paragraphs:
+                element.clear()
+            yield text
+        elif tag == W_TBL and not paragraphs:
+            element.clear()
+
+
+def iter_docx_paragraphs(docx_zip, counts=None):
+    """Yield the text of every paragraph in a DOCX package"""
+    for name in docx_text_parts(docx_zip):
+        try:
+            xml_file = docx_zip.open(name)
+        except KeyError:
+            continue
+        with xml_file:
+            yield from iter_docx_xml_paragraphs(xml_file, counts)
+
+
+def collect_text(parts, max_parts=None, max_chars=None):
+    """Join streamed text parts with newlines, stopping early at the part/character limits
+    
+    Returns (text, info) where info records how much was read and why it stopped.
+    """
+    collected = []
+    chars = 0
+    info = {'parts_read': 0, 'truncated': False, 'truncation_reason': ''}
+    
+    for part in parts:
+        if max_parts is not None and info['parts_read'] >= max_parts:
+            info['truncated'] = True
+            info['truncation_reason'] = 'max_pages'
+            break
+        
+        info['parts_read'] += 1
+        if max_chars is not None and chars + len(part) > max_chars:
+            collected.append(part[:max_chars - chars])
+            info['truncated'] = True
+            info['truncation_reason'] = 'max_chars'
+            break
+        
+        collected.append(part)
+        chars += len(part) + 1
+    
+    # Stop the generator so no further pages are parsed
+    if hasattr(parts, 'close'):
+        parts.close()
+    
+    text = "\n".join(collected).strip()
+    info['characters'] = len(text)
+    return text, info
+
+
+def open_source(file_path, content=None):
+    """Open a file for reading, or wrap its already-received content"""
+    if content is not None:
+        return io.BytesIO(content)
+    return open(file_path, 'rb')
+
+
+def extract_pdf_text(file_path, max_pages=None, max_chars=None, content=None):
+    """Extract text from a PDF page by page; returns (text, extraction info)
+    
+    With content (the file's bytes) the PDF is parsed from memory and
+    file_path is only used for its name.
+    """
+    import PyPDF2
+    
+    try:
+        with open_source(file_path, content) as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            total_pages = len(pdf_reader.pages)
+            text, info = collect_text(iter_pdf_pages(pdf_reader), max_pages, max_chars)
+    except (MemoryError, ExtractionTimeout):
+        # Resource limits are handled by the caller (see extraction_pool)
+        raise
+    except Exception as e:
+        print(f"Error extracting text from PDF: {e}")
+        return "", {'outcome': OUTCOME_ERROR, 'error': str(e)}
+    
+    return text, {
+        'outcome': OUTCOME_OK,
+        'pages_read': info['parts_read'],
+        'total_pages': total_pages,
+        'characters': info['characters'],
+        'truncated': info['truncated'],
+        'truncation_reason': info['truncation_reason'],
+    }
+
+
+def extract_docx_text(file_path, max_chars=None, content=None):
+    """Extract text from a DOCX by stream-parsing its XML parts; returns (text, extraction info)
+    
+    With content (the file's bytes) the archive is read from memory.
+    """
+    counts = {}
+    try:
+        with open_source(file_path, content) as file:
+            signature = file.read(len(OLE2_SIGNATURE))
+            if signature == OLE2_SIGNATURE:
+                return "", {
+                    'outcome': OUTCOME_UNSUPPORTED,
+                    'error': 'Legacy Word .doc files are not supported',
+                }
+            
+            file.seek(0)
+            with zipfile.ZipFile(file) as docx_zip:
+                text, info = collect_text(iter_docx_paragraphs(docx_zip, counts), max_chars=max_chars)
+    except (MemoryError, ExtractionTimeout):
+        raise
+    except Exception as e:
+        print(f"Error extracting text from DOCX: {e}")
+        return "", {'outcome': OUTCOME_ERROR, 'error': str(e)}
+    
+    return text, {
+        'outcome': OUTCOME_OK,
+        'tables': counts.get(W_TBL, 0),
+        'text_boxes': counts.get(W_TXBX, 0),
+        'characters': info['characters'],
+        'truncated': info['truncated'],
+        'truncation_reason': info['truncation_reason'],
+    }
+
+
+def extract_text_from_pdf(file_path):
+    """Extract text from PDF file"""
+    max_pages, max_chars = extraction_limits()
+    return extract_pdf_text(file_path, max_pages, max_chars)[0]
+
+
+def extract_text_from_docx(file_path):
+    """Extract text from DOCX file"""
+    return extract_docx_text(file_path, extraction_limits()[1])[0]
+
+
+def extract_text_from_resume(resume):
+    """Extract text from uploaded resume file"""
+    return extract_text_from_path(resume.file.path)
+
+
+def extract_text_from_path(file_path):
+    """Extract text from a PDF or Word file on disk"""
+    return extract_text_with_info(file_path)[0]
+
+
+def extract_text_with_info(file_path, content=None):
+    """Extract text from a PDF or Word file within the configured limits; returns (text, extraction info)
+    
+    With RESUME_EXTRACTION_ISOLATED enabled the parser runs in a subprocess with a
+    time and memory limit, so a malformed file cannot hang or exhaust the caller.
+    Pass content (the file's bytes) to extract an upload held in memory.
+    """
+    max_pages, max_chars = extraction_limits()
+    
+    if getattr(settings, 'RESUME_EXTRACTION_ISOLATED', True):
+        from .extraction_pool import extract_isolated
+        return extract_isolated(file_path, max_pages, max_chars, content)
+    
+    return extract_file(file_path, max_pages, max_chars, content)
+
+
+def uploaded_file_source(uploaded):
+    """(file path, content) to extract an uploaded file from, without storing it first
+    
+    Large uploads are already spooled to a temporary file and are read from
+    there; small ones are handed over from memory.
+    """
+    if hasattr(uploaded, 'temporary_file_path'):
+        return uploaded.temporary_file_path(), None
+    uploaded.seek(0)
+    content = uploaded.read()
+    uploaded.seek(0)
+    return uploaded.name, content
+
+
+def extract_file(file_path, max_pages=None, max_chars=None, content=None):
+    """Extract text from a PDF or Word file in this process; returns (text, extraction info)"""
+    file_extension = os.path.splitext(file_path)[1].lower()
+    
+    if file_extension == '.pdf':
+        return extract_pdf_text(file_path, max_pages, max_chars, content)
+    elif file_extension in ['.docx', '.doc']:
+        return extract_docx_text(file_path, max_chars, content)
+    else:
+        return "", {'outcome': OUTCOME_ERROR, 'error': f'Unsupported file type: {file_extension}'}
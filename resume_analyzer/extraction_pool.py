@@ -0,0 +1,230 @@
+import atexit
+import multiprocessing
+import queue
+import signal
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from .extraction import (
+    OUTCOME_CRASHED, OUTCOME_MEMORY_LIMIT, OUTCOME_TIMEOUT,
+    ExtractionTimeout, extract_file,
+)
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+# Set in worker processes that already run under a memory cap (see guard_process)
+_process_guarded = False
+
+
+def apply_memory_limit(memory_limit_mb):
+    """Cap this process's address space so runaway parsing raises MemoryError"""
+    if resource is None or not memory_limit_mb:
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def guard_process(memory_limit_mb):
+    """Cap this worker process's memory and extract in it directly from now on
+
+    For pool processes that are themselves the isolation boundary (e.g. the
+    analysis process pool), so they don't each start extraction subprocesses.
+    """
+    global _process_guarded
+    apply_memory_limit(memory_limit_mb)
+    _process_guarded = True
+
+
+@contextmanager
+def time_limit(seconds):
+    """Raise ExtractionTimeout in the main thread if the block runs longer than seconds"""
+    if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def on_timeout(signum, frame):
+        raise ExtractionTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def failure(outcome, message):
+    return "", {'outcome': outcome, 'error': message}
+
+
+def extract_guarded(file_path, max_pages=None, max_chars=None, timeout=None, content=None):
+    """Extract in this process, turning timeouts and MemoryError into failure results"""
+    try:
+        with time_limit(timeout):
+            return extract_file(file_path, max_pages, max_chars, content)
+    except ExtractionTimeout:
+        return failure(OUTCOME_TIMEOUT, f'Extraction took longer than {timeout} seconds')
+    except MemoryError:
+        return failure(OUTCOME_MEMORY_LIMIT, 'Extraction exceeded the memory limit')
+
+
+def _worker_main(conn, memory_limit_mb):
+    """Subprocess loop: extract files sent over the pipe until told to stop"""
+    # The parent handles Ctrl-C and shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    apply_memory_limit(memory_limit_mb)
+
+    # Import the parser up front so the first job isn't slower than the rest
+    import PyPDF2  # noqa: F401
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        file_path, max_pages, max_chars, content = job
+        text, info = extract_guarded(file_path, max_pages, max_chars, content=content)
+        conn.send((text, info))
+        if info.get('outcome') == OUTCOME_MEMORY_LIMIT:
+            # The heap may be fragmented near the limit; let the parent start a fresh worker
+            break
+
+    conn.close()
+
+
+class ExtractionWorker:
+    """One reusable extraction subprocess and its pipe"""
+
+    def __init__(self, context, memory_limit_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_limit_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def stop(self):
+        """Ask the worker to exit, killing it if it does not"""
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ExtractionPool:
+    """Reusable extraction subprocesses with a wall-clock timeout and memory cap per job
+
+    Each job runs in a worker whose address space is capped with RLIMIT_AS. Workers
+    that exceed the timeout are killed and replaced, and every worker is recycled
+    after max_jobs_per_worker jobs to bound leaks in the PDF/DOCX parsers.
+    """
+
+    def __init__(self, size=2, timeout=30, memory_limit_mb=512, max_jobs_per_worker=50):
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._context = multiprocessing.get_context('spawn')
+        self._size = size
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+        self._closed = False
+
+    def prestart(self):
+        """Start every worker now instead of on first use"""
+        missing = self._size - self._idle.qsize()
+        for _ in range(max(0, missing)):
+            self._idle.put(ExtractionWorker(self._context, self.memory_limit_mb))
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return ExtractionWorker(self._context, self.memory_limit_mb)
+
+    def _checkin(self, worker):
+        if self._closed or worker.jobs >= self.max_jobs_per_worker:
+            worker.stop()
+        else:
+            self._idle.put(worker)
+
+    def extract(self, file_path, max_pages=None, max_chars=None, content=None):
+        """Extract text in a worker subprocess; returns (text, extraction info)
+
+        Uploads held in memory are sent to the worker as content instead of a path.
+        """
+        with self._slots:
+            worker = self._checkout()
+            try:
+                worker.conn.send((file_path, max_pages, max_chars, content))
+                if not worker.conn.poll(self.timeout):
+                    worker.kill()
+                    return failure(OUTCOME_TIMEOUT, f'Extraction took longer than {self.timeout} seconds')
+                text, info = worker.conn.recv()
+            except (EOFError, BrokenPipeError, OSError):
+                # The worker died mid-job, e.g. killed by the OS or a crash in a C extension
+                worker.kill()
+                return failure(OUTCOME_CRASHED, f'Extraction worker exited with code {worker.process.exitcode}')
+
+            worker.jobs += 1
+            if info.get('outcome') == OUTCOME_MEMORY_LIMIT:
+                worker.stop()
+            else:
+                self._checkin(worker)
+            return text, info
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool():
+    """Return the process-wide extraction pool, creating it from settings on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ExtractionPool(
+                    size=getattr(settings, 'RESUME_EXTRACTION_WORKERS', 2),
+                    timeout=getattr(settings, 'RESUME_EXTRACTION_TIMEOUT', 30),
+                    memory_limit_mb=getattr(settings, 'RESUME_EXTRACTION_MEMORY_LIMIT_MB', 512),
+                    max_jobs_per_worker=getattr(settings, 'RESUME_EXTRACTION_MAX_JOBS_PER_WORKER', 50),
+                )
+                atexit.register(_pool.close)
+    return _pool
+
+
+def extract_isolated(file_path, max_pages=None, max_chars=None, content=None):
+    """Extract text with a timeout and memory limit; returns (text, extraction info)"""
+    if _process_guarded or multiprocessing.current_process().daemon:
+        # Daemonic processes (e.g. analyze_bulk's pool) cannot start subprocesses, and
+        # guarded ones need not; they apply the memory limit themselves, so only the
+        # timeout is enforced here.
+        return extract_guarded(
+            file_path, max_pages, max_chars, timeout=getattr(settings, 'RESUME_EXTRACTION_TIMEOUT', 30), content=content
+        )
+    return get_extraction_pool().extract(file_path, max_pages, max_chars, content)
@@ -1,5 +1,10 @@
+import os
+
 from django import forms
+from django.conf import settings
 from .models import Resume, JobKeyword
+from .extraction import extract_text_with_info, uploaded_file_source
+from .upload_validation import format_megabytes, upload_limits
 
 
 class ResumeUploadForm(forms.ModelForm):
@@ -12,6 +17,25 @@ class ResumeUploadForm(forms.ModelForm):
         widget=forms.Select(attrs={'class': 'form-control'})
     )
     
+    job_description = forms.CharField(
+        required=False,
+        help_text="Paste a job posting to score keywords against it instead of the industry",
+        widget=forms.Textarea(attrs={
+            'class': 'form-control',
+            'rows': 6,
+            'placeholder': 'Paste the job description (optional)'
+        })
+    )
+    
+    job_description_file = forms.FileField(
+        required=False,
+        help_text="Or upload the job description as a TXT, PDF or DOCX file",
+        widget=forms.FileInput(attrs={
+            'class': 'form-control',
+            'accept': '.txt,.pdf,.docx'
+        })
+    )
+    
     class Meta:
         model = Resume
         fields = ['name', 'email', 'file']
@@ -30,14 +54,54 @@ class ResumeUploadForm(forms.ModelForm):
             })
         }
     
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, upload_errors=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.fields['name'].required = False
         self.fields['email'].required = False
         self.fields['file'].required = True
         
         # Update help text
-        self.fields['file'].help_text = "Upload your resume in PDF or Word format (max 10MB)"
+        max_size = format_megabytes(upload_limits()['max_bytes'])
+        self.fields['file'].help_text = f"Upload your resume in PDF or Word format (max {max_size})"
+        
+        # Files rejected while streaming (see ValidatingUploadHandler) are dropped
+        # and reported as that field's error
+        for name, message in (upload_errors or {}).items():
+            if name in self.fields:
+                self.files = self.files.copy()
+                self.files.pop(name, None)
+                self.fields[name].required = True
+                self.fields[name].error_messages['required'] = message
+    
+    def clean_job_description_file(self):
+        """Read an uploaded job description into text"""
+        uploaded = self.cleaned_data.get('job_description_file')
+        if not uploaded:
+            return ''
+        
+        extension = os.path.splitext(uploaded.name)[1].lower()
+        if extension == '.txt':
+            return uploaded.read().decode('utf-8', errors='replace')
+        if extension not in ('.pdf', '.docx'):
+            raise forms.ValidationError("Job descriptions must be TXT, PDF or DOCX files.")
+        
+        # Extracted straight from the upload (memory or its temporary file)
+        text = extract_text_with_info(*uploaded_file_source(uploaded))[0]
+        if not text:
+            raise forms.ValidationError("Could not read any text from the job description file.")
+        return text
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        # Pasted text and an uploaded file are combined into one job description
+        parts = [cleaned_data.get('job_description', ''), cleaned_data.get('job_description_file', '')]
+        job_description = '\n\n'.join(part.strip() for part in parts if part and part.strip())
+        
+        max_chars = getattr(settings, 'JOB_DESCRIPTION_MAX_CHARS', 20000)
+        if len(job_description) > max_chars:
+            self.add_error('job_description', f"Job descriptions are limited to {max_chars} characters.")
+        cleaned_data['job_description'] = job_description
+        return cleaned_data
 
 
 class JobKeywordForm(forms.ModelForm):
@@ -0,0 +1,221 @@
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+
+from .keyword_catalog import KeywordCatalog
+
+
+# Bump when the extraction rules change so cached analyses aren't reused
+EXTRACTOR_VERSION = 2
+
+# Words (including tech spellings like C++, C#, Node.js, CI/CD) and the gaps between them
+TOKEN_PATTERN = re.compile(r'[A-Za-z][A-Za-z0-9+#]*(?:[./-][A-Za-z0-9+#]+)*')
+PHRASE_GAP_PATTERN = re.compile(r'[ \t]*')
+# Gaps before a phrase that make its first word a list item rather than a
+# sentence start: a comma or semicolon, or the start of a line (optionally
+# after a bullet) or of the text after a colon
+ITEM_SEPARATOR_PATTERN = re.compile(r'[,;][ \t]*\Z')
+LINE_ITEM_PATTERN = re.compile(r'(?:^|[\n:])[ \t]*(?:[-*\u2022\u00b7\u25aa\u2013][ \t]*)?\Z')
+
+# Catalog names of job description catalogs start with this
+CATALOG_PREFIX = 'jd:'
+
+# Stopwords allowed inside a phrase ("Bachelor of Science")
+PHRASE_JOINERS = frozenset({'of'})
+
+# Used when the NLTK stopword corpus is unavailable
+FALLBACK_STOPWORDS = frozenset('''
+a about above after again against all am an and any are as at be because been before being below between both
+but by can could did do does doing down during each few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not now of off on once only or other our
+ours out over own same she should so some such than that the their them then there these they this those
+through to too under until up very was we were what when where which while who whom why will with would you
+your yours
+'''.split())
+
+# Job-ad boilerplate that is never a useful resume keyword
+JOB_DESCRIPTION_STOPWORDS = frozenset('''
+ability able applicant applicants apply benefits candidate candidates company competitive day days degree
+demonstrated desired duties environment equal etc excellent experience experienced familiarity good great
+highly ideal including job join knowledge looking must new nice opportunity plus position preferred proven
+qualifications related required requirements responsibilities responsible role salary seeking skills strong
+team understanding well work working year years
+'''.split())
+
+_stopwords = None
+_stopwords_tag = None
+
+
+def stopwords():
+    """English stopwords from NLTK's corpus if it is installed, plus job-ad boilerplate
+
+    Nothing is downloaded here: manage.py warmup fetches the NLTK data. Without
+    the corpus FALLBACK_STOPWORDS is used.
+    """
+    global _stopwords, _stopwords_tag
+    if _stopwords is None:
+        words = FALLBACK_STOPWORDS
+        try:
+            import nltk
+            nltk.data.find('corpora/stopwords')
+            from nltk.corpus import stopwords as nltk_stopwords
+            words = frozenset(nltk_stopwords.words('english'))
+        except (ImportError, LookupError, OSError):
+            pass
+        words = words | JOB_DESCRIPTION_STOPWORDS
+        _stopwords_tag = hashlib.sha1(' '.join(sorted(words)).encode('utf-8')).hexdigest()[:8]
+        _stopwords = words
+    return _stopwords
+
+
+def stopwords_tag():
+    """Short digest of the stopword list in use; extracted keywords depend on it"""
+    stopwords()
+    return _stopwords_tag
+
+
+def normalize(text):
+    return ' '.join((text or '').split())
+
+
+def job_description_hash(text):
+    """SHA-256 of the job description with whitespace normalized"""
+    return hashlib.sha256(normalize(text).encode('utf-8')).hexdigest()
+
+
+def _phrases(text):
+    """Split text into runs of tokens not separated by punctuation or line breaks
+
+    Yields (tokens, start): start is 'separator' for a run after a comma or
+    semicolon, 'line' for one starting a line, a bullet or the text after a
+    colon, and None otherwise (e.g. after a full stop), so callers can tell
+    list items from words capitalized because they start a sentence.
+    """
+    phrase = []
+    start = None
+    previous_end = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        if not phrase or not PHRASE_GAP_PATTERN.fullmatch(text, previous_end, match.start()):
+            if phrase:
+                yield phrase, start
+            phrase = []
+            # Only the gap since the previous token is searched ('^' still means a real line start)
+            if ITEM_SEPARATOR_PATTERN.search(text, previous_end, match.start()):
+                start = 'separator'
+            elif LINE_ITEM_PATTERN.search(text, previous_end, match.start()):
+                start = 'line'
+            else:
+                start = None
+        phrase.append(match.group())
+        previous_end = match.end()
+    if phrase:
+        yield phrase, start
+
+
+def extract_keywords(text, max_keywords=None, max_ngram=3):
+    """Weighted (keyword, weight) pairs from a job description, heaviest first
+
+    Candidates are 1-3 word n-grams without stopwords (except "of" inside a
+    phrase) that occur twice or are capitalized mid-sentence, in a comma
+    list ("Python, Django") or as a short line or bullet ("- Kubernetes"):
+    product names, acronyms. Each scores by frequency, favoring longer phrases and
+    capitalized terms; parts of a kept phrase that never occur on their own
+    are dropped. Weights are scaled to 1.0-2.0 like JobKeyword weights.
+    """
+    if max_keywords is None:
+        max_keywords = getattr(settings, 'JOB_DESCRIPTION_MAX_KEYWORDS', 40)
+    stop = stopwords()
+
+    counts = Counter()
+    capitalized = Counter()
+    spellings = {}
+    for phrase, phrase_start in _phrases(text or ''):
+        # After a comma the first word is mid-sentence; a short line or bullet
+        # item ("- Kubernetes") is a term rather than the start of a sentence
+        item = phrase_start == 'separator' or (phrase_start == 'line' and len(phrase) <= max_ngram)
+        lowered = [token.lower() for token in phrase]
+        for size in range(1, max_ngram + 1):
+            for start in range(len(phrase) - size + 1):
+                words = lowered[start:start + size]
+                if any(word in stop and (index in (0, size - 1) or word not in PHRASE_JOINERS)
+                       for index, word in enumerate(words)):
+                    continue
+                if any(len(word) < 2 and word not in ('c', 'r') for word in words):
+                    continue
+                key = ' '.join(words)
+                counts[key] += 1
+                original = phrase[start:start + size]
+                # Capitalized mid-sentence or as a list item (not just the first word
+                # of a sentence) suggests a proper term
+                if (start > 0 or item) and all(word[0].isupper() for word in original if word.lower() not in stop):
+                    capitalized[key] += 1
+                spellings.setdefault(key, Counter())[' '.join(original)] += 1
+
+    scores = {}
+    for key, count in counts.items():
+        size = key.count(' ') + 1
+        # One lowercase mention is weak evidence; repeated or capitalized terms are kept
+        if count < 2 and not capitalized[key]:
+            continue
+        score = count * (1 + 0.5 * (size - 1))
+        if capitalized[key]:
+            score *= 1.5
+        scores[key] = score
+
+    ranked = sorted(scores, key=lambda key: (-scores[key], key))
+    kept = []
+    for key in ranked:
+        # Skip parts of an already kept phrase ("backend engineer" in "senior backend engineer")
+        # unless they also occur on their own
+        if any(f' {key} ' in f' {other} ' and counts[other] >= counts[key] for other in kept):
+            continue
+        kept.append(key)
+        if len(kept) >= max_keywords:
+            break
+
+    if not kept:
+        return []
+    top_score = scores[kept[0]]
+    keywords = []
+    for key in kept:
+        spelling = spellings[key].most_common(1)[0][0]
+        # Keep acronyms and product names as written, title-case ordinary words
+        display = spelling if any(char.isupper() for char in spelling) else spelling.title()
+        keywords.append((display, round(1.0 + scores[key] / top_score, 1)))
+    keywords.sort(key=lambda pair: -pair[1])
+    return keywords
+
+
+class JobDescriptionCatalog(KeywordCatalog):
+    """Keyword catalog compiled from one job description"""
+
+    def __init__(self, content_hash, keywords):
+        super().__init__(f'{CATALOG_PREFIX}{content_hash[:12]}', keywords)
+        self.content_hash = content_hash
+        # Hosts with and without the NLTK corpus extract different keywords
+        self.version = f'{self.version}v{EXTRACTOR_VERSION}s{stopwords_tag()}'
+
+
+# Compiled catalogs by job description hash, least recently used first
+_catalogs = OrderedDict()
+_catalogs_lock = threading.Lock()
+
+
+def get_job_description_catalog(text):
+    """Return the compiled keyword catalog for a job description, cached by its hash"""
+    content_hash = job_description_hash(text)
+    with _catalogs_lock:
+        catalog = _catalogs.get(content_hash)
+        if catalog is not None:
+            _catalogs.move_to_end(content_hash)
+            return catalog
+
+    catalog = JobDescriptionCatalog(content_hash, extract_keywords(text))
+    with _catalogs_lock:
+        _catalogs[content_hash] = catalog
+        while len(_catalogs) > getattr(settings, 'JOB_DESCRIPTION_CACHE_SIZE', 256):
+            _catalogs.popitem(last=False)
+    return catalog
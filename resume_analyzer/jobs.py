@@ -0,0 +1,90 @@
+import os
+import socket
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AnalysisJob, ATSAnalysis
+from .utils import analyze_resume
+
+
+def enqueue_analysis(resume, industry='general', job_description=''):
+    """Queue a resume for analysis by a background worker"""
+    return AnalysisJob.objects.create(resume=resume, industry=industry, job_description=job_description or '')
+
+
+def default_worker_name():
+    """Identify a worker process in job rows"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next_job(worker_name, max_candidates=10):
+    """Claim the oldest queued job for this worker, or return None
+
+    Claiming is a conditional UPDATE on the job's status, so it is atomic on
+    SQLite and Postgres alike without row locks or an external broker: when two
+    workers race for the same row only one update matches.
+    """
+    candidates = (
+        AnalysisJob.objects.filter(status=AnalysisJob.STATUS_QUEUED)
+        .order_by('created_at', 'id')
+        .values_list('id', flat=True)[:max_candidates]
+    )
+    for job_id in candidates:
+        claimed = AnalysisJob.objects.filter(id=job_id, status=AnalysisJob.STATUS_QUEUED).update(
+            status=AnalysisJob.STATUS_RUNNING,
+            claimed_by=worker_name,
+            started_at=timezone.now(),
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return AnalysisJob.objects.select_related('resume').get(id=job_id)
+    return None
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome"""
+    try:
+        # A retried job may find the analysis its previous worker already saved
+        analysis = ATSAnalysis.objects.filter(resume=job.resume).only('id').first()
+        if analysis is None:
+            analysis = analyze_resume(job.resume, job.industry, job.job_description)
+    except Exception as e:
+        AnalysisJob.objects.filter(id=job.id).update(
+            status=AnalysisJob.STATUS_FAILED,
+            error=str(e),
+            finished_at=timezone.now(),
+        )
+        job.status = AnalysisJob.STATUS_FAILED
+        job.error = str(e)
+        return job
+
+    AnalysisJob.objects.filter(id=job.id).update(
+        status=AnalysisJob.STATUS_DONE,
+        analysis=analysis,
+        error='',
+        finished_at=timezone.now(),
+    )
+    job.status = AnalysisJob.STATUS_DONE
+    job.analysis = analysis
+    return job
+
+
+def requeue_stale_jobs(timeout_seconds, max_attempts=3):
+    """Put back jobs whose worker died mid-analysis; give up after max_attempts"""
+    cutoff = timezone.now() - timedelta(seconds=timeout_seconds)
+    stale = AnalysisJob.objects.filter(status=AnalysisJob.STATUS_RUNNING, started_at__lt=cutoff)
+    with transaction.atomic():
+        failed = stale.filter(attempts__gte=max_attempts).update(
+            status=AnalysisJob.STATUS_FAILED,
+            error='Analysis did not finish after repeated attempts',
+            finished_at=timezone.now(),
+        )
+        requeued = stale.filter(attempts__lt=max_attempts).update(
+            status=AnalysisJob.STATUS_QUEUED,
+            claimed_by='',
+            started_at=None,
+        )
+    return requeued, failed
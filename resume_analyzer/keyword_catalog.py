@@ -0,0 +1,261 @@
+import hashlib
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .models import JobKeyword, KeywordCatalogRevision
+
+
+# Compiled catalogs keyed by the requested industry. Invalidated by the
+# JobKeyword signal handlers in signals.py, and by revision changes made in
+# other processes (see check_revisions).
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+_catalogs_generation = 0
+
+# Last KeywordCatalogRevision values seen by this process
+_revisions = None
+_revisions_checked_at = 0.0
+
+_NON_WORD = re.compile(r'\W')
+
+# Set while a bulk change bumps the revision itself (see deferred_revision_bumps)
+_bumps = threading.local()
+
+
+def _trie_pattern(node):
+    """Build a regex fragment from a character trie so matching costs O(length) per position"""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+
+    if len(branches) == 1 and '' not in node:
+        return branches[0]
+
+    pattern = '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # A keyword ends here; the longer continuation is optional (greedy, so longest wins)
+        pattern += '?'
+    return pattern
+
+
+def compile_keyword_pattern(keywords):
+    """Compile lowercased keywords into one word-bounded, overlap-aware regex"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    body = _trie_pattern(trie)
+    if not body:
+        return None
+
+    # The lookahead makes every match zero-width so keywords that start inside
+    # another match (e.g. "management" in "project management") are still found.
+    # Plural forms ("APIs") count as the keyword itself.
+    return re.compile(r'(?<!\w)(?=(' + body + r')(?:e?s)?(?!\w))')
+
+
+class KeywordScan:
+    """Result of scanning one text against a keyword catalog"""
+
+    def __init__(self, catalog, spans):
+        self.catalog = catalog
+        self.spans = spans
+        self._starts = [start for start, _, _ in spans]
+
+        found = set()
+        for _, _, keyword in spans:
+            found.add(keyword)
+            found.update(catalog.prefixes.get(keyword, ()))
+        self.found = found
+
+    def contains(self, keyword):
+        """Return True if the keyword occurs in the scanned text"""
+        return keyword.lower() in self.found
+
+    def found_between(self, start, end):
+        """Return the keywords (lowercased) that occur within text[start:end]"""
+        found = set()
+        index = bisect_left(self._starts, start)
+        while index < len(self.spans) and self.spans[index][0] < end:
+            span_start, span_end, keyword = self.spans[index]
+            if span_end <= end:
+                found.add(keyword)
+            found.update(
+                prefix for prefix in self.catalog.prefixes.get(keyword, ())
+                if span_start + len(prefix) <= end
+            )
+            index += 1
+        return found
+
+
+class KeywordCatalog:
+    """Compiled, in-memory keyword set for one industry"""
+
+    def __init__(self, industry, keywords):
+        # keywords: (keyword, weight) pairs ordered by descending weight
+        self.industry = industry
+        self.keywords = list(keywords)
+        self.total_weight = sum(weight for _, weight in self.keywords)
+
+        digest = hashlib.sha1()
+        for keyword, weight in sorted(self.keywords):
+            digest.update(f'{keyword}\t{weight}\n'.encode('utf-8'))
+        self.version = digest.hexdigest()[:12]
+
+        lowered = {keyword.lower() for keyword, _ in self.keywords}
+        self.pattern = compile_keyword_pattern(lowered)
+
+        # The regex reports only the longest keyword starting at each position, so
+        # record the shorter keywords that a longer one implies ("data" in "data science").
+        self.prefixes = {}
+        for keyword in lowered:
+            implied = [
+                keyword[:position] for position in range(1, len(keyword))
+                if _NON_WORD.match(keyword, position) and keyword[:position] in lowered
+            ]
+            if implied:
+                self.prefixes[keyword] = implied
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def serves(self, source):
+        """Whether this catalog holds source's own keywords rather than the general fallback"""
+        return source is self or self.industry == source
+
+    def top(self, limit):
+        """Return the highest-weighted (keyword, weight) pairs"""
+        return self.keywords[:limit]
+
+    def scan(self, text_lower):
+        """Find every keyword occurrence in already-lowercased text in a single pass"""
+        if self.pattern is None or not text_lower:
+            return KeywordScan(self, [])
+
+        spans = [
+            (match.start(1), match.end(1), match.group(1))
+            for match in self.pattern.finditer(text_lower)
+        ]
+        return KeywordScan(self, spans)
+
+    def matched_weight(self, scan):
+        """Sum the weights of catalog keywords found by a scan"""
+        return sum(weight for keyword, weight in self.keywords if keyword.lower() in scan.found)
+
+
+def _load_catalog(industry):
+    """Build a catalog from the database, falling back to general keywords"""
+    keywords = list(
+        JobKeyword.objects.filter(industry=industry)
+        .order_by('-weight', 'id')
+        .values_list('keyword', 'weight')
+    )
+    resolved = industry
+    if not keywords and industry != 'general':
+        keywords = list(
+            JobKeyword.objects.filter(industry='general')
+            .order_by('-weight', 'id')
+            .values_list('keyword', 'weight')
+        )
+        resolved = 'general'
+    return KeywordCatalog(resolved, keywords)
+
+
+def get_catalog(industry):
+    """Return the cached compiled keyword catalog for an industry"""
+    check_revisions()
+    catalog = _catalogs.get(industry)
+    if catalog is None:
+        generation = _catalogs_generation
+        catalog = _load_catalog(industry)
+        with _catalogs_lock:
+            # Don't cache a catalog that was loaded while an invalidation happened
+            if generation == _catalogs_generation:
+                catalog = _catalogs.setdefault(industry, catalog)
+    return catalog
+
+
+def resolve_catalog(source):
+    """Catalog for an industry code, or source itself if it already is a catalog"""
+    if isinstance(source, KeywordCatalog):
+        return source
+    return get_catalog(source)
+
+
+def invalidate_catalog(industry=None):
+    """Drop cached catalogs for an industry (and any that fell back to it), or all of them"""
+    global _catalogs_generation
+    with _catalogs_lock:
+        _catalogs_generation += 1
+        if industry is None:
+            _catalogs.clear()
+            return
+        for key, catalog in list(_catalogs.items()):
+            if key == industry or catalog.industry == industry or not catalog:
+                del _catalogs[key]
+
+
+def check_revisions(force=False):
+    """Drop catalogs whose industry was changed by another process
+
+    Runs at most every KEYWORD_CATALOG_CHECK_INTERVAL seconds: one small query
+    over the per-industry revision counters.
+    """
+    global _revisions, _revisions_checked_at
+    interval = getattr(settings, 'KEYWORD_CATALOG_CHECK_INTERVAL', 5)
+    now = time.monotonic()
+    if not force and _revisions is not None and now - _revisions_checked_at < interval:
+        return
+    _revisions_checked_at = now
+
+    current = dict(KeywordCatalogRevision.objects.values_list('industry', 'revision'))
+    previous, _revisions = _revisions, current
+    if previous is None:
+        # First check in this process: nothing has been compiled from older data yet
+        return
+    for industry in set(current) | set(previous):
+        if current.get(industry) != previous.get(industry):
+            invalidate_catalog(industry)
+
+
+def bump_revision(industries):
+    """Record that these industries' keywords changed, here and for every other process
+
+    The counters change in the caller's transaction; this process's compiled
+    catalogs are dropped once it commits, so no thread recompiles (and keeps)
+    a catalog from the rows as they were before the change.
+    """
+    for industry in set(industries):
+        updated = KeywordCatalogRevision.objects.filter(industry=industry).update(revision=F('revision') + 1)
+        if not updated:
+            KeywordCatalogRevision.objects.get_or_create(industry=industry, defaults={'revision': 1})
+        transaction.on_commit(partial(invalidate_catalog, industry))
+
+
+@contextmanager
+def deferred_revision_bumps():
+    """Skip the per-keyword revision bumps of the JobKeyword signals; the caller bumps once afterwards"""
+    previous = getattr(_bumps, 'deferred', False)
+    _bumps.deferred = True
+    try:
+        yield
+    finally:
+        _bumps.deferred = previous
+
+
+def revision_bumps_deferred():
+    return getattr(_bumps, 'deferred', False)
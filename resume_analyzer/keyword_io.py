@@ -0,0 +1,132 @@
+import csv
+import json
+import os
+
+from django.db import transaction
+
+from .keyword_catalog import bump_revision, deferred_revision_bumps
+from .models import JobKeyword
+
+
+FORMATS = ('csv', 'jsonl')
+MODE_MERGE = 'merge'
+MODE_REPLACE = 'replace'
+
+INDUSTRY_CODES = {code for code, _ in JobKeyword.INDUSTRY_CHOICES}
+KEYWORD_MAX_LENGTH = JobKeyword._meta.get_field('keyword').max_length
+
+
+class KeywordImportError(ValueError):
+    """A keyword file row that cannot be imported"""
+
+
+def detect_format(path, default='csv'):
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    return 'csv' if extension == 'csv' else default
+
+
+def _clean_row(row, line, default_industry):
+    industry = (row.get('industry') or default_industry or '').strip()
+    keyword = (row.get('keyword') or '').strip()
+    weight = row.get('weight')
+    if industry not in INDUSTRY_CODES:
+        raise KeywordImportError(f'line {line}: unknown industry {industry!r}')
+    if not keyword:
+        raise KeywordImportError(f'line {line}: missing keyword')
+    if len(keyword) > KEYWORD_MAX_LENGTH:
+        raise KeywordImportError(f'line {line}: keyword longer than {KEYWORD_MAX_LENGTH} characters')
+    try:
+        weight = 1.0 if weight in (None, '') else float(weight)
+    except (TypeError, ValueError):
+        raise KeywordImportError(f'line {line}: invalid weight {weight!r}')
+    return industry, keyword, weight
+
+
+def read_keywords(file, file_format='csv', default_industry=None):
+    """Yield (industry, keyword, weight) from a CSV (with a header) or JSON Lines file"""
+    if file_format == 'csv':
+        reader = csv.DictReader(file)
+        if not reader.fieldnames or 'keyword' not in reader.fieldnames:
+            raise KeywordImportError('CSV needs a header row with at least a "keyword" column')
+        for row in reader:
+            yield _clean_row(row, reader.line_num, default_industry)
+    else:
+        for line, text in enumerate(file, start=1):
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError as e:
+                raise KeywordImportError(f'line {line}: {e}')
+            if not isinstance(row, dict):
+                raise KeywordImportError(f'line {line}: expected a JSON object')
+            yield _clean_row(row, line, default_industry)
+
+
+def import_keywords(rows, mode=MODE_MERGE, batch_size=1000, industries=None):
+    """Upsert keywords in one transaction; returns counts of created, updated and deleted rows
+
+    merge keeps keywords missing from the rows; replace deletes them from every
+    industry that appears in the rows (or in ``industries``). Later duplicates
+    of an (industry, keyword) pair win.
+    """
+    keywords = {}
+    for industry, keyword, weight in rows:
+        keywords[(industry, keyword)] = weight
+    affected = {industry for industry, _ in keywords} | set(industries or [])
+
+    with transaction.atomic():
+        existing = {
+            (industry, keyword): (keyword_id, weight)
+            for keyword_id, industry, keyword, weight in JobKeyword.objects.filter(industry__in=affected)
+            .values_list('id', 'industry', 'keyword', 'weight').iterator()
+        }
+
+        JobKeyword.objects.bulk_create(
+            [JobKeyword(industry=industry, keyword=keyword, weight=weight) for (industry, keyword), weight in keywords.items()],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['industry', 'keyword'],
+            update_fields=['weight'],
+        )
+
+        deleted = 0
+        if mode == MODE_REPLACE:
+            stale_ids = [keyword_id for key, (keyword_id, _) in existing.items() if key not in keywords]
+            # post_delete is sent for every row; the revision is bumped once below instead
+            with deferred_revision_bumps():
+                for start in range(0, len(stale_ids), batch_size):
+                    deleted += JobKeyword.objects.filter(id__in=stale_ids[start:start + batch_size]).delete()[0]
+
+        # bulk_create sends no signals, so drop compiled catalogs explicitly
+        bump_revision(affected)
+
+    created = sum(1 for key in keywords if key not in existing)
+    updated = sum(1 for key, weight in keywords.items() if key in existing and existing[key][1] != weight)
+    return {'created': created, 'updated': updated, 'unchanged': len(keywords) - created - updated, 'deleted': deleted}
+
+
+EXPORT_FIELDS = ('industry', 'keyword', 'weight')
+
+
+def export_keywords(file, file_format='csv', industries=None):
+    """Write keywords ordered by industry and descending weight; returns the row count"""
+    queryset = JobKeyword.objects.order_by('industry', '-weight', 'keyword')
+    if industries:
+        queryset = queryset.filter(industry__in=industries)
+    rows = queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=2000)
+
+    count = 0
+    if file_format == 'csv':
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            file.write(json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n')
+            count += 1
+    return count
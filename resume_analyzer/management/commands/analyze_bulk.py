@@ -0,0 +1,148 @@
+import multiprocessing
+import os
+import time
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from resume_analyzer.extraction_pool import apply_memory_limit
+from resume_analyzer.models import JobKeyword, Resume, resume_upload_path
+from resume_analyzer.utils import build_analysis_for_file, bulk_save_analyses
+from resume_analyzer.warmup import format_timings, warmup
+
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+
+def _init_worker():
+    """Give each pool process its own database connections and an extraction memory cap"""
+    connections.close_all()
+    apply_memory_limit(getattr(settings, 'RESUME_EXTRACTION_MEMORY_LIMIT_MB', 512))
+
+
+def _analyze_file(task):
+    """Copy one file into media storage and analyze it (runs in a pool process)"""
+    source_path, industry = task
+    try:
+        # Duplicate files are answered from the content-hash cache
+        analysis, content_hash = build_analysis_for_file(source_path, industry)
+        with open(source_path, 'rb') as source:
+            storage_name = default_storage.save(
+                resume_upload_path(None, os.path.basename(source_path)), File(source)
+            )
+    except Exception as e:
+        return source_path, None, None, None, str(e)
+    return source_path, storage_name, content_hash, analysis, None
+
+
+class Command(BaseCommand):
+    help = 'Analyze a directory of PDF/DOCX resumes in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Directory to scan (recursively) for resumes')
+        parser.add_argument('--industry', default='general',
+                            choices=[code for code, _ in JobKeyword.INDUSTRY_CHOICES])
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Number of worker processes')
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help='Number of analyses written per database transaction')
+        parser.add_argument('--progress-every', type=int, default=100,
+                            help='Report progress after this many files')
+
+    def handle(self, *args, **options):
+        directory = os.path.abspath(options['directory'])
+        if not os.path.isdir(directory):
+            raise CommandError(f'{directory} is not a directory')
+
+        industry = options['industry']
+        batch_size = max(1, options['batch_size'])
+
+        # Files are identified by their real absolute path, so a rerun on the same
+        # directory, a parent or a child of it skips the files already analyzed
+        max_length = Resume._meta.get_field('source_path').max_length
+        found = set()
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                if filename.lower().endswith(RESUME_EXTENSIONS):
+                    path = os.path.realpath(os.path.join(root, filename))
+                    if len(path) > max_length:
+                        self.stderr.write(f'{path}: skipped, the path is longer than {max_length} characters')
+                    else:
+                        found.add(path)
+
+        done = set()
+        keys = list(found)
+        for start in range(0, len(keys), 500):
+            done.update(
+                Resume.objects.filter(source_path__in=keys[start:start + 500], processed=True)
+                .values_list('source_path', flat=True)
+            )
+
+        tasks = [(path, industry) for path in sorted(found) if path not in done]
+        self.stdout.write(
+            f'Found {len(found)} resume(s), {len(done)} already analyzed, {len(tasks)} to analyze'
+        )
+        if not tasks:
+            return
+
+        # Warm up in the parent so forked workers inherit the libraries and compiled catalog
+        timings = warmup(industries=[industry], extraction_pool=False)
+        self.stdout.write(f'Warmed up in {format_timings(timings)}')
+        connections.close_all()
+
+        started = time.monotonic()
+        processed = failed = 0
+        pending = []
+
+        with multiprocessing.Pool(max(1, options['workers']), initializer=_init_worker) as pool:
+            for source_path, storage_name, content_hash, analysis, error in pool.imap_unordered(_analyze_file, tasks, chunksize=4):
+                if error:
+                    failed += 1
+                    self.stderr.write(f'{source_path}: {error}')
+                else:
+                    pending.append((source_path, storage_name, content_hash, analysis))
+
+                if len(pending) >= batch_size:
+                    self._write_batch(pending)
+                    pending = []
+
+                processed += 1
+                if processed % options['progress_every'] == 0:
+                    self._report(processed, len(tasks), failed, started)
+
+        if pending:
+            self._write_batch(pending)
+
+        self._report(processed, len(tasks), failed, started)
+        self.stdout.write(self.style.SUCCESS(f'Analyzed {processed - failed} resume(s), {failed} failed'))
+
+    def _write_batch(self, batch):
+        """Insert a batch of resumes and their analyses in one transaction"""
+        with transaction.atomic():
+            # Drop rows left behind by an interrupted earlier run of the same files
+            Resume.objects.filter(source_path__in=[path for path, _, _, _ in batch], processed=False).delete()
+
+            bulk_save_analyses(
+                (
+                    Resume(
+                        name='',
+                        file=storage_name,
+                        # bulk_create skips Resume.save(), which would set this from the upload
+                        original_filename=os.path.basename(source_path),
+                        source_path=source_path,
+                        content_hash=content_hash,
+                    ),
+                    analysis,
+                )
+                for source_path, storage_name, content_hash, analysis in batch
+            )
+
+    def _report(self, processed, total, failed, started):
+        elapsed = time.monotonic() - started
+        rate = processed / elapsed if elapsed else 0.0
+        self.stdout.write(
+            f'{processed}/{total} files ({failed} failed) in {elapsed:.1f}s - {rate:.1f} files/s'
+        )
@@ -0,0 +1,27 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from resume_analyzer.keyword_io import FORMATS, INDUSTRY_CODES, detect_format, export_keywords
+
+
+class Command(BaseCommand):
+    help = 'Export industry keywords as CSV (industry,keyword,weight) or JSON Lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', help='File to write (default: stdout)')
+        parser.add_argument('--format', choices=FORMATS,
+                            help='File format (default: from the output extension, else csv)')
+        parser.add_argument('--industry', action='append', choices=sorted(INDUSTRY_CODES),
+                            help='Only export this industry (repeatable)')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        file_format = options['format'] or (detect_format(output) if output else 'csv')
+        
+        if output:
+            with open(output, 'w', newline='', encoding='utf-8') as file:
+                count = export_keywords(file, file_format, options['industry'])
+            self.stdout.write(self.style.SUCCESS(f'Exported {count} keyword(s) to {output}'))
+        else:
+            export_keywords(sys.stdout, file_format, options['industry'])
@@ -0,0 +1,45 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resume_analyzer.keyword_io import (
+    FORMATS, INDUSTRY_CODES, MODE_MERGE, MODE_REPLACE, KeywordImportError, detect_format, import_keywords,
+    read_keywords,
+)
+
+
+class Command(BaseCommand):
+    help = 'Import industry keywords from a CSV (industry,keyword,weight) or JSON Lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help="Path to the keyword file, or '-' for stdin")
+        parser.add_argument('--format', choices=FORMATS,
+                            help='File format (default: from the file extension, else csv)')
+        parser.add_argument('--mode', choices=[MODE_MERGE, MODE_REPLACE], default=MODE_MERGE,
+                            help='merge: upsert and keep other keywords; '
+                                 'replace: also delete keywords missing from the file in the industries it covers')
+        parser.add_argument('--industry', choices=sorted(INDUSTRY_CODES),
+                            help='Industry for rows without an industry column')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT statement')
+
+    def handle(self, *args, **options):
+        path = options['file']
+        file_format = options['format'] or detect_format(path)
+        
+        try:
+            if path == '-':
+                rows = list(read_keywords(sys.stdin, file_format, options['industry']))
+            else:
+                with open(path, newline='', encoding='utf-8') as file:
+                    rows = list(read_keywords(file, file_format, options['industry']))
+        except OSError as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+        except KeywordImportError as e:
+            raise CommandError(f'Invalid keyword file: {e}')
+        
+        industries = [options['industry']] if options['industry'] else None
+        counts = import_keywords(rows, options['mode'], max(1, options['batch_size']), industries)
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {len(rows)} row(s): {counts['created']} created, {counts['updated']} updated, "
+            f"{counts['unchanged']} unchanged, {counts['deleted']} deleted"
+        ))
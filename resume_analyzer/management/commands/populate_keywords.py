@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand
+from resume_analyzer.keyword_catalog import bump_revision
 from resume_analyzer.models import JobKeyword
 
 
@@ -59,16 +60,19 @@ class Command(BaseCommand):
             ]
         }
 
-        created_count = 0
-        for industry, keywords in keywords_data.items():
-            for keyword, weight in keywords:
-                keyword_obj, created = JobKeyword.objects.get_or_create(
-                    industry=industry,
-                    keyword=keyword,
-                    defaults={'weight': weight}
-                )
-                if created:
-                    created_count += 1
+        # Insert missing keywords in one statement; existing weights are left alone
+        before = JobKeyword.objects.count()
+        JobKeyword.objects.bulk_create(
+            [
+                JobKeyword(industry=industry, keyword=keyword, weight=weight)
+                for industry, keywords in keywords_data.items()
+                for keyword, weight in keywords
+            ],
+            ignore_conflicts=True,
+        )
+        created_count = JobKeyword.objects.count() - before
+        if created_count:
+            bump_revision(keywords_data)
 
         self.stdout.write(
             self.style.SUCCESS(f'Successfully created {created_count} keywords')
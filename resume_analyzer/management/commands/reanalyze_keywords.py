@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from resume_analyzer.models import JobKeyword
+from resume_analyzer.reanalysis import reanalyze_keywords, stale_counts
+
+
+class Command(BaseCommand):
+    help = 'Re-run the keyword stages of analyses whose industry keywords changed since they were analyzed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--industry', action='append', choices=[code for code, _ in JobKeyword.INDUSTRY_CHOICES],
+                            help='Only this industry (repeatable; default: all)')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Analyses reanalyzed and written per transaction')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many analyses are stale')
+
+    def handle(self, *args, **options):
+        counts = stale_counts(options['industry'])
+        total = sum(counts.values())
+        for industry, count in counts.items():
+            self.stdout.write(f'{industry:12} {count:8} stale analyses')
+        if options['dry_run'] or not total:
+            self.stdout.write(f'{total} analyses to reanalyze')
+            return
+        
+        started = time.monotonic()
+        done = 0
+        for industry, count in reanalyze_keywords(list(counts), max(1, options['chunk_size'])):
+            done += count
+            elapsed = time.monotonic() - started
+            rate = done / elapsed if elapsed else 0.0
+            self.stdout.write(f'{done}/{total} analyses ({industry}) in {elapsed:.1f}s - {rate:.0f} analyses/s')
+        
+        self.stdout.write(self.style.SUCCESS(f'Reanalyzed {done} analyses'))
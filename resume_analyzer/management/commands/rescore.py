@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resume_analyzer.models import ATSAnalysis
+from resume_analyzer.scoring import rescore, scoring_version
+
+
+class Command(BaseCommand):
+    help = 'Recompute scores and recommendations of stored analyses after a scoring-model change'
+
+    def add_arguments(self, parser):
+        # Django reserves --version for printing its own version
+        parser.add_argument('--scoring-version', dest='scoring_version',
+                            help='analysis_version to stamp on rescored analyses (default: ANALYSIS_SCORING_VERSION)')
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Analyses scored and written per transaction')
+        parser.add_argument('--force', action='store_true',
+                            help='Also rescore analyses already at the target version')
+
+    def handle(self, *args, **options):
+        version = options['scoring_version'] or scoring_version()
+        # Checked up front: Postgres would reject it partway through the chunks, SQLite would store it
+        max_length = ATSAnalysis._meta.get_field('analysis_version').max_length
+        if len(version) > max_length:
+            raise CommandError(f'Scoring version {version!r} is longer than {max_length} characters')
+        if version != scoring_version():
+            self.stderr.write(self.style.WARNING(
+                f'ANALYSIS_SCORING_VERSION is {scoring_version()!r}: new analyses will not be stamped {version!r}'
+            ))
+        
+        total = ATSAnalysis.objects.filter(word_count__gt=0)
+        if not options['force']:
+            total = total.exclude(analysis_version=version)
+        total = total.count()
+        self.stdout.write(f'Rescoring {total} analyses to version {version}')
+        
+        started = time.monotonic()
+        done = 0
+        for count in rescore(version, max(1, options['chunk_size']), options['force']):
+            done += count
+            elapsed = time.monotonic() - started
+            rate = done / elapsed if elapsed else 0.0
+            self.stdout.write(f'{done}/{total} analyses in {elapsed:.1f}s - {rate:.0f} analyses/s')
+        
+        self.stdout.write(self.style.SUCCESS(f'Rescored {done} analyses'))
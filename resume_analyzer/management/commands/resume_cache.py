@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from resume_analyzer.content_cache import cache_limits, cache_stats, evict, purge
+from resume_analyzer.models import CachedResult
+
+
+class Command(BaseCommand):
+    help = 'Inspect or purge the extraction/analysis content cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['stats', 'purge', 'evict'],
+                            help='stats: show usage; purge: delete entries; evict: trim to the configured limits')
+        parser.add_argument('--kind', choices=[kind for kind, _ in CachedResult.KIND_CHOICES],
+                            help='Only purge entries of this kind')
+        parser.add_argument('--older-than', type=int, metavar='DAYS',
+                            help='Only purge entries not used in this many days')
+
+    def handle(self, *args, **options):
+        action = options['action']
+        
+        if action == 'stats':
+            max_entries, max_bytes = cache_limits()
+            for kind, stats in cache_stats().items():
+                self.stdout.write(
+                    f"{kind:10} {stats['entries']:8} entries {stats['bytes'] / 1024:12.1f} KB {stats['hits']:8} hits"
+                )
+            self.stdout.write(f'Limits: {max_entries} entries, {max_bytes / (1024 * 1024):.1f} MB')
+        
+        elif action == 'purge':
+            older_than = None
+            if options['older_than'] is not None:
+                older_than = timezone.now() - timedelta(days=options['older_than'])
+            deleted = purge(kind=options['kind'], older_than=older_than)
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} cache entries'))
+        
+        else:
+            deleted = evict()
+            self.stdout.write(self.style.SUCCESS(f'Evicted {deleted} cache entries'))
@@ -0,0 +1,114 @@
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def worker_loop(worker_index, options):
+    """Pull and run queued analysis jobs until stopped"""
+    import django
+    django.setup()
+    
+    from resume_analyzer.jobs import claim_next_job, default_worker_name, requeue_stale_jobs, run_job
+    from resume_analyzer.models import JobKeyword
+    from resume_analyzer.warmup import format_timings, warmup
+    
+    # Connections inherited from the parent process must not be shared
+    connections.close_all()
+    
+    # Pay import and cache costs before taking the first job, and report them
+    timings = warmup(industries=[code for code, _ in JobKeyword.INDUSTRY_CHOICES])
+    print(f'Worker {worker_index} ready in {format_timings(timings)}', flush=True)
+    
+    if options['metrics_port']:
+        from resume_analyzer.metrics import serve_metrics
+        port = options['metrics_port'] + worker_index
+        serve_metrics(port, options['metrics_host'])
+        print(f"Worker {worker_index} serving /metrics on {options['metrics_host']}:{port}", flush=True)
+    
+    stopping = False
+    
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+    
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    
+    worker_name = f"{default_worker_name()}/{worker_index}"
+    processed = 0
+    last_stale_check = 0.0
+    
+    while not stopping:
+        now = time.monotonic()
+        if now - last_stale_check >= options['stale_after']:
+            requeue_stale_jobs(options['stale_after'])
+            last_stale_check = now
+        
+        job = claim_next_job(worker_name)
+        if job is None:
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
+            continue
+        
+        run_job(job)
+        processed += 1
+        if options['max_jobs'] and processed >= options['max_jobs']:
+            break
+    
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Run background worker processes that analyze queued resume uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Number of worker processes')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait between polls when the queue is empty')
+        parser.add_argument('--stale-after', type=int, default=300,
+                            help='Requeue running jobs that have not finished after this many seconds')
+        parser.add_argument('--max-jobs', type=int, default=0,
+                            help='Exit each worker after this many jobs (0 = no limit)')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit each worker as soon as the queue is empty')
+        parser.add_argument('--metrics-port', type=int, default=0,
+                            help='Serve each worker\'s /metrics on this port plus its index (0 = off)')
+        parser.add_argument('--metrics-host', default='127.0.0.1',
+                            help='Address the worker /metrics servers listen on (0.0.0.0 for all interfaces)')
+
+    def handle(self, *args, **options):
+        worker_count = max(1, options['workers'])
+        worker_options = {
+            'poll_interval': options['poll_interval'],
+            'stale_after': options['stale_after'],
+            'max_jobs': options['max_jobs'],
+            'once': options['once'],
+            'metrics_port': options['metrics_port'],
+            'metrics_host': options['metrics_host'],
+        }
+        
+        # Child processes open their own database connections
+        connections.close_all()
+        
+        processes = []
+        for index in range(worker_count):
+            process = multiprocessing.Process(target=worker_loop, args=(index, worker_options), daemon=False)
+            process.start()
+            processes.append(process)
+        
+        self.stdout.write(f'Started {worker_count} analysis worker(s)')
+        
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+        
+        self.stdout.write(self.style.SUCCESS('Analysis workers stopped'))
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from resume_analyzer.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Show or rebuild the full-text search index over analyzed resumes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['status', 'rebuild'],
+                            help='status: show the active backend; rebuild: re-index every analysis')
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        
+        if options['action'] == 'status':
+            self.stdout.write(f'Database: {connection.vendor}, search backend: {backend.name}')
+            return
+        
+        started = time.perf_counter()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt the {backend.name} index in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from resume_analyzer.models import JobKeyword
+from resume_analyzer.warmup import warmup
+
+
+class Command(BaseCommand):
+    help = 'Download NLTK data, load analysis libraries and report cold-start time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--industry', action='append',
+                            choices=[code for code, _ in JobKeyword.INDUSTRY_CHOICES],
+                            help='Also compile the keyword catalog for this industry (repeatable)')
+
+    def handle(self, *args, **options):
+        timings = warmup(industries=options['industry'], extraction_pool=False)
+        
+        for step, ms in timings:
+            self.stdout.write(f'{step:40} {ms:8.1f} ms')
+        total = sum(ms for _, ms in timings)
+        self.stdout.write(self.style.SUCCESS(f'Warmup finished in {total:.1f} ms'))
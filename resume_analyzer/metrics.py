@@ -0,0 +1,157 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Histogram bucket upper bounds in seconds
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Quantiles are computed over this many of the most recent observations per series
+QUANTILE_WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class StageTimer:
+    """Collects wall-clock milliseconds per named stage of one analysis"""
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started) * 1000)
+
+    def add(self, name, milliseconds):
+        self.timings[name] = self.timings.get(name, 0.0) + milliseconds
+
+    def rounded(self):
+        """Timings rounded for storage in ATSAnalysis.additional_data"""
+        return {name: round(milliseconds, 3) for name, milliseconds in self.timings.items()}
+
+
+def file_type_of(file_path):
+    """Label used to split metrics by document type"""
+    extension = os.path.splitext(file_path or '')[1].lower().lstrip('.')
+    return extension if extension in ('pdf', 'docx', 'doc') else 'other'
+
+
+class StageHistogram:
+    """Cumulative bucket counts plus a window of recent samples for quantiles"""
+
+    def __init__(self, buckets=STAGE_BUCKETS, window=QUANTILE_WINDOW):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds):
+        index = bisect_left(self.buckets, seconds)
+        if index < len(self.buckets):
+            self.bucket_counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.recent.append(seconds)
+
+    def quantile(self, q):
+        """Nearest-rank quantile of the recent window"""
+        if not self.recent:
+            return float('nan')
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+# (stage, file type) -> StageHistogram for analyses run in this process
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+def observe_timings(timings, file_type):
+    """Add one analysis's stage timings (milliseconds) to this process's histograms"""
+    with _histograms_lock:
+        for stage, milliseconds in timings.items():
+            histogram = _histograms.get((stage, file_type))
+            if histogram is None:
+                histogram = _histograms[(stage, file_type)] = StageHistogram()
+            histogram.observe(milliseconds / 1000)
+
+
+def reset():
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def _format_value(value):
+    if value != value:
+        return 'NaN'
+    return repr(float(value))
+
+
+def render_prometheus():
+    """Stage histograms and p50/p95/p99 summaries in the Prometheus text format"""
+    with _histograms_lock:
+        series = [
+            (stage, file_type, list(histogram.bucket_counts), histogram.count, histogram.sum,
+             [(q, histogram.quantile(q)) for q in QUANTILES])
+            for (stage, file_type), histogram in sorted(_histograms.items())
+        ]
+
+    lines = [
+        '# HELP ats_analysis_stage_seconds Time spent in each resume analysis stage.',
+        '# TYPE ats_analysis_stage_seconds histogram',
+    ]
+    for stage, file_type, bucket_counts, count, total, _ in series:
+        labels = f'stage="{stage}",file_type="{file_type}"'
+        cumulative = 0
+        for bound, bucket_count in zip(STAGE_BUCKETS, bucket_counts):
+            cumulative += bucket_count
+            lines.append(f'ats_analysis_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'ats_analysis_stage_seconds_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f'ats_analysis_stage_seconds_sum{{{labels}}} {_format_value(total)}')
+        lines.append(f'ats_analysis_stage_seconds_count{{{labels}}} {count}')
+
+    lines += [
+        f'# HELP ats_analysis_stage_latency_seconds Stage latency quantiles over the last {QUANTILE_WINDOW} analyses.',
+        '# TYPE ats_analysis_stage_latency_seconds summary',
+    ]
+    for stage, file_type, _, count, total, quantiles in series:
+        labels = f'stage="{stage}",file_type="{file_type}"'
+        for q, value in quantiles:
+            lines.append(f'ats_analysis_stage_latency_seconds{{{labels},quantile="{q}"}} {_format_value(value)}')
+        lines.append(f'ats_analysis_stage_latency_seconds_sum{{{labels}}} {_format_value(total)}')
+        lines.append(f'ats_analysis_stage_latency_seconds_count{{{labels}}} {count}')
+
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, host='127.0.0.1'):
+    """Serve this process's /metrics on a background thread (for worker processes); local only by default"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    return server
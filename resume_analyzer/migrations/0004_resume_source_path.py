@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analyzer', '0003_analysisjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='source_path',
+            field=models.CharField(blank=True, db_index=True, help_text='Original path for resumes imported with analyze_bulk', max_length=500),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analyzer', '0005_content_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='atsanalysis',
+            name='extraction_status',
+            field=models.CharField(choices=[('ok', 'OK'), ('error', 'Error'), ('timeout', 'Timed out'), ('memory_limit', 'Memory limit exceeded'), ('crashed', 'Worker crashed')], default='ok', max_length=20),
+        ),
+    ]
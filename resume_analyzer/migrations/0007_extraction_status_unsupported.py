@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analyzer', '0006_atsanalysis_extraction_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='atsanalysis',
+            name='extraction_status',
+            field=models.CharField(choices=[('ok', 'OK'), ('error', 'Error'), ('timeout', 'Timed out'), ('memory_limit', 'Memory limit exceeded'), ('crashed', 'Worker crashed'), ('unsupported', 'Unsupported format')], default='ok', max_length=20),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analyzer', '0007_extraction_status_unsupported'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='atsanalysis',
+            index=models.Index(fields=['analyzed_at', 'id'], name='resume_anal_analyze_7e5695_idx'),
+        ),
+    ]
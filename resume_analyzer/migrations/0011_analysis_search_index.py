@@ -0,0 +1,75 @@
+import logging
+
+from django.db import migrations
+
+
+logger = logging.getLogger(__name__)
+
+# The DDL is spelled out here rather than imported from resume_analyzer.search, so
+# later changes to the search backends don't change what this migration does.
+ANALYSIS_TABLE = 'resume_analyzer_atsanalysis'
+FTS_TABLE = 'resume_analyzer_atsanalysis_fts'
+
+SQLITE_INSTALL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"extracted_text, content='{ANALYSIS_TABLE}', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {ANALYSIS_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, extracted_text) VALUES (new.id, new.extracted_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {ANALYSIS_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, extracted_text) VALUES ('delete', old.id, old.extracted_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF extracted_text ON {ANALYSIS_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, extracted_text) VALUES ('delete', old.id, old.extracted_text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, extracted_text) VALUES (new.id, new.extracted_text); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+POSTGRES_INSTALL = [
+    f"CREATE INDEX IF NOT EXISTS {ANALYSIS_TABLE}_text_search ON {ANALYSIS_TABLE} "
+    f"USING GIN (to_tsvector('english', extracted_text))",
+]
+POSTGRES_UNINSTALL = [
+    f'DROP INDEX IF EXISTS {ANALYSIS_TABLE}_text_search',
+]
+
+
+def run(schema_editor, statements):
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def install_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        run(schema_editor, POSTGRES_INSTALL)
+    elif vendor == 'sqlite':
+        try:
+            run(schema_editor, SQLITE_INSTALL)
+        except Exception as e:
+            # e.g. SQLite built without FTS5: search falls back to the basic backend
+            logger.warning('Full-text search index not created, search will be unindexed: %s', e)
+
+
+def uninstall_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        run(schema_editor, POSTGRES_UNINSTALL)
+    elif vendor == 'sqlite':
+        run(schema_editor, SQLITE_UNINSTALL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analyzer', '0010_analysisjob_job_description'),
+    ]
+
+    operations = [
+        # FTS5 table plus sync triggers on SQLite, a GIN expression index on PostgreSQL
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
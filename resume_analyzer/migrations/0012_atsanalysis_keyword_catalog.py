@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:39
+
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Coalesce
+
+
+def copy_industry(apps, schema_editor):
+    # The requested industry was only stored in additional_data; the catalog
+    # version stays blank, so reanalyze_keywords treats these analyses as stale
+    ATSAnalysis = apps.get_model('resume_analyzer', 'ATSAnalysis')
+    ATSAnalysis.objects.update(industry=Coalesce(KeyTextTransform('industry', 'additional_data'), Value('general')))
+    
+    # Analyses scored against a job description name its catalog, which never goes stale
+    job_description_analyses = ATSAnalysis.objects.filter(additional_data__job_description__hash__isnull=False)
+    for analysis_id, content_hash in job_description_analyses.values_list('id', 'additional_data__job_description__hash'):
+        ATSAnalysis.objects.filter(id=analysis_id).update(keyword_catalog=f'jd:{content_hash[:12]}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analyzer', '0011_analysis_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='atsanalysis',
+            name='industry',
+            field=models.CharField(blank=True, db_index=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='atsanalysis',
+            name='keyword_catalog',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='atsanalysis',
+            name='keyword_catalog_version',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.RunPython(copy_industry, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:30
+
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def copy_analyzed_at(apps, schema_editor):
+    # Stored results were last written when they were analyzed, as far as we know
+    ATSAnalysis = apps.get_model('resume_analyzer', 'ATSAnalysis')
+    ATSAnalysis.objects.update(updated_at=F('analyzed_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analyzer', '0012_atsanalysis_keyword_catalog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='atsanalysis',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_analyzed_at, migrations.RunPython.noop),
+    ]
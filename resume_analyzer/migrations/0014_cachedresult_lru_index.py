@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analyzer', '0013_atsanalysis_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cachedresult',
+            name='last_used_at',
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AddIndex(
+            model_name='cachedresult',
+            index=models.Index(fields=['last_used_at', 'size'], name='resume_anal_last_us_e32dff_idx'),
+        ),
+    ]
@@ -20,18 +20,44 @@ class Resume(models.Model):
     original_filename = models.CharField(max_length=255)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     processed = models.BooleanField(default=False)
+    source_path = models.CharField(
+        max_length=500, blank=True, db_index=True,
+        help_text="Original path for resumes imported with analyze_bulk"
+    )
+    content_hash = models.CharField(
+        max_length=64, blank=True, db_index=True,
+        help_text="SHA-256 of the uploaded file contents"
+    )
     
     def __str__(self):
         return f"{self.original_filename} - {self.uploaded_at.strftime('%Y-%m-%d')}"
     
     def save(self, *args, **kwargs):
-        if self.file:
+        # Set before the file is stored, while the name is still the uploaded one
+        if self.file and not self.original_filename:
             self.original_filename = self.file.name
         super().save(*args, **kwargs)
 
 
+class ATSAnalysisQuerySet(models.QuerySet):
+    def summaries(self):
+        """Rows for listings: scores and the resume's filename, without the extracted text or additional_data"""
+        return self.select_related('resume').only(*ATSAnalysis.SUMMARY_FIELDS)
+
+
 class ATSAnalysis(models.Model):
     """Model to store ATS analysis results"""
+    # Columns listing pages need; everything else (notably extracted_text and
+    # additional_data, which dominate row size) is only loaded by detail views
+    SUMMARY_FIELDS = (
+        'resume__original_filename',
+        'overall_score',
+        'word_count',
+        'keyword_density',
+        'industry',
+        'analyzed_at',
+    )
+    
     resume = models.OneToOneField(Resume, on_delete=models.CASCADE, related_name='analysis')
     
     # Text extraction
@@ -60,13 +86,41 @@ class ATSAnalysis(models.Model):
     # Recommendations
     recommendations = models.TextField(blank=True, help_text="Suggestions for improvement")
     
+    # Text extraction outcome (see extraction.py / extraction_pool.py)
+    EXTRACTION_STATUS_CHOICES = [
+        ('ok', 'OK'),
+        ('error', 'Error'),
+        ('timeout', 'Timed out'),
+        ('memory_limit', 'Memory limit exceeded'),
+        ('crashed', 'Worker crashed'),
+        ('unsupported', 'Unsupported format'),
+    ]
+    extraction_status = models.CharField(max_length=20, choices=EXTRACTION_STATUS_CHOICES, default='ok')
+    
     # Additional analysis data (JSON field for detailed suggestions)
     additional_data = models.JSONField(default=dict, blank=True)
     
     # Analysis metadata
     analyzed_at = models.DateTimeField(auto_now_add=True)
+    # Last write of the stored results (rescoring and keyword re-analysis set it too)
+    updated_at = models.DateTimeField(auto_now=True)
     analysis_version = models.CharField(max_length=10, default="1.0")
     
+    # Keyword catalog the keyword stages ran against (see keyword_catalog.py and
+    # reanalysis.py): the requested industry, the catalog actually used (the
+    # general fallback or a job description's "jd:..." catalog) and its version
+    industry = models.CharField(max_length=20, blank=True, db_index=True)
+    keyword_catalog = models.CharField(max_length=40, blank=True)
+    keyword_catalog_version = models.CharField(max_length=40, blank=True)
+    
+    objects = ATSAnalysisQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            # Newest-first history listing with keyset pagination (see pagination.py)
+            models.Index(fields=['analyzed_at', 'id']),
+        ]
+    
     def __str__(self):
         return f"Analysis for {self.resume.original_filename} - Score: {self.overall_score:.1f}"
     
@@ -115,3 +169,83 @@ class JobKeyword(models.Model):
     
     def __str__(self):
         return f"{self.industry}: {self.keyword} (weight: {self.weight})"
+
+
+class KeywordCatalogRevision(models.Model):
+    """Change counter per industry so every process notices keyword edits made elsewhere"""
+    industry = models.CharField(max_length=20, unique=True)
+    revision = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.industry}: revision {self.revision}"
+
+
+class AnalysisJob(models.Model):
+    """Queued background analysis of an uploaded resume"""
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, related_name='job')
+    industry = models.CharField(max_length=20, choices=JobKeyword.INDUSTRY_CHOICES, default='general')
+    job_description = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    analysis = models.OneToOneField(
+        ATSAnalysis, on_delete=models.SET_NULL, null=True, blank=True, related_name='job'
+    )
+    error = models.TextField(blank=True)
+    attempts = models.IntegerField(default=0)
+    
+    # Worker bookkeeping
+    claimed_by = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Job for {self.resume.original_filename} - {self.status}"
+    
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+
+class CachedResult(models.Model):
+    """Extraction or analysis output cached by file content hash"""
+    KIND_TEXT = 'text'
+    KIND_ANALYSIS = 'analysis'
+    KIND_CHOICES = [
+        (KIND_TEXT, 'Extracted text'),
+        (KIND_ANALYSIS, 'Analysis'),
+    ]
+    
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    key = models.CharField(max_length=200, unique=True)
+    payload = models.JSONField(default=dict)
+    size = models.IntegerField(default=0, help_text="Approximate payload size in bytes")
+    hits = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            # Eviction counts, sums sizes and walks least recently used first from this
+            # index alone; the size column sits after the payload in the table rows
+            models.Index(fields=['last_used_at', 'size']),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind}: {self.key}"
@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .models import ATSAnalysis
+
+
+class RenderedPageCache:
+    """Thread-safe LRU of rendered page bodies, bounded by total bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+            return page
+
+    def set(self, key, content, content_type):
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._pages.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous[0])
+            self._pages[key] = (content, content_type)
+            self.size += len(content)
+            while self.size > self.max_bytes:
+                _, (evicted, _) = self._pages.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self.size = 0
+
+
+_pages = None
+_pages_lock = threading.Lock()
+
+
+def get_page_cache():
+    """Return the process-wide rendered-page cache, sized from settings"""
+    global _pages
+    if _pages is None:
+        with _pages_lock:
+            if _pages is None:
+                _pages = RenderedPageCache(getattr(settings, 'ANALYSIS_PAGE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    return _pages
+
+
+def analysis_page(view_func):
+    """Serve an analysis page with ETag/Last-Modified validators and from the page cache
+
+    A page depends only on the analysis row. Every write to it (rescoring
+    and keyword re-analysis included, even at an unchanged analysis_version)
+    sets updated_at, so updated_at, analysis_version, keyword_catalog_version
+    and the view identify the rendered bytes; updated_at is also the
+    Last-Modified date. Requests with pending flash messages bypass the cache
+    because base.html renders them.
+    """
+    @wraps(view_func)
+    def wrapper(request, analysis_id):
+        if request.method not in ('GET', 'HEAD') or len(get_messages(request)):
+            return view_func(request, analysis_id)
+
+        row = (
+            ATSAnalysis.objects.filter(id=analysis_id)
+            .values_list('analysis_version', 'keyword_catalog_version', 'updated_at')
+            .first()
+        )
+        if row is None:
+            # Let the view raise its 404
+            return view_func(request, analysis_id)
+
+        analysis_version, catalog_version, updated_at = row
+        page_version = getattr(settings, 'ANALYSIS_PAGE_CACHE_VERSION', '1')
+        # Microseconds: rewrites within the same second still get a new ETag
+        modified = int(updated_at.timestamp() * 1000000)
+        etag = quote_etag(f'{analysis_id}-{analysis_version}-{catalog_version}-{modified}-{page_version}')
+        last_modified = int(updated_at.timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cache = get_page_cache()
+            key = (view_func.__name__, analysis_id, analysis_version, catalog_version, modified, page_version)
+            page = cache.get(key)
+            if page is None:
+                response = view_func(request, analysis_id)
+                if response.status_code != 200 or response.streaming:
+                    return response
+                cache.set(key, response.content, response['Content-Type'])
+            else:
+                content, content_type = page
+                response = HttpResponse(content, content_type=content_type)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        # Always revalidate: rescoring or keyword re-analysis changes the ETag and Last-Modified
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    return wrapper
@@ -0,0 +1,126 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset, newest first"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, count=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+def encode_cursor(obj, fields):
+    """Opaque URL-safe cursor holding the ordering values of one row"""
+    # isoformat() keeps microseconds, which DjangoJSONEncoder would truncate
+    values = [getattr(obj, field) for field in fields]
+    values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, fields):
+    """Ordering values from a cursor, or None if it is missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(fields):
+            return None
+        return [model._meta.get_field(field).to_python(value) for field, value in zip(fields, values)]
+    except (ValueError, TypeError, ValidationError):
+        return None
+
+
+def _beyond(fields, values, lookup):
+    """Rows past values in the fields' tuple order, e.g. a <= x AND (a < x OR (a = x AND b < y))"""
+    condition = Q()
+    for index, field in enumerate(fields):
+        clause = Q(**{f'{field}__{lookup}': values[index]})
+        for equal_field, equal_value in zip(fields[:index], values[:index]):
+            clause &= Q(**{equal_field: equal_value})
+        condition |= clause
+    # The redundant bound on the leading column turns the OR into an index range seek
+    return Q(**{f'{fields[0]}__{lookup}e': values[0]}) & condition
+
+
+def keyset_page(queryset, fields=('analyzed_at', 'id'), after=None, before=None, per_page=20):
+    """Return a KeysetPage ordered by fields descending
+
+    ``after`` continues to older rows past a cursor, ``before`` goes back to
+    newer rows. Each page is an index range scan of per_page + 1 rows, so
+    deep pages cost the same as the first one.
+    """
+    model = queryset.model
+    after_values = decode_cursor(after, model, fields)
+    before_values = None if after_values else decode_cursor(before, model, fields)
+
+    if before_values:
+        # Walk towards newer rows in ascending order, then flip back
+        rows = list(
+            queryset.filter(_beyond(fields, before_values, 'gt')).order_by(*fields)[:per_page + 1]
+        )
+        has_more = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_newer, has_older = has_more, True
+    else:
+        if after_values:
+            queryset = queryset.filter(_beyond(fields, after_values, 'lt'))
+        rows = list(queryset.order_by(*[f'-{field}' for field in fields])[:per_page + 1])
+        has_older = len(rows) > per_page
+        rows = rows[:per_page]
+        has_newer = after_values is not None
+
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(rows[-1], fields) if rows and has_older else None,
+        previous_cursor=encode_cursor(rows[0], fields) if rows and has_newer else None,
+    )
+
+
+def approximate_count(queryset, cache_key, timeout=None):
+    """Row count for display without a COUNT(*) on every request
+
+    Uses the planner's estimate on PostgreSQL and a cached exact count elsewhere.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'ANALYSIS_LIST_COUNT_TIMEOUT', 300)
+
+    if connection.vendor == 'postgresql' and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+
+    count = cache.get(cache_key)
+    if count is None:
+        count = queryset.count()
+        cache.set(cache_key, count, timeout)
+    return count
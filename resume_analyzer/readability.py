@@ -0,0 +1,142 @@
+import math
+import re
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+
+
+# Same tokenization as textstat 0.7: punctuation (including apostrophes and
+# hyphens) is dropped and words are split on whitespace.
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+
+# textstat splits sentences at runs of . ! ? and ignores those of two words
+# or less (words being whitespace-separated chunks with a word character).
+# These match the start of a sentence of three words or more (the first one,
+# and one after a terminator), so they are counted in one scan instead of
+# stripping each sentence.
+_SENTENCE_WORD = r'[^.!?\s\w]*\w[^.!?\s]*'
+_WORD_GAP = r'\s+(?:[^.!?\s\w]+\s+)*'
+_COUNTED_SENTENCE = (
+    rf'\s*(?:[^.!?\s\w]+\s+)*{_SENTENCE_WORD}{_WORD_GAP}{_SENTENCE_WORD}{_WORD_GAP}{_SENTENCE_WORD}'
+)
+FIRST_SENTENCE_PATTERN = re.compile(_COUNTED_SENTENCE)
+NEXT_SENTENCE_PATTERN = re.compile(rf'[.!?]{_COUNTED_SENTENCE}')
+
+# Hyphenation dictionary syllables are counted from (pyphen's, as textstat does)
+HYPHENATION_LANGUAGE = 'en_US'
+# Hyphens are not allowed closer than this to either end of a word
+HYPHENATION_MARGIN = 2
+
+ReadabilityStats = namedtuple('ReadabilityStats', ['words', 'sentences', 'syllables'])
+ReadabilityScores = namedtuple('ReadabilityScores', ['flesch_reading_ease', 'flesch_kincaid_grade', 'stats'])
+
+
+class HyphenationPatterns:
+    """Liang hyphenation patterns from pyphen's dictionary, used to count syllables
+
+    Counts syllables exactly as textstat does (hyphenation points + 1) without
+    going through pyphen's per-word cache, which is unbounded and builds a
+    list of positions for every word.
+    """
+
+    def __init__(self, language=HYPHENATION_LANGUAGE):
+        import pyphen
+
+        dictionary = pyphen.Pyphen(lang=language).hd
+        self.patterns = dictionary.patterns
+        self.max_length = dictionary.maxlen
+
+    def syllables(self, word):
+        """Syllables in a lowercased word without punctuation"""
+        patterns = self.patterns
+        pointed = f'.{word}.'
+        length = len(pointed)
+        points = [0] * (length + 1)
+        for start in range(length - 1):
+            for end in range(start + 1, min(start + self.max_length, length) + 1):
+                pattern = patterns.get(pointed[start:end])
+                if pattern:
+                    offset, values = pattern
+                    first = start + offset
+                    for index, value in enumerate(values, first):
+                        if value > points[index]:
+                            points[index] = value
+        # points[i] belongs to the gap before word[i - 1]; odd values allow a hyphen
+        last = len(word) - HYPHENATION_MARGIN
+        return 1 + sum(1 for index in range(HYPHENATION_MARGIN + 1, last + 2) if points[index] % 2)
+
+
+_syllable_count = None
+_syllable_lock = threading.Lock()
+
+
+def get_syllable_counter():
+    """The per-word syllable counter, memoized in a process-wide LRU (READABILITY_SYLLABLE_CACHE_SIZE words)"""
+    global _syllable_count
+    if _syllable_count is None:
+        with _syllable_lock:
+            if _syllable_count is None:
+                patterns = HyphenationPatterns()
+                _syllable_count = lru_cache(maxsize=getattr(settings, 'READABILITY_SYLLABLE_CACHE_SIZE', 50000))(
+                    patterns.syllables
+                )
+    return _syllable_count
+
+
+def text_statistics(text):
+    """Word, sentence and syllable counts of a text
+
+    Syllables are computed once per distinct word; repeated words (most of a
+    resume, and most of the next one) only cost a cache hit.
+    """
+    words = PUNCTUATION_PATTERN.sub('', text.lower()).split()
+    syllables = sum(map(get_syllable_counter(), words))
+    sentences = len(NEXT_SENTENCE_PATTERN.findall(text)) + (1 if FIRST_SENTENCE_PATTERN.match(text) else 0)
+    return ReadabilityStats(len(words), max(1, sentences), syllables)
+
+
+def _round(number, points):
+    """Round half away from zero, like textstat's legacy rounding"""
+    scale = 10 ** points
+    return float(math.floor(number * scale + math.copysign(0.5, number))) / scale
+
+
+def scores_from_statistics(stats):
+    """Flesch reading ease and Flesch-Kincaid grade from text statistics
+
+    As in textstat, the averages are rounded to one decimal before the
+    formulas are applied, and the results to two (ease) and one (grade).
+    """
+    sentence_length = _round(stats.words / stats.sentences, 1)
+    syllables_per_word = _round(stats.syllables / stats.words, 1) if stats.words else 0.0
+    ease = 206.835 - float(1.015 * sentence_length) - float(84.6 * syllables_per_word)
+    grade = float(0.39 * sentence_length) + float(11.8 * syllables_per_word) - 15.59
+    return ReadabilityScores(_round(ease, 2), _round(grade, 1), stats)
+
+
+def readability_scores(text):
+    """Readability scores of one text"""
+    return scores_from_statistics(text_statistics(text))
+
+
+def flesch_reading_ease(text):
+    """Flesch reading ease of a text (higher is easier; 30-70 suits a resume)"""
+    return readability_scores(text).flesch_reading_ease
+
+
+def batch_readability_scores(texts):
+    """Readability scores of many texts, in order
+
+    Identical texts are scored once, and every text shares the syllable
+    cache, so each distinct word of the batch is hyphenated once.
+    """
+    scored = {}
+    results = []
+    for text in texts:
+        scores = scored.get(text)
+        if scores is None:
+            scores = scored[text] = readability_scores(text)
+        results.append(scores)
+    return results
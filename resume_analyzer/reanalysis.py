@@ -0,0 +1,69 @@
+from .job_description import CATALOG_PREFIX
+from .keyword_catalog import get_catalog
+from .models import ATSAnalysis, JobKeyword
+from .scoring import FEATURE_FIELDS, write_fields
+
+
+# Columns refresh_keyword_stages reads, and the ones it changes
+REANALYSIS_FIELDS = ('id', 'extracted_text', 'additional_data', 'word_count', *FEATURE_FIELDS)
+REANALYZED_FIELDS = (
+    'keyword_density', 'overall_score', 'analysis_version', 'recommendations', 'additional_data',
+    'keyword_catalog', 'keyword_catalog_version',
+)
+
+
+def stale_analyses(industry):
+    """Analyses of an industry whose keyword stages ran against another version of its catalog
+
+    Analyses scored against a job description keep their own keywords and are
+    never stale; failed extractions have nothing to rescan.
+    """
+    catalog = get_catalog(industry)
+    return (
+        ATSAnalysis.objects.filter(industry=industry, word_count__gt=0)
+        .exclude(keyword_catalog__startswith=CATALOG_PREFIX)
+        .exclude(keyword_catalog=catalog.industry, keyword_catalog_version=catalog.version)
+    )
+
+
+def affected_industries(industry):
+    """Industries whose analyses use an industry's keywords: itself, and for general every industry without its own"""
+    if industry != 'general':
+        return [industry]
+    with_keywords = set(JobKeyword.objects.values_list('industry', flat=True).distinct())
+    return [code for code, _ in JobKeyword.INDUSTRY_CHOICES if code == 'general' or code not in with_keywords]
+
+
+def stale_counts(industries=None):
+    """Number of stale analyses per industry (only industries that have any)"""
+    counts = {}
+    for industry in industries or [code for code, _ in JobKeyword.INDUSTRY_CHOICES]:
+        count = stale_analyses(industry).count()
+        if count:
+            counts[industry] = count
+    return counts
+
+
+def reanalyze_keywords(industries=None, chunk_size=500):
+    """Bring stale analyses up to date with their industry's current keyword catalog
+
+    Works through each industry's stale analyses in primary-key chunks,
+    re-running only the keyword stages on the stored text (no file extraction,
+    readability or formatting checks), and writes each chunk in one
+    transaction. Yields (industry, number reanalyzed) per chunk.
+    """
+    from .utils import refresh_keyword_stages
+
+    for industry in industries or [code for code, _ in JobKeyword.INDUSTRY_CHOICES]:
+        queryset = stale_analyses(industry).only(*REANALYSIS_FIELDS).order_by('id')
+        last_id = 0
+        while True:
+            chunk = list(queryset.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+
+            for analysis in chunk:
+                refresh_keyword_stages(analysis, industry)
+            write_fields(chunk, REANALYZED_FIELDS)
+            yield industry, len(chunk)
@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ATSAnalysis
+
+
+# Score weights, shared by calculate_overall_score (one analysis) and
+# overall_scores (whole chunks of stored analyses)
+SECTION_POINTS = 10                 # per section: contact info, experience, education, skills
+KEYWORD_POINTS = 25
+KEYWORD_FULL_DENSITY = 60           # density (%) that earns all keyword points
+KEYWORD_LOW_DENSITY = 20            # below this, points scale up to KEYWORD_POINTS at this density
+READABILITY_BANDS = (               # first (low, high) band containing the score wins
+    ((30, 70), 20),
+    ((20, 80), 15),
+    ((10, 90), 10),
+)
+READABILITY_MIN_POINTS = 5
+TECHNICAL_POINTS = 15
+TECHNICAL_PENALTY = 5               # per table / special characters / images flag
+
+# Stored columns the score is computed from
+FEATURE_FIELDS = (
+    'has_contact_info', 'has_work_experience', 'has_education', 'has_skills',
+    'keyword_density', 'readability_score', 'has_tables', 'has_special_characters', 'has_images',
+)
+SECTION_FIELDS = FEATURE_FIELDS[:4]
+TECHNICAL_FIELDS = FEATURE_FIELDS[6:]
+
+
+def scoring_version():
+    """Version stamped on analyses scored by the current weights"""
+    return getattr(settings, 'ANALYSIS_SCORING_VERSION', '1.0')
+
+
+def overall_scores(columns):
+    """Vectorized calculate_overall_score over a dict of equal-length NumPy arrays (see FEATURE_FIELDS)"""
+    import numpy as np
+
+    sections = sum(columns[field].astype(np.int64) for field in SECTION_FIELDS) * SECTION_POINTS
+
+    density = columns['keyword_density']
+    keywords = np.where(
+        density >= KEYWORD_LOW_DENSITY,
+        np.minimum(KEYWORD_POINTS, density * KEYWORD_POINTS / KEYWORD_FULL_DENSITY),
+        density * KEYWORD_POINTS / KEYWORD_LOW_DENSITY,
+    )
+
+    readability = columns['readability_score']
+    readability_points = np.select(
+        [(readability >= low) & (readability <= high) for (low, high), _ in READABILITY_BANDS],
+        [points for _, points in READABILITY_BANDS],
+        READABILITY_MIN_POINTS,
+    )
+
+    penalties = sum(columns[field].astype(np.int64) for field in TECHNICAL_FIELDS) * TECHNICAL_PENALTY
+    technical = np.maximum(0, TECHNICAL_POINTS - penalties)
+
+    return np.clip(sections + keywords + readability_points + technical, 0, 100)
+
+
+def write_fields(analyses, fields):
+    """Write the given fields of already-saved analyses in one transaction
+
+    One prepared UPDATE per row through executemany instead of bulk_update():
+    building bulk_update's CASE WHEN expressions costs far more than the writes.
+    updated_at is always set, as save() would (result pages are validated by it).
+    """
+    updated_at = timezone.now()
+    for analysis in analyses:
+        analysis.updated_at = updated_at
+    fields = [*fields, 'updated_at']
+    quote = connection.ops.quote_name
+    model_fields = [ATSAnalysis._meta.get_field(name) for name in fields]
+    assignments = ', '.join(f'{quote(field.column)} = %s' for field in model_fields)
+    sql = f'UPDATE {quote(ATSAnalysis._meta.db_table)} SET {assignments} WHERE {quote("id")} = %s'
+    rows = [
+        [field.get_db_prep_save(getattr(analysis, field.attname), connection) for field in model_fields] + [analysis.id]
+        for analysis in analyses
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def rescore(version=None, chunk_size=5000, force=False):
+    """Recompute overall_score and recommendations of stored analyses with the current weights
+
+    Walks successfully extracted analyses in primary-key order, one chunk per
+    transaction: scores come from the stored feature columns in one NumPy pass,
+    recommendations are regenerated from them, and the chunk is written back
+    (see write_fields) along with the new analysis_version. Analyses already at
+    ``version`` are skipped unless ``force``, so an interrupted run can be
+    restarted. Yields the number of analyses rescored per chunk.
+    """
+    import numpy as np
+    from .utils import generate_recommendations
+
+    version = version or scoring_version()
+    queryset = ATSAnalysis.objects.filter(word_count__gt=0)
+    if not force:
+        queryset = queryset.exclude(analysis_version=version)
+    # Recommendations also depend on word_count
+    queryset = queryset.only('id', 'word_count', *FEATURE_FIELDS).order_by('id')
+
+    last_id = 0
+    while True:
+        # Keyset chunks rather than one long-lived cursor: SQLite gives no isolation
+        # between a cursor being read and updates to the same table on that connection
+        chunk = list(queryset.filter(id__gt=last_id)[:chunk_size])
+        if not chunk:
+            return
+        last_id = chunk[-1].id
+
+        columns = {
+            field: np.fromiter((getattr(analysis, field) for analysis in chunk), dtype=float, count=len(chunk))
+            for field in FEATURE_FIELDS
+        }
+        for analysis, score in zip(chunk, overall_scores(columns).tolist()):
+            analysis.overall_score = score
+            analysis.recommendations = generate_recommendations(analysis)
+            analysis.analysis_version = version
+
+        write_fields(chunk, ('overall_score', 'recommendations', 'analysis_version'))
+        yield len(chunk)
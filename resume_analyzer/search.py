@@ -0,0 +1,367 @@
+import logging
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+
+from .models import ATSAnalysis
+
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_TABLE = ATSAnalysis._meta.db_table
+FTS_TABLE = f'{ANALYSIS_TABLE}_fts'
+
+# Words, "quoted phrases", -excluded terms and prefix* terms
+QUERY_PATTERN = re.compile(r'(-?)"([^"]*)"|(-?)([^\s"]+)')
+QUERY_WORD_PATTERN = re.compile(r'\w+(?:[.+#-]\w*)*[+#]*')
+
+# Snippet highlight markers, replaced with <mark> after HTML-escaping the text
+_MARK_START, _MARK_END = '\x02', '\x03'
+SNIPPET_TOKENS = 16
+
+SearchHit = namedtuple('SearchHit', ['analysis_id', 'rank', 'snippet'])
+SearchTerm = namedtuple('SearchTerm', ['words', 'prefix', 'excluded'])
+
+
+def parse_query(text):
+    """Split a search box query into SearchTerms (all must match, except excluded ones)"""
+    terms = []
+    for match in QUERY_PATTERN.finditer(text or ''):
+        excluded = bool(match.group(1) or match.group(3))
+        raw = match.group(2) if match.group(2) is not None else match.group(4)
+        words = tuple(QUERY_WORD_PATTERN.findall(raw))
+        if words:
+            prefix = match.group(4) is not None and raw.endswith('*')
+            terms.append(SearchTerm(words, prefix, excluded))
+    return terms
+
+
+def highlight(snippet):
+    """HTML-escape a snippet and turn its match markers into <mark> tags"""
+    return escape(snippet).replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+
+
+def _filter_sql(min_score=None, max_score=None, industry=None):
+    """SQL conditions (on the analysis table aliased a) and params for the result filters"""
+    conditions, params = [], []
+    if min_score is not None:
+        conditions.append('a.overall_score >= %s')
+        params.append(min_score)
+    if max_score is not None:
+        conditions.append('a.overall_score <= %s')
+        params.append(max_score)
+    if industry:
+        conditions.append('a.industry = %s')
+        params.append(industry)
+    return conditions, params
+
+
+class SearchBackend:
+    """Full-text search over ATSAnalysis.extracted_text
+
+    Backends keep their index in sync with the analysis table on their own
+    (triggers or an expression index), so saves, bulk inserts and deletes
+    need no extra calls.
+    """
+
+    name = 'base'
+
+    def install(self, schema_connection):
+        """Create the index (run from a migration); backends without one do nothing"""
+
+    def uninstall(self, schema_connection):
+        """Drop the index created by install"""
+
+    def rebuild(self):
+        """Re-index every analysis"""
+
+    def is_installed(self):
+        return True
+
+    def search(self, terms, min_score=None, max_score=None, industry=None, limit=20, offset=0):
+        """Return SearchHits for analyses matching every term, best match first"""
+        raise NotImplementedError
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """SQLite FTS5 external-content index, maintained by triggers on the analysis table
+
+    Ranked by BM25; the porter tokenizer lets "years" match "year".
+    """
+
+    name = 'sqlite-fts5'
+
+    TRIGGERS = {
+        'insert': (
+            f"AFTER INSERT ON {ANALYSIS_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, extracted_text) VALUES (new.id, new.extracted_text); END"
+        ),
+        'delete': (
+            f"AFTER DELETE ON {ANALYSIS_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, extracted_text) VALUES ('delete', old.id, old.extracted_text); END"
+        ),
+        'update': (
+            f"AFTER UPDATE OF extracted_text ON {ANALYSIS_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, extracted_text) VALUES ('delete', old.id, old.extracted_text); "
+            f"INSERT INTO {FTS_TABLE}(rowid, extracted_text) VALUES (new.id, new.extracted_text); END"
+        ),
+    }
+
+    def install(self, schema_connection):
+        """Create the FTS table and sync triggers that are missing, then index existing rows
+
+        Safe to repeat: migrations that rebuild the analysis table (SQLite's way
+        of altering most columns) drop its triggers, so this also runs after
+        every migrate (see signals.py).
+        """
+        with schema_connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE name = %s OR (type = 'trigger' AND tbl_name = %s)",
+                [FTS_TABLE, ANALYSIS_TABLE]
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            missing = [suffix for suffix in self.TRIGGERS if f'{FTS_TABLE}_{suffix}' not in existing]
+            if FTS_TABLE in existing and not missing:
+                return
+
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"extracted_text, content='{ANALYSIS_TABLE}', content_rowid='id', tokenize='porter unicode61')"
+            )
+            for suffix in missing:
+                cursor.execute(f'CREATE TRIGGER {FTS_TABLE}_{suffix} {self.TRIGGERS[suffix]}')
+            # Index the analyses that already exist (or changed while triggers were missing)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+    def uninstall(self, schema_connection):
+        with schema_connection.cursor() as cursor:
+            for suffix in ('insert', 'delete', 'update'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+    def is_installed(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def match_expression(terms):
+        """FTS5 query with every term quoted, so user input can't inject FTS syntax"""
+        parts = []
+        # FTS5's NOT is binary ("a NOT b"), so included terms go first
+        for term in sorted(terms, key=lambda term: term.excluded):
+            quoted = '"' + ' '.join(term.words).replace('"', '""') + '"' + ('*' if term.prefix else '')
+            parts.append(('NOT ' if term.excluded else '') + quoted)
+        return ' '.join(parts)
+
+    def search(self, terms, min_score=None, max_score=None, industry=None, limit=20, offset=0):
+        if not any(not term.excluded for term in terms):
+            return []
+        match = self.match_expression(terms)
+        conditions, params = _filter_sql(min_score, max_score, industry)
+        # Join the analysis table only when filtering on its columns
+        join = f' JOIN {ANALYSIS_TABLE} a ON a.id = f.rowid' if conditions else ''
+        where = ''.join(f' AND {condition}' for condition in conditions)
+        with connection.cursor() as cursor:
+            # Rank first, then build snippets for the page's rows only: snippet() is the
+            # expensive part and SQLite would otherwise compute it for every sorted match
+            cursor.execute(
+                f"SELECT f.rowid, f.rank FROM {FTS_TABLE} f{join} "
+                f"WHERE {FTS_TABLE} MATCH %s{where} ORDER BY f.rank, f.rowid DESC LIMIT %s OFFSET %s",
+                [match, *params, limit, offset]
+            )
+            ranked = cursor.fetchall()
+            if not ranked:
+                return []
+            cursor.execute(
+                f"SELECT rowid, snippet({FTS_TABLE}, 0, %s, %s, '…', {SNIPPET_TOKENS}) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid IN ({', '.join(['%s'] * len(ranked))})",
+                [_MARK_START, _MARK_END, match, *[rowid for rowid, _ in ranked]]
+            )
+            snippets = dict(cursor.fetchall())
+        # rank (BM25) is lower for better matches; flip it so higher rank means better everywhere
+        return [SearchHit(rowid, -rank, highlight(snippets.get(rowid, ''))) for rowid, rank in ranked]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """PostgreSQL text search over a GIN expression index, ranked by ts_rank_cd"""
+
+    name = 'postgresql'
+    config = 'english'
+
+    def install(self, schema_connection):
+        with schema_connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {ANALYSIS_TABLE}_text_search ON {ANALYSIS_TABLE} "
+                f"USING GIN (to_tsvector('{self.config}', extracted_text))"
+            )
+
+    def uninstall(self, schema_connection):
+        with schema_connection.cursor() as cursor:
+            cursor.execute(f'DROP INDEX IF EXISTS {ANALYSIS_TABLE}_text_search')
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'REINDEX INDEX {ANALYSIS_TABLE}_text_search')
+
+    @staticmethod
+    def tsquery(terms):
+        """Input for to_tsquery with every word quoted as a literal"""
+        parts = []
+        for term in terms:
+            words = ["'" + word.replace("'", "''").replace('\\', '') + "'" for word in term.words]
+            if term.prefix:
+                words[-1] += ':*'
+            phrase = ' <-> '.join(words)
+            parts.append(f'!({phrase})' if term.excluded else f'({phrase})')
+        return ' & '.join(parts)
+
+    def search(self, terms, min_score=None, max_score=None, industry=None, limit=20, offset=0):
+        if not any(not term.excluded for term in terms):
+            return []
+        conditions, params = _filter_sql(min_score, max_score, industry)
+        where = ''.join(f' AND {condition}' for condition in conditions)
+        vector = f"to_tsvector('{self.config}', a.extracted_text)"
+        sql = (
+            f"SELECT a.id, ts_rank_cd({vector}, q), "
+            f"ts_headline('{self.config}', a.extracted_text, q, %s) "
+            f"FROM {ANALYSIS_TABLE} a, to_tsquery('{self.config}', %s) q "
+            f"WHERE {vector} @@ q{where} "
+            f"ORDER BY 2 DESC, a.id DESC LIMIT %s OFFSET %s"
+        )
+        options = f'StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords={SNIPPET_TOKENS}, MinWords=8'
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [options, self.tsquery(terms), *params, limit, offset])
+            return [SearchHit(row[0], row[1], highlight(row[2])) for row in cursor.fetchall()]
+
+
+class BasicSearchBackend(SearchBackend):
+    """Unindexed icontains search for databases without a full-text index; newest first"""
+
+    name = 'basic'
+
+    def search(self, terms, min_score=None, max_score=None, industry=None, limit=20, offset=0):
+        if not any(not term.excluded for term in terms):
+            return []
+        queryset = ATSAnalysis.objects.all()
+        for term in terms:
+            condition = Q(extracted_text__icontains=' '.join(term.words))
+            queryset = queryset.exclude(condition) if term.excluded else queryset.filter(condition)
+        if min_score is not None:
+            queryset = queryset.filter(overall_score__gte=min_score)
+        if max_score is not None:
+            queryset = queryset.filter(overall_score__lte=max_score)
+        if industry:
+            queryset = queryset.filter(industry=industry)
+
+        hits = []
+        words = [' '.join(term.words) for term in terms if not term.excluded]
+        for analysis_id, text in queryset.order_by('-analyzed_at', '-id').values_list('id', 'extracted_text')[offset:offset + limit]:
+            hits.append(SearchHit(analysis_id, 0.0, basic_snippet(text, words)))
+        return hits
+
+
+def basic_snippet(text, words, radius=80):
+    """Escaped text around the first matching word, with matches marked"""
+    lowered = text.lower()
+    positions = [lowered.find(word.lower()) for word in words]
+    start = min((position for position in positions if position >= 0), default=0)
+    excerpt = text[max(0, start - radius):start + radius]
+    pattern = re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+    marked = pattern.sub(lambda match: f'{_MARK_START}{match.group()}{_MARK_END}', excerpt)
+    return highlight(('…' if start > radius else '') + ' '.join(marked.split()) + '…')
+
+
+BACKENDS_BY_VENDOR = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+_backend = None
+
+
+def backend_for_vendor(vendor):
+    return BACKENDS_BY_VENDOR.get(vendor, BasicSearchBackend)()
+
+
+def get_search_backend():
+    """The configured search backend (ANALYSIS_SEARCH_BACKEND), or the one for this database"""
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'ANALYSIS_SEARCH_BACKEND', None)
+        backend = import_string(path)() if path else backend_for_vendor(connection.vendor)
+        # e.g. SQLite built without FTS5, where the migration could not create the index
+        if not backend.is_installed():
+            logger.warning('The %s search index is not installed, falling back to unindexed search', backend.name)
+            backend = BasicSearchBackend()
+        _backend = backend
+    return _backend
+
+
+def ensure_search_index(using='default'):
+    """Recreate index pieces a migration dropped, once the search migration has been applied"""
+    from django.db import connections
+    from django.db.migrations.recorder import MigrationRecorder
+
+    schema_connection = connections[using]
+    if ('resume_analyzer', '0011_analysis_search_index') not in MigrationRecorder(schema_connection).applied_migrations():
+        return
+    backend = backend_for_vendor(schema_connection.vendor)
+    try:
+        backend.install(schema_connection)
+    except Exception as e:
+        if schema_connection.vendor != 'sqlite':
+            raise
+        # No FTS5 (or no privileges): search falls back to the basic backend
+        logger.warning('Could not install the %s search index, search will be unindexed: %s', backend.name, e)
+
+
+class SearchPage:
+    """One page of ranked search results, each analysis annotated with rank and snippet"""
+
+    def __init__(self, object_list, page, has_next):
+        self.object_list = object_list
+        self.number = page
+        self.has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_previous(self):
+        return self.number > 1
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+def search_analyses(query, min_score=None, max_score=None, industry=None, page=1, per_page=20):
+    """Run a search and load the matching analyses' summary columns, best match first"""
+    terms = parse_query(query)
+    hits = get_search_backend().search(
+        terms, min_score, max_score, industry, limit=per_page + 1, offset=(page - 1) * per_page
+    )
+    has_next = len(hits) > per_page
+    hits = hits[:per_page]
+
+    analyses = ATSAnalysis.objects.summaries().in_bulk([hit.analysis_id for hit in hits])
+    results = []
+    for hit in hits:
+        analysis = analyses.get(hit.analysis_id)
+        if analysis is not None:
+            analysis.rank = hit.rank
+            analysis.snippet = hit.snippet
+            results.append(analysis)
+    return SearchPage(results, page, has_next)
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .keyword_catalog import bump_revision, revision_bumps_deferred
+from .models import JobKeyword
+from .search import ensure_search_index
+
+
+@receiver(post_save, sender=JobKeyword)
+@receiver(post_delete, sender=JobKeyword)
+def invalidate_keyword_catalog(sender, instance, **kwargs):
+    """Drop the compiled keyword catalog when an industry's keywords change"""
+    if not revision_bumps_deferred():
+        bump_revision([instance.industry])
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, app_config, using, **kwargs):
+    """Recreate the search triggers that SQLite table rebuilds in migrations drop"""
+    if app_config.name == 'resume_analyzer':
+        ensure_search_index(using)
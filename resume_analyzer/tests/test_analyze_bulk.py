@@ -0,0 +1,85 @@
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from resume_analyzer.models import ATSAnalysis, Resume
+
+
+class InlinePool:
+    """multiprocessing.Pool stand-in running tasks in this process, on the test database"""
+
+    def __init__(self, processes, initializer=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def imap_unordered(self, function, tasks, chunksize=1):
+        return map(function, tasks)
+
+
+def write_docx(path, text):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('word/document.xml', (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+            f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>'
+        ))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(buffer.getvalue())
+
+
+class AnalyzeBulkTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        for patcher in (
+            mock.patch('resume_analyzer.management.commands.analyze_bulk.multiprocessing.Pool', InlinePool),
+            mock.patch('resume_analyzer.management.commands.analyze_bulk.warmup', return_value=[]),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        write_docx(os.path.join(self.directory, 'team', 'jane.docx'), 'Jane Doe, sales manager')
+        write_docx(os.path.join(self.directory, 'team', 'nested', 'john.docx'), 'John Roe, accountant')
+
+    def analyze(self, directory):
+        stdout = io.StringIO()
+        call_command('analyze_bulk', directory, workers=1, stdout=stdout, stderr=io.StringIO())
+        return stdout.getvalue()
+
+    def test_stores_the_original_file_name(self):
+        # A stored file of the same name makes storage add a suffix
+        os.makedirs(os.path.join(self.media_root, 'resumes'))
+        open(os.path.join(self.media_root, 'resumes', 'jane.docx'), 'wb').close()
+
+        self.analyze(self.directory)
+        resume = Resume.objects.get(source_path__endswith='jane.docx')
+        self.assertEqual(resume.original_filename, 'jane.docx')
+        self.assertNotEqual(resume.file.name, 'resumes/jane.docx')
+        self.assertEqual(resume.source_path, os.path.realpath(os.path.join(self.directory, 'team', 'jane.docx')))
+        self.assertTrue(resume.processed)
+        self.assertEqual(ATSAnalysis.objects.count(), 2)
+
+    def test_rerun_on_a_parent_or_child_directory_skips_analyzed_files(self):
+        self.assertIn('Found 1 resume(s), 0 already analyzed, 1 to analyze',
+                      self.analyze(os.path.join(self.directory, 'team', 'nested')))
+        self.assertIn('Found 2 resume(s), 1 already analyzed, 1 to analyze', self.analyze(self.directory))
+        self.assertIn('Found 2 resume(s), 2 already analyzed, 0 to analyze',
+                      self.analyze(os.path.join(self.directory, 'team')))
+        self.assertEqual(Resume.objects.count(), 2)
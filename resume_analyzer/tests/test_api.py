@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from resume_analyzer.models import AnalysisJob, ATSAnalysis, Resume
+
+
+def pdf(name='resume.pdf'):
+    return SimpleUploadedFile(name, b'%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\n%%EOF\n')
+
+
+class ApiTokenTests(TestCase):
+    @override_settings(API_TOKEN='s3cret')
+    def test_search_api_requires_the_token(self):
+        self.assertEqual(self.client.get('/api/search/', {'q': 'python'}).status_code, 401)
+        self.assertEqual(
+            self.client.get('/api/search/', {'q': 'python'}, HTTP_AUTHORIZATION='Bearer wrong').status_code, 401
+        )
+        response = self.client.get('/api/search/', {'q': 'python'}, HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [])
+
+    def test_search_api_is_open_without_a_token(self):
+        self.assertEqual(self.client.get('/api/search/', {'q': 'python'}).status_code, 200)
+
+    def test_search_api_only_answers_get(self):
+        self.assertEqual(self.client.post('/api/search/', {'q': 'python'}).status_code, 405)
+
+
+class BatchApiTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def stored_files(self):
+        return [name for _, _, names in os.walk(self.media_root) for name in names]
+
+    @override_settings(ANALYSIS_USE_QUEUE=True)
+    def test_queued_batch_reports_every_file_in_order(self):
+        manifest = [{'reference': 'cand-1', 'industry': 'tech'}, {}, {'industry': 'nope'}]
+        response = self.client.post('/api/batch/', {
+            'files': [pdf('a.pdf'), SimpleUploadedFile('b.txt', b'text'), pdf('c.pdf')],
+            'manifest': json.dumps(manifest),
+        })
+        self.assertEqual(response.status_code, 202)
+        items = response.json()['items']
+        self.assertEqual([item['status'] for item in items], ['queued', 'rejected', 'rejected'])
+        self.assertEqual(items[0]['reference'], 'cand-1')
+        self.assertEqual(AnalysisJob.objects.get(id=items[0]['job_id']).industry, 'tech')
+        self.assertEqual(self.stored_files(), ['a.pdf'])
+
+        jobs = self.client.get(response.json()['jobs_url']).json()
+        self.assertEqual([job['id'] for job in jobs['results']], [items[0]['job_id']])
+
+    @override_settings(ANALYSIS_USE_QUEUE=True)
+    def test_failed_insert_leaves_no_files_behind(self):
+        with mock.patch.object(AnalysisJob.objects, 'bulk_create', side_effect=RuntimeError('database down')):
+            with self.assertRaises(RuntimeError):
+                self.client.post('/api/batch/', {'files': [pdf('a.pdf'), pdf('b.pdf')]})
+        self.assertEqual(self.stored_files(), [])
+        self.assertFalse(Resume.objects.exists())
+
+    @override_settings(ANALYSIS_USE_QUEUE=False)
+    def test_failed_analysis_save_leaves_no_files_behind(self):
+        with mock.patch('resume_analyzer.api.bulk_save_analyses', side_effect=RuntimeError('database down')):
+            with self.assertRaises(RuntimeError):
+                self.client.post('/api/batch/', {'files': [pdf('a.pdf')]})
+        self.assertEqual(self.stored_files(), [])
+        self.assertFalse(ATSAnalysis.objects.exists())
@@ -0,0 +1,67 @@
+import io
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TransactionTestCase, override_settings
+
+from resume_analyzer.models import ATSAnalysis, Resume
+
+
+def docx(text):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('word/document.xml', (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+            f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>'
+        ))
+    return buffer.getvalue()
+
+
+class AsyncUploadTests(TransactionTestCase):
+    """The async upload view, with the analysis pool replaced by a thread so it uses the test database"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root, ANALYSIS_USE_QUEUE=False)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        patcher = mock.patch('resume_analyzer.analysis_pool.get_analysis_executor', return_value=executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_upload_redirects_to_the_review(self):
+        content = docx('Jane Doe. Software engineer with Python and SQL experience. Led a team of 5 engineers.')
+        response = await self.async_client.post(
+            '/upload/', {'industry': 'general', 'file': SimpleUploadedFile('resume.docx', content)}
+        )
+
+        analysis = await ATSAnalysis.objects.select_related('resume').aget()
+        self.assertRedirects(response, f'/analysis/{analysis.id}/interactive/', fetch_redirect_response=False)
+        self.assertGreater(analysis.word_count, 0)
+        self.assertTrue(analysis.resume.processed)
+        self.assertEqual(analysis.resume.original_filename, 'resume.docx')
+        self.assertIn('db_write', analysis.additional_data['timings'])
+
+    async def test_failed_analysis_redirects_home(self):
+        with mock.patch('resume_analyzer.views.analyze_resume_async', side_effect=RuntimeError('boom')):
+            response = await self.async_client.post(
+                '/upload/', {'industry': 'general', 'file': SimpleUploadedFile('resume.docx', docx('Jane Doe'))}
+            )
+        self.assertRedirects(response, '/', fetch_redirect_response=False)
+        self.assertEqual(await Resume.objects.acount(), 1)
+
+    async def test_invalid_upload_shows_the_form(self):
+        response = await self.async_client.post(
+            '/upload/', {'industry': 'general', 'file': SimpleUploadedFile('resume.pdf', b'not a pdf')}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['form'].errors['file'], ['The file is not a valid PDF.'])
+        self.assertEqual(await Resume.objects.acount(), 0)
@@ -0,0 +1,28 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from resume_analyzer.models import ATSAnalysis, Resume
+
+
+class RescoreCommandTests(TestCase):
+    def setUp(self):
+        resume = Resume(name='', original_filename='cv.pdf')
+        resume.file.name = 'resumes/cv.pdf'
+        resume.save()
+        self.analysis = ATSAnalysis.objects.create(
+            resume=resume, extracted_text='text', word_count=1, overall_score=10, analysis_version='1.0'
+        )
+
+    def test_rejects_a_version_longer_than_the_column(self):
+        with self.assertRaisesMessage(CommandError, 'longer than 10 characters'):
+            call_command('rescore', scoring_version='2026-10-17-a', stdout=StringIO(), stderr=StringIO())
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.analysis_version, '1.0')
+        self.assertEqual(self.analysis.overall_score, 10)
+
+    def test_stamps_a_valid_version(self):
+        call_command('rescore', scoring_version='2.0', stdout=StringIO(), stderr=StringIO())
+        self.analysis.refresh_from_db()
+        self.assertEqual(self.analysis.analysis_version, '2.0')
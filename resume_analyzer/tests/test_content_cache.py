@@ -0,0 +1,92 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from resume_analyzer import content_cache
+from resume_analyzer.content_cache import (
+    analysis_key, cache_analysis, cache_text, evict, flush_hits, get_cached_analysis, get_cached_text, text_key,
+)
+from resume_analyzer.models import ATSAnalysis, CachedResult
+
+
+class ContentCacheTests(TestCase):
+    def setUp(self):
+        flush_hits()
+        self.addCleanup(content_cache._pending_hits.clear)
+
+    def test_miss_then_hit(self):
+        self.assertIsNone(get_cached_text('abc'))
+        cache_text('abc', 'Jane Doe', {'pages': 1})
+        self.assertEqual(get_cached_text('abc'), ('Jane Doe', {'pages': 1}))
+
+        self.assertIsNone(get_cached_analysis('abc', 'tech', 'v1'))
+        cache_analysis('abc', 'tech', 'v1', ATSAnalysis(extracted_text='Jane Doe', word_count=2, overall_score=42))
+        analysis = get_cached_analysis('abc', 'tech', 'v1')
+        self.assertEqual((analysis.word_count, analysis.overall_score), (2, 42))
+        self.assertIsNone(analysis.pk)
+
+    def test_write_replaces_the_entry(self):
+        cache_text('abc', 'old')
+        cache_text('abc', 'new')
+        self.assertEqual(CachedResult.objects.count(), 1)
+        self.assertEqual(get_cached_text('abc')[0], 'new')
+
+    def test_keys(self):
+        self.assertNotEqual(text_key('abc'), text_key('abd'))
+        self.assertNotEqual(analysis_key('abc', 'tech', 'v1'), analysis_key('abc', 'finance', 'v1'))
+        self.assertNotEqual(analysis_key('abc', 'tech', 'v1'), analysis_key('abc', 'tech', 'v2'))
+        key = text_key('abc')
+        with override_settings(RESUME_EXTRACTION_MAX_PAGES=1):
+            self.assertNotEqual(text_key('abc'), key)
+        with override_settings(ANALYSIS_SCORING_VERSION='9.9'):
+            self.assertIn(':s9.9', analysis_key('abc', 'tech', 'v1'))
+
+    def test_reads_do_not_write(self):
+        cache_text('abc', 'Jane Doe')
+        with override_settings(RESUME_CACHE_FLUSH_HITS=3):
+            with self.assertNumQueries(1):
+                get_cached_text('abc')
+            get_cached_text('abc')
+            self.assertEqual(CachedResult.objects.get().hits, 0)
+            # The third hit writes the batch
+            get_cached_text('abc')
+        self.assertEqual(CachedResult.objects.get().hits, 3)
+
+    def test_failed_write_is_logged_not_raised(self):
+        with mock.patch.object(CachedResult.objects, 'bulk_create', side_effect=OperationalError('database is locked')):
+            with self.assertLogs('resume_analyzer.content_cache', 'WARNING'):
+                cache_text('abc', 'Jane Doe')
+        self.assertIsNone(get_cached_text('abc'))
+
+    def test_evicts_least_recently_used_entries(self):
+        now = timezone.now()
+        for index in range(4):
+            cache_text(f'hash{index}', 'x' * 100)
+        for index in range(4):
+            CachedResult.objects.filter(key=text_key(f'hash{index}')).update(
+                last_used_at=now - timedelta(minutes=10 - index)
+            )
+        # A hit makes the oldest entry the most recently used
+        get_cached_text('hash0')
+        flush_hits()
+
+        self.assertEqual(evict(max_entries=3), 1)
+        self.assertIsNone(get_cached_text('hash1'))
+
+        size = CachedResult.objects.get(key=text_key('hash0')).size
+        self.assertEqual(evict(max_bytes=size * 2), 1)
+        self.assertEqual(
+            set(CachedResult.objects.values_list('key', flat=True)), {text_key('hash0'), text_key('hash3')}
+        )
+
+    @override_settings(RESUME_CACHE_EVICT_INTERVAL=2, RESUME_CACHE_MAX_ENTRIES=1)
+    def test_writes_evict_every_interval(self):
+        content_cache._writes = 0
+        cache_text('hash0', 'a')
+        cache_text('hash1', 'b')
+        self.assertEqual(CachedResult.objects.count(), 1)
+        cache_text('hash2', 'c')
+        self.assertEqual(CachedResult.objects.count(), 2)
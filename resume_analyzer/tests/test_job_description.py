@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from resume_analyzer import job_description
+from resume_analyzer.job_description import (
+    FALLBACK_STOPWORDS, JOB_DESCRIPTION_STOPWORDS, JobDescriptionCatalog, extract_keywords, stopwords,
+)
+
+
+def without_nltk_corpus(test_case):
+    """Use the built-in stopword list whether or not this host has NLTK's corpus"""
+    patcher = mock.patch('nltk.data.find', side_effect=LookupError)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    for name in ('_stopwords', '_stopwords_tag'):
+        reset = mock.patch.object(job_description, name, None)
+        reset.start()
+        test_case.addCleanup(reset.stop)
+
+
+def keyword_names(text):
+    return {keyword for keyword, _ in extract_keywords(text)}
+
+
+class ExtractKeywordsTests(SimpleTestCase):
+    def setUp(self):
+        without_nltk_corpus(self)
+
+    def test_comma_separated_skills_are_kept(self):
+        text = (
+            "We are hiring a Backend Engineer.\n"
+            "Requirements: Python, Django, PostgreSQL, Redis, Kubernetes\n"
+        )
+        self.assertTrue({'Python', 'Django', 'PostgreSQL', 'Redis', 'Kubernetes'} <= keyword_names(text))
+
+    def test_comma_list_inside_a_sentence(self):
+        text = "You will work with Python, Django, PostgreSQL and Redis every day."
+        self.assertTrue({'Python', 'Django', 'PostgreSQL', 'Redis'} <= keyword_names(text))
+
+    def test_bulleted_skills_are_kept(self):
+        text = (
+            "Nice to have:\n"
+            "- Kafka\n"
+            "* Machine Learning\n"
+            "• Terraform\n"
+        )
+        names = keyword_names(text)
+        self.assertTrue({'Kafka', 'Machine Learning', 'Terraform'} <= names)
+        self.assertNotIn('Nice', names)
+
+    def test_sentence_start_is_not_a_term(self):
+        # Capitalized only because it starts a sentence, mentioned once
+        text = "Design scalable services for our customers. Mentor junior developers."
+        names = {name.lower() for name in keyword_names(text)}
+        self.assertNotIn('design', names)
+        self.assertNotIn('mentor', names)
+
+    def test_lowercase_single_mention_is_dropped(self):
+        self.assertNotIn('Spreadsheets', keyword_names("Requirements: python, spreadsheets"))
+
+
+class StopwordsTests(SimpleTestCase):
+    def setUp(self):
+        without_nltk_corpus(self)
+
+    def test_missing_corpus_is_not_downloaded(self):
+        with mock.patch('nltk.download', side_effect=AssertionError('no downloads')) as download:
+            self.assertEqual(stopwords(), FALLBACK_STOPWORDS | JOB_DESCRIPTION_STOPWORDS)
+        download.assert_not_called()
+
+    def test_catalog_version_depends_on_the_stopword_list(self):
+        version = JobDescriptionCatalog('0' * 64, [('Python', 1.0)]).version
+        with mock.patch.object(job_description, '_stopwords', frozenset({'the'})), \
+                mock.patch.object(job_description, '_stopwords_tag', 'other'):
+            self.assertNotEqual(JobDescriptionCatalog('0' * 64, [('Python', 1.0)]).version, version)
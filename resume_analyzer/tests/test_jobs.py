@@ -0,0 +1,109 @@
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from resume_analyzer.jobs import claim_next_job, enqueue_analysis, requeue_stale_jobs, run_job
+from resume_analyzer.models import AnalysisJob, ATSAnalysis, Resume
+
+
+def make_resume(name='cv.pdf'):
+    resume = Resume(name='', original_filename=name)
+    resume.file.name = f'resumes/{name}'
+    resume.save()
+    return resume
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.first = enqueue_analysis(make_resume('a.pdf'), 'tech')
+        self.second = enqueue_analysis(make_resume('b.pdf'))
+
+    def test_claims_the_oldest_queued_job(self):
+        job = claim_next_job('worker-1')
+        self.assertEqual(job.id, self.first.id)
+        self.assertEqual((job.status, job.claimed_by, job.attempts), (AnalysisJob.STATUS_RUNNING, 'worker-1', 1))
+        self.assertIsNotNone(job.started_at)
+        self.assertEqual(claim_next_job('worker-2').id, self.second.id)
+        self.assertIsNone(claim_next_job('worker-3'))
+
+    def racing_clock(self, *job_ids):
+        """timezone stand-in for jobs.py: another worker claims these jobs just before each UPDATE"""
+        pending = list(job_ids)
+
+        def now():
+            if pending:
+                AnalysisJob.objects.filter(id=pending.pop(0)).update(
+                    status=AnalysisJob.STATUS_RUNNING, claimed_by='other'
+                )
+            return timezone.now()
+        return SimpleNamespace(now=now)
+
+    def test_a_job_claimed_by_another_worker_is_skipped(self):
+        with mock.patch('resume_analyzer.jobs.timezone', self.racing_clock(self.first.id)):
+            job = claim_next_job('worker-1')
+        self.assertEqual(job.id, self.second.id)
+        self.first.refresh_from_db()
+        self.assertEqual((self.first.claimed_by, self.first.attempts), ('other', 0))
+
+    def test_losing_every_race_claims_nothing(self):
+        with mock.patch('resume_analyzer.jobs.timezone', self.racing_clock(self.first.id, self.second.id)):
+            self.assertIsNone(claim_next_job('worker-1'))
+        self.assertFalse(AnalysisJob.objects.filter(claimed_by='worker-1').exists())
+
+    def test_finished_job_links_its_analysis(self):
+        job = claim_next_job('worker-1')
+        analysis = ATSAnalysis(extracted_text='Jane Doe', word_count=2)
+
+        def analyze(resume, industry, job_description):
+            self.assertEqual((resume.id, industry), (job.resume_id, 'tech'))
+            analysis.resume = resume
+            analysis.save()
+            return analysis
+
+        with mock.patch('resume_analyzer.jobs.analyze_resume', side_effect=analyze):
+            run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.analysis_id, job.error), (AnalysisJob.STATUS_DONE, analysis.id, ''))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failed_job_records_the_error(self):
+        job = claim_next_job('worker-1')
+        with mock.patch('resume_analyzer.jobs.analyze_resume', side_effect=ValueError('unreadable file')):
+            run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (AnalysisJob.STATUS_FAILED, 'unreadable file'))
+        self.assertIsNone(job.analysis_id)
+
+    def test_retried_job_reuses_the_saved_analysis(self):
+        job = claim_next_job('worker-1')
+        analysis = ATSAnalysis.objects.create(resume=job.resume, extracted_text='Jane Doe', word_count=2)
+        with mock.patch('resume_analyzer.jobs.analyze_resume') as analyze:
+            run_job(job)
+        analyze.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.analysis_id), (AnalysisJob.STATUS_DONE, analysis.id))
+
+    def test_stale_jobs_are_requeued_until_they_run_out_of_attempts(self):
+        claim_next_job('dead-worker')
+        claim_next_job('dead-worker')
+        long_ago = timezone.now() - timedelta(minutes=30)
+        AnalysisJob.objects.filter(id=self.first.id).update(started_at=long_ago)
+        AnalysisJob.objects.filter(id=self.second.id).update(started_at=long_ago, attempts=3)
+        fresh = enqueue_analysis(make_resume('c.pdf'))
+        claim_next_job('live-worker')
+
+        self.assertEqual(requeue_stale_jobs(600), (1, 1))
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((self.first.status, self.first.claimed_by), (AnalysisJob.STATUS_QUEUED, ''))
+        self.assertIsNone(self.first.started_at)
+        self.assertEqual(self.second.status, AnalysisJob.STATUS_FAILED)
+        self.assertEqual(fresh.status, AnalysisJob.STATUS_RUNNING)
+
+        # The requeued job is claimed again, counting another attempt
+        job = claim_next_job('worker-2')
+        self.assertEqual((job.id, job.attempts), (self.first.id, 2))
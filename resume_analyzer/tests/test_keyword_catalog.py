@@ -0,0 +1,82 @@
+from django.test import SimpleTestCase, TestCase
+
+from resume_analyzer.keyword_catalog import KeywordCatalog, check_revisions, get_catalog, invalidate_catalog
+from resume_analyzer.models import JobKeyword, KeywordCatalogRevision
+from resume_analyzer.utils import analyze_missing_keywords, calculate_keyword_density
+
+
+def found(keywords, text):
+    catalog = KeywordCatalog('tech', [(keyword, 1.0) for keyword in keywords])
+    return catalog.scan(text.lower()).found
+
+
+class KeywordMatchingTests(SimpleTestCase):
+    def test_overlapping_keywords(self):
+        keywords = ['project management', 'management', 'data', 'data science', 'science']
+        self.assertEqual(
+            found(keywords, 'Led project management for the data science team'),
+            {'project management', 'management', 'data science', 'data', 'science'},
+        )
+        self.assertEqual(found(keywords, 'Data management'), {'data', 'management'})
+
+    def test_plural_forms(self):
+        keywords = ['api', 'process', 'database']
+        self.assertEqual(found(keywords, 'Designed APIs, processes and databases'), {'api', 'process', 'database'})
+        self.assertEqual(found(keywords, 'Apiary processor'), set())
+
+    def test_word_boundaries(self):
+        keywords = ['java', 'sql', 'go']
+        self.assertEqual(found(keywords, 'JavaScript, MySQL, Google'), set())
+        self.assertEqual(found(keywords, 'Java/SQL (Go)'), {'java', 'sql', 'go'})
+
+    def test_symbols_inside_keywords(self):
+        keywords = ['c', 'c++', 'c#', 'node.js', 'node']
+        self.assertEqual(found(keywords, 'Wrote C++ services.'), {'c++', 'c'})
+        self.assertEqual(found(keywords, 'Shipped Node.js.'), {'node.js', 'node'})
+        self.assertEqual(found(keywords, 'Node.jsx and nodejs'), {'node'})
+        self.assertEqual(found(keywords, 'Cobol'), set())
+
+    def test_found_between(self):
+        catalog = KeywordCatalog('tech', [('node.js', 1.0), ('node', 1.0), ('c++', 1.0)])
+        text = 'node.js then c++'
+        scan = catalog.scan(text)
+        self.assertEqual(scan.found_between(0, 4), {'node'})
+        self.assertEqual(scan.found_between(0, 7), {'node.js', 'node'})
+        self.assertEqual(scan.found_between(8, len(text)), {'c++'})
+
+
+class CatalogInvalidationTests(TestCase):
+    def setUp(self):
+        JobKeyword.objects.filter(industry='sales').delete()
+        JobKeyword.objects.create(industry='sales', keyword='negotiation', weight=2.0)
+        JobKeyword.objects.create(industry='sales', keyword='crm', weight=1.0)
+        invalidate_catalog()
+        self.addCleanup(invalidate_catalog)
+
+    def test_edit_invalidates_the_catalog(self):
+        text = 'Closed deals with HubSpot and Salesforce CRM'
+        self.assertEqual(analyze_missing_keywords(text, 'sales'), ([('negotiation', 2.0)], [('crm', 1.0)]))
+        self.assertAlmostEqual(calculate_keyword_density(text, 'sales'), 100 / 3)
+
+        keyword = JobKeyword.objects.get(industry='sales', keyword='negotiation')
+        keyword.keyword = 'hubspot'
+        with self.captureOnCommitCallbacks(execute=True):
+            keyword.save()
+
+        self.assertEqual(analyze_missing_keywords(text, 'sales'), ([], [('hubspot', 2.0), ('crm', 1.0)]))
+        self.assertEqual(calculate_keyword_density(text, 'sales'), 100)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            JobKeyword.objects.filter(industry='sales', keyword='crm').get().delete()
+        self.assertEqual([keyword for keyword, _ in get_catalog('sales').keywords], ['hubspot'])
+
+    def test_revision_bumped_elsewhere_invalidates_the_catalog(self):
+        check_revisions(force=True)
+        catalog = get_catalog('sales')
+        self.assertIs(get_catalog('sales'), catalog)
+
+        # Another process's edit: the row changes without this process's signal firing
+        JobKeyword.objects.filter(industry='sales', keyword='crm').update(keyword='salesforce')
+        KeywordCatalogRevision.objects.filter(industry='sales').update(revision=999)
+        check_revisions(force=True)
+        self.assertIn('salesforce', get_catalog('sales').scan('salesforce').found)
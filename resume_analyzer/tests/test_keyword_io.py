@@ -0,0 +1,82 @@
+import io
+
+from django.test import TestCase
+
+from resume_analyzer import keyword_catalog
+from resume_analyzer.keyword_catalog import get_catalog, invalidate_catalog
+from resume_analyzer.keyword_io import (
+    MODE_REPLACE, KeywordImportError, export_keywords, import_keywords, read_keywords,
+)
+from resume_analyzer.models import JobKeyword, KeywordCatalogRevision
+
+
+def keywords(industry):
+    return dict(JobKeyword.objects.filter(industry=industry).values_list('keyword', 'weight'))
+
+
+def revision(industry):
+    return KeywordCatalogRevision.objects.filter(industry=industry).values_list('revision', flat=True).first() or 0
+
+
+class KeywordImportTests(TestCase):
+    def setUp(self):
+        JobKeyword.objects.filter(industry__in=['sales', 'finance']).delete()
+        JobKeyword.objects.bulk_create([
+            JobKeyword(industry='sales', keyword='crm', weight=1.0),
+            JobKeyword(industry='sales', keyword='negotiation', weight=2.0),
+            JobKeyword(industry='finance', keyword='audit', weight=1.5),
+        ])
+        invalidate_catalog()
+        self.addCleanup(invalidate_catalog)
+
+    def test_merge_keeps_keywords_missing_from_the_file(self):
+        counts = import_keywords([('sales', 'crm', 1.5), ('sales', 'hubspot', 1.0), ('sales', 'crm', 1.8)])
+        self.assertEqual(counts, {'created': 1, 'updated': 1, 'unchanged': 0, 'deleted': 0})
+        self.assertEqual(keywords('sales'), {'crm': 1.8, 'negotiation': 2.0, 'hubspot': 1.0})
+
+    def test_replace_deletes_missing_keywords_of_the_imported_industries_only(self):
+        counts = import_keywords([('sales', 'crm', 1.0), ('sales', 'hubspot', 1.0)], MODE_REPLACE)
+        self.assertEqual(counts, {'created': 1, 'updated': 0, 'unchanged': 1, 'deleted': 1})
+        self.assertEqual(keywords('sales'), {'crm': 1.0, 'hubspot': 1.0})
+        self.assertEqual(keywords('finance'), {'audit': 1.5})
+
+    def test_replace_can_empty_a_named_industry(self):
+        counts = import_keywords([], MODE_REPLACE, industries=['finance'])
+        self.assertEqual(counts['deleted'], 1)
+        self.assertEqual(keywords('finance'), {})
+
+    def test_revision_is_bumped_once_per_industry(self):
+        before = revision('sales'), revision('finance')
+        import_keywords([('sales', 'hubspot', 1.0)], MODE_REPLACE)
+        self.assertEqual((revision('sales'), revision('finance')), (before[0] + 1, before[1]))
+
+    def test_catalog_is_dropped_when_the_import_commits(self):
+        catalog = get_catalog('sales')
+        with self.captureOnCommitCallbacks() as callbacks:
+            import_keywords([('sales', 'hubspot', 1.0)])
+            # Until the import commits, other threads must not recompile from the old rows and keep them
+            self.assertIs(keyword_catalog._catalogs.get('sales'), catalog)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertNotIn('sales', keyword_catalog._catalogs)
+        self.assertIn('hubspot', get_catalog('sales').scan('hubspot').found)
+
+    def test_round_trip(self):
+        for file_format in ('csv', 'jsonl'):
+            with self.subTest(file_format=file_format):
+                file = io.StringIO()
+                self.assertEqual(export_keywords(file, file_format, industries=['sales']), 2)
+                file.seek(0)
+                self.assertEqual(
+                    list(read_keywords(file, file_format)),
+                    [('sales', 'negotiation', 2.0), ('sales', 'crm', 1.0)],
+                )
+
+    def test_invalid_rows(self):
+        with self.assertRaisesMessage(KeywordImportError, "line 2: unknown industry 'space'"):
+            list(read_keywords(io.StringIO('industry,keyword\nspace,rockets\n')))
+        with self.assertRaisesMessage(KeywordImportError, 'line 1: invalid weight'):
+            list(read_keywords(io.StringIO('{"industry": "sales", "keyword": "crm", "weight": "high"}\n'), 'jsonl'))
+        self.assertEqual(
+            list(read_keywords(io.StringIO('keyword\ncrm\n'), default_industry='sales')), [('sales', 'crm', 1.0)]
+        )
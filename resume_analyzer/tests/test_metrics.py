@@ -0,0 +1,27 @@
+from django.test import TestCase
+
+from resume_analyzer.metrics import StageTimer, serve_metrics
+from resume_analyzer.models import ATSAnalysis, Resume
+from resume_analyzer.utils import save_analysis
+
+
+class MetricsTests(TestCase):
+    def test_saved_timings_include_the_database_write(self):
+        resume = Resume(name='', original_filename='cv.pdf')
+        resume.file.name = 'resumes/cv.pdf'
+        resume.save()
+        timer = StageTimer()
+        timer.add('extraction', 12.5)
+
+        analysis = save_analysis(resume, ATSAnalysis(extracted_text='Jane Doe', word_count=2), 'abc', timer)
+        timings = ATSAnalysis.objects.get(pk=analysis.pk).additional_data['timings']
+        self.assertEqual(set(timings), {'extraction', 'db_write'})
+        self.assertGreater(timings['db_write'], 0)
+        self.assertEqual(timings, analysis.additional_data['timings'])
+        self.assertTrue(Resume.objects.get(pk=resume.pk).processed)
+
+    def test_worker_metrics_server_is_local_by_default(self):
+        server = serve_metrics(0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.assertEqual(server.server_address[0], '127.0.0.1')
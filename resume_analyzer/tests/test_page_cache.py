@@ -0,0 +1,50 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from resume_analyzer.models import ATSAnalysis, Resume
+from resume_analyzer.page_cache import get_page_cache
+from resume_analyzer.scoring import rescore
+
+
+class AnalysisPageCacheTests(TestCase):
+    def setUp(self):
+        get_page_cache().clear()
+        resume = Resume.objects.create(name='', file=SimpleUploadedFile('cv.pdf', b'%PDF-1.4'))
+        self.analysis = ATSAnalysis.objects.create(
+            resume=resume,
+            extracted_text='Experience and skills',
+            word_count=3,
+            overall_score=10,
+            has_contact_info=True,
+            keyword_density=40,
+            readability_score=50,
+        )
+        self.url = reverse('analysis_result', args=[self.analysis.id])
+
+    def tearDown(self):
+        self.analysis.resume.file.delete(save=False)
+
+    def test_rescore_at_the_same_version_invalidates_validators_and_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertContains(first, '10/100')
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        # Same scoring version, so only the forced rewrite tells the row changed
+        ATSAnalysis.objects.filter(id=self.analysis.id).update(analysis_version='test')
+        list(rescore(version='test', force=True))
+        rescored = ATSAnalysis.objects.get(id=self.analysis.id)
+        self.assertNotEqual(round(rescored.overall_score), 10)
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+        response = self.client.get(self.url)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertContains(response, f'{rescored.overall_score:.0f}/100')
+        self.assertEqual(response['Last-Modified'], http_date(int(rescored.updated_at.timestamp())))
+
+    def test_if_modified_since_sees_rewrites(self):
+        response = self.client.get(self.url)
+        ATSAnalysis.objects.filter(id=self.analysis.id).update(updated_at=self.analysis.updated_at.replace(year=2100))
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 200)
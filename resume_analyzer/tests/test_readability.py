@@ -0,0 +1,53 @@
+import unittest
+
+from django.test import SimpleTestCase
+
+from resume_analyzer.readability import batch_readability_scores, readability_scores
+
+try:
+    import textstat
+except ImportError:
+    textstat = None
+
+
+# Documented difference allowed from textstat 0.7's scores (see README)
+TOLERANCE = 0.01
+
+# text -> (reading ease, grade, (words, sentences, syllables)), as computed by textstat 0.7
+TEXTS = {
+    '': (206.84, -15.7, (0, 1, 0)),
+    'Hello.': (36.62, 8.4, (1, 1, 2)),
+    # Sentences of two words or less are not counted
+    'Led a team. Built it!': (117.16, -1.9, (5, 1, 5)),
+    # Hyphens and other punctuation are dropped, joining the words around them
+    'Managed a cross-functional team of twelve engineers. Increased revenue by 25%! '
+    'Reduced costs, improved morale; shipped on time?': (65.39, 5.6, (18, 3, 28)),
+    'Self-motivated, detail-oriented go-getter with state-of-the-art skills': (-69.98, 24.5, (6, 1, 19)),
+    'Senior software engineer... Python, Django, PostgreSQL. Designed high-availability, fault-tolerant '
+    'services.\nMentored junior developers and led code reviews.': (16.35, 12.0, (17, 4, 38)),
+    "Dr. Smith's well-known e-commerce platform handled 1,000,000 requests/day. It scaled. We won.": (
+        67.76, 6.8, (12, 1, 18)
+    ),
+}
+
+
+class ReadabilityTests(SimpleTestCase):
+    def test_scores(self):
+        for text, (ease, grade, stats) in TEXTS.items():
+            with self.subTest(text=text):
+                scores = readability_scores(text)
+                self.assertEqual(tuple(scores.stats), stats)
+                self.assertAlmostEqual(scores.flesch_reading_ease, ease, delta=TOLERANCE)
+                self.assertAlmostEqual(scores.flesch_kincaid_grade, grade, delta=TOLERANCE)
+
+    def test_batch_matches_single_scores(self):
+        texts = list(TEXTS) + list(TEXTS)[:2]
+        self.assertEqual(batch_readability_scores(texts), [readability_scores(text) for text in texts])
+
+    @unittest.skipIf(textstat is None, 'textstat is not installed')
+    def test_within_tolerance_of_textstat(self):
+        for text in TEXTS:
+            with self.subTest(text=text):
+                scores = readability_scores(text)
+                self.assertAlmostEqual(scores.flesch_reading_ease, textstat.flesch_reading_ease(text), delta=TOLERANCE)
+                self.assertAlmostEqual(scores.flesch_kincaid_grade, textstat.flesch_kincaid_grade(text), delta=TOLERANCE)
@@ -0,0 +1,80 @@
+from django.contrib.messages import get_messages
+from django.test import TestCase, override_settings
+
+from resume_analyzer.keyword_catalog import get_catalog, invalidate_catalog
+from resume_analyzer.models import ATSAnalysis, JobKeyword, Resume
+from resume_analyzer.reanalysis import affected_industries, reanalyze_keywords, stale_analyses, stale_counts
+
+
+TEXT = 'Jane Doe\nSales manager. Increased revenue 20% using Salesforce CRM and negotiation.'
+
+
+class ReanalysisTests(TestCase):
+    def setUp(self):
+        JobKeyword.objects.all().delete()
+        JobKeyword.objects.bulk_create([
+            JobKeyword(industry='sales', keyword='crm', weight=1.0),
+            JobKeyword(industry='general', keyword='communication', weight=1.0),
+        ])
+        invalidate_catalog()
+        self.addCleanup(invalidate_catalog)
+
+    def analysis(self, industry, catalog=None, version=None):
+        resume = Resume(name='', original_filename='cv.pdf')
+        resume.file.name = 'resumes/cv.pdf'
+        resume.save()
+        catalog = catalog or get_catalog(industry)
+        return ATSAnalysis.objects.create(
+            resume=resume, extracted_text=TEXT, word_count=len(TEXT.split()), industry=industry,
+            keyword_catalog=catalog.industry if version is None else catalog,
+            keyword_catalog_version=catalog.version if version is None else version, analysis_version='1.0',
+        )
+
+    def test_stale_selection(self):
+        current = self.analysis('sales')
+        outdated = self.analysis('sales', 'sales', 'old')
+        job_description = self.analysis('sales', 'jd:0123456789ab', 'old')
+        self.assertEqual(list(stale_analyses('sales')), [outdated])
+
+        ATSAnalysis.objects.filter(id=current.id).update(word_count=0, keyword_catalog_version='old')
+        self.assertEqual(list(stale_analyses('sales')), [outdated])
+        self.assertNotIn(job_description, stale_analyses('sales'))
+
+    def test_industries_without_keywords_follow_general(self):
+        self.assertEqual(affected_industries('sales'), ['sales'])
+        self.assertEqual(
+            affected_industries('general'), ['tech', 'finance', 'healthcare', 'marketing', 'education', 'general']
+        )
+        marketing = self.analysis('marketing')
+        self.assertEqual(marketing.keyword_catalog, 'general')
+        with self.captureOnCommitCallbacks(execute=True):
+            JobKeyword.objects.create(industry='general', keyword='negotiation', weight=2.0)
+        self.assertEqual(stale_counts(affected_industries('general')), {'marketing': 1})
+
+    @override_settings(ANALYSIS_SCORING_VERSION='2.0')
+    def test_reanalyze_brings_stale_analyses_up_to_date(self):
+        stale = self.analysis('sales', 'sales', 'old')
+        with self.captureOnCommitCallbacks(execute=True):
+            JobKeyword.objects.create(industry='sales', keyword='negotiation', weight=2.0)
+
+        self.assertEqual(list(reanalyze_keywords(['sales'], chunk_size=1)), [('sales', 1)])
+        stale.refresh_from_db()
+        catalog = get_catalog('sales')
+        self.assertEqual((stale.keyword_catalog, stale.keyword_catalog_version), ('sales', catalog.version))
+        self.assertEqual(stale.keyword_density, 100)
+        self.assertEqual(stale.analysis_version, '2.0')
+        self.assertEqual(
+            stale.additional_data['present_keywords'], [['negotiation', 2.0], ['crm', 1.0]]
+        )
+        self.assertEqual(stale_counts(['sales']), {})
+        self.assertEqual(list(reanalyze_keywords(['sales'])), [])
+
+    def test_keyword_edit_reports_only_affected_industries(self):
+        self.analysis('tech', 'tech', 'old')
+        self.analysis('sales', 'sales', 'old')
+        response = self.client.post('/keywords/', {'industry': 'sales', 'keyword': 'pipeline', 'weight': 1.0})
+        self.assertIn(
+            '1 stored analyses were scored with older keywords. '
+            'Run "python manage.py reanalyze_keywords" to update them.',
+            [str(message) for message in get_messages(response.wsgi_request)],
+        )
@@ -0,0 +1,34 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+
+from resume_analyzer import search
+from resume_analyzer.models import ATSAnalysis, Resume
+from resume_analyzer.search import FTS_TABLE, BasicSearchBackend, SQLiteFTSBackend, get_search_backend, parse_query
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite FTS5 index')
+
+    def test_migration_creates_what_the_backend_installs(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name LIKE %s", [f'{FTS_TABLE}%'])
+            names = {row[0] for row in cursor.fetchall()}
+        self.assertTrue({FTS_TABLE, *(f'{FTS_TABLE}_{suffix}' for suffix in SQLiteFTSBackend.TRIGGERS)} <= names)
+
+    def test_triggers_index_new_analyses(self):
+        resume = Resume(name='', original_filename='cv.pdf')
+        resume.file.name = 'resumes/cv.pdf'
+        resume.save()
+        analysis = ATSAnalysis.objects.create(resume=resume, extracted_text='Kubernetes operator', word_count=2)
+        hits = SQLiteFTSBackend().search(parse_query('kubernetes'))
+        self.assertEqual([hit.analysis_id for hit in hits], [analysis.id])
+
+    def test_missing_index_falls_back_with_a_warning(self):
+        with mock.patch.object(search, '_backend', None), \
+                mock.patch.object(SQLiteFTSBackend, 'is_installed', return_value=False):
+            with self.assertLogs('resume_analyzer.search', 'WARNING'):
+                self.assertIsInstance(get_search_backend(), BasicSearchBackend)
@@ -0,0 +1,99 @@
+import re
+
+from django.test import SimpleTestCase, TestCase
+
+from resume_analyzer.analysis_context import AnalysisContext
+from resume_analyzer.text_rules import Rule, RuleSet, build_rules, get_rule_set
+from resume_analyzer.utils import analyze_text_issues
+
+
+# Line-level patterns analyze_text_issues used before the rules were compiled into one regex
+BASELINE_SIGNALS = {
+    'quantified': re.compile(r'\d+%|\$[\d,]+|\d+\+|\d+ (years|months|people|clients|projects)'),
+    'achievement': re.compile(r'increased|decreased|improved|reduced|grew|achieved|delivered|completed'),
+    'section_cue': re.compile(r'skills|experience|expertise|proficient'),
+}
+
+CORPUS = """
+John Smith | john.smith@example.com | (555) 123-4567
+Professional Experience
+Senior Software Engineer, Acme Corp (2019 - 2024)
+- Increased API throughput by 3.5% after profiling the ingestion pipeline
+- Reduced infrastructure costs by $50,000 per year
+- Improved onboarding for 10+ engineers across 3 teams
+- Delivered 0.5 years ahead of schedule with 2.5+ releases per quarter
+- Grew the customer base to 120 clients in 18 months
+- Responsible for the billing service and worked on payment integrations
+- Worked with product managers; helped with hiring and did code reviews
+- Was involved in the migration; made dashboards for 25% of the sales team
+- Achieved 99.9% uptime for 4 years
+- Completed the rollout and improved test coverage
+Skills: Python, Django, PostgreSQL, Redis, Kubernetes
+Technical expertise in distributed systems; proficient in Go
+Team player, hard worker and fast learner; detail oriented go-getter
+Version 2.0 shipped to 1,200 people in 6 months
+""".strip().lower()
+
+
+def per_rule_matches(rules, text):
+    """Every occurrence of every rule, scanning the text once per rule"""
+    matches = set()
+    for rule in rules:
+        for match in re.finditer(f'(?=({rule.pattern}))', text):
+            matches.add((rule.key, match.start(1), match.end(1)))
+    return matches
+
+
+class RuleSetTests(SimpleTestCase):
+    def scan(self, text):
+        return [(match.rule.key, match.start, match.end) for match in get_rule_set().scan(text)]
+
+    def signals(self, line):
+        return {match.rule.key for match in get_rule_set().scan(line) if match.rule.kind == 'signal'}
+
+    def test_single_pass_matches_per_rule_scans(self):
+        scanned = self.scan(CORPUS)
+        self.assertEqual(len(scanned), len(set(scanned)))
+        self.assertEqual(set(scanned), per_rule_matches(build_rules(), CORPUS))
+
+    def test_line_signals_match_baseline_patterns(self):
+        for line in CORPUS.splitlines():
+            with self.subTest(line=line):
+                expected = {name for name, pattern in BASELINE_SIGNALS.items() if pattern.search(line)}
+                self.assertEqual(self.signals(line), expected)
+
+    def test_decimal_numbers_are_quantified(self):
+        for line in ('grew revenue 3.5%', 'led the team for 0.5 years', 'shipped 2.5+ releases', 'saved $1,200.50'):
+            with self.subTest(line=line):
+                self.assertIn('quantified', self.signals(line))
+
+    def test_numbers_inside_words_are_not_quantified(self):
+        self.assertNotIn('quantified', self.signals('upgraded the fleet to ipv6 and es2015'))
+
+    def test_phrases_are_word_bounded(self):
+        self.assertEqual(self.scan('a candidate who made it'), [('made', 16, 20)])
+
+    def test_rules_matching_at_the_same_position_are_all_reported(self):
+        rule_set = RuleSet([
+            Rule('signal', 'short', r'(?<!\w)work'),
+            Rule('signal', 'long', r'(?<!\w)worked on'),
+            Rule('signal', 'other', r'(?<!\w)play'),
+        ])
+        matches = [(match.rule.key, match.start, match.end) for match in rule_set.scan('worked on play')]
+        self.assertEqual(matches, [('short', 0, 4), ('long', 0, 9), ('other', 10, 14)])
+
+
+class TextIssueOffsetTests(TestCase):
+    def test_offsets_index_the_original_text_when_lowercasing_changes_its_length(self):
+        # 'İ'.lower() is two characters
+        text = 'Summary\nİİİİ at İstanbul office I was responsible for the migration project here'
+        self.assertNotEqual(len(text.lower()), len(text))
+        [line] = analyze_text_issues(text, 'general')
+        [issue] = [issue for issue in line['issues'] if issue['type'] == 'weak_verb']
+        self.assertEqual(issue['text'], 'responsible for')
+        self.assertEqual(line['line_text'][issue['start']:issue['end']], 'responsible for')
+
+    def test_lowercased_text_keeps_offsets(self):
+        context = AnalysisContext('Büro İSTANBUL ΣΟΦΙΑ')
+        self.assertEqual(context.text_lower, 'büro istanbul σοφια')
+        self.assertEqual(len(context.text_lower), len(context.text))
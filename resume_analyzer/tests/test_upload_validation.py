@@ -0,0 +1,86 @@
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from resume_analyzer.models import Resume
+
+
+def docx(parts):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in parts.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+DOCUMENT_XML = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:body><w:p><w:r><w:t>Jane Doe</w:t></w:r></w:p></w:body></w:document>'
+)
+
+
+class UploadValidationTests(TestCase):
+    """Crafted uploads are rejected while they stream in and never reach storage"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def upload(self, name, content, **data):
+        response = self.client.post('/', {'industry': 'general', 'file': SimpleUploadedFile(name, content), **data})
+        self.assertEqual(response.status_code, 200)
+        return response.context['form']
+
+    def assert_rejected(self, name, content, message):
+        form = self.upload(name, content)
+        self.assertEqual(form.errors['file'], [message])
+        self.assertFalse(Resume.objects.exists())
+        self.assertEqual([files for _, _, files in os.walk(self.media_root) if files], [])
+
+    def test_pdf_without_signature(self):
+        self.assert_rejected('resume.pdf', b'<html>' + b' ' * 2048, 'The file is not a valid PDF.')
+
+    def test_short_pdf_without_signature(self):
+        self.assert_rejected('resume.pdf', b'not a pdf', 'The file is not a valid PDF.')
+
+    def test_encrypted_pdf(self):
+        content = b'%PDF-1.7\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R /Encrypt 2 0 R >>\n%%EOF\n'
+        self.assert_rejected(
+            'resume.pdf', content, 'Password-protected PDFs cannot be analyzed. Please upload an unprotected copy.'
+        )
+
+    def test_too_many_pages(self):
+        content = b'%PDF-1.4\n2 0 obj << /Type /Pages /Kids [] /Count 51 >> endobj\n%%EOF\n'
+        self.assert_rejected('resume.pdf', content, 'PDFs are limited to 50 pages.')
+
+    def test_damaged_docx_central_directory(self):
+        content = bytearray(docx({'word/document.xml': DOCUMENT_XML}))
+        directory = content.rfind(b'PK\x01\x02')
+        content[directory:directory + 4] = b'XX\x01\x02'
+        self.assert_rejected('resume.docx', bytes(content), 'The Word document is damaged.')
+
+    def test_zip_bomb(self):
+        content = docx({'word/document.xml': DOCUMENT_XML, 'word/media/filler.bin': bytes(4 * 1024 * 1024)})
+        self.assert_rejected(
+            'resume.docx', content, 'The Word document is compressed suspiciously well and was not analyzed.'
+        )
+
+    def test_legacy_doc(self):
+        self.assert_rejected(
+            'resume.doc', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + bytes(1024),
+            'Legacy Word .doc files are not supported. Please save the resume as PDF or DOCX.',
+        )
+
+    def test_valid_docx_passes_validation(self):
+        # An invalid email keeps the form from saving, so only the file's validation is exercised
+        form = self.upload('resume.docx', docx({'word/document.xml': DOCUMENT_XML}), email='not-an-email')
+        self.assertNotIn('file', form.errors)
+        self.assertIn('email', form.errors)
@@ -0,0 +1,99 @@
+import re
+from collections import namedtuple
+
+
+# Weak phrases and stronger replacements
+WEAK_PHRASES = {
+    'responsible for': ['Led', 'Managed', 'Oversaw', 'Directed'],
+    'duties included': ['Achieved', 'Delivered', 'Executed', 'Accomplished'],
+    'worked on': ['Developed', 'Built', 'Created', 'Implemented'],
+    'helped with': ['Collaborated on', 'Contributed to', 'Assisted in', 'Supported'],
+    'worked with': ['Partnered with', 'Collaborated with', 'Coordinated with'],
+    'was involved in': ['Participated in', 'Contributed to', 'Played a key role in'],
+    'did': ['Executed', 'Performed', 'Completed', 'Delivered'],
+    'made': ['Created', 'Developed', 'Built', 'Established'],
+}
+
+# Generic self-descriptions and a specific alternative
+GENERIC_PHRASES = {
+    'team player': 'Collaborated effectively with cross-functional teams',
+    'hard worker': 'Delivered consistent high-quality results',
+    'detail oriented': 'Maintained 99%+ accuracy in data analysis',
+    'fast learner': 'Rapidly acquired new technical skills',
+    'go-getter': 'Proactively identified and pursued opportunities',
+}
+
+# Line-level signals as regex fragments (matched against lowercased text)
+# A whole number (not the digits after its decimal point or comma): 3, 50,000, 3.5
+_NUMBER = r'(?<![\w.,$])\d[\d,]*(?:\.\d+)?'
+LINE_SIGNALS = {
+    # Numbers that quantify something: 25%, 3.5%, $50,000, 10+, 2.5+, 3 years, 0.5 years
+    'quantified': rf'{_NUMBER}%|(?<![\w$])\$\d[\d,]*|{_NUMBER}\+|{_NUMBER} (?:years|months|people|clients|projects)\b',
+    'achievement': r'\b(?:increased|decreased|improved|reduced|grew|achieved|delivered|completed)\b',
+    # Prefixes, so "experienced" and "proficiency" count
+    'section_cue': r'\b(?:skills|experience|expertise|proficien)',
+}
+
+Rule = namedtuple('Rule', ['kind', 'key', 'pattern'])
+RuleMatch = namedtuple('RuleMatch', ['rule', 'start', 'end'])
+
+
+def _phrase_pattern(phrase):
+    """Word-bounded pattern for a phrase, tolerating runs of spaces (not line breaks) between its words"""
+    return r'(?<!\w)' + r'[ \t]+'.join(re.escape(word) for word in phrase.split()) + r'(?!\w)'
+
+
+def build_rules():
+    """The rule table: phrase rules (weak verbs, generic phrases) followed by line signals"""
+    rules = [Rule('weak_verb', phrase, _phrase_pattern(phrase)) for phrase in WEAK_PHRASES]
+    rules += [Rule('generic_phrase', phrase, _phrase_pattern(phrase)) for phrase in GENERIC_PHRASES]
+    rules += [Rule('signal', name, pattern) for name, pattern in LINE_SIGNALS.items()]
+    return rules
+
+
+class RuleSet:
+    """Text rules compiled into one regex that finds every occurrence in a single pass
+
+    Each rule is a named group inside a zero-width lookahead, so matches of
+    different rules may overlap and every start position is tried once: the
+    cost of a scan grows with the text, not with text length times rules.
+    The combined regex reports the first rule matching at a position; the
+    rules after it are then tried at that position only, so every rule
+    matching there is reported too.
+
+    Rules may only match starting at a word character or "$" that does not
+    follow a word character: the alternatives are tried only at such positions.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        alternatives = '|'.join(f'(?P<r{index}>{rule.pattern})' for index, rule in enumerate(self.rules))
+        self.pattern = re.compile(f'(?<!\\w)(?=[\\w$])(?=(?:{alternatives}))')
+        self.rule_patterns = [re.compile(rule.pattern) for rule in self.rules]
+
+    def scan(self, text_lower):
+        """Every rule match in already-lowercased text, in text order (rule order at the same position)"""
+        matches = []
+        rules = self.rules
+        rule_patterns = self.rule_patterns
+        for match in self.pattern.finditer(text_lower):
+            index = int(match.lastgroup[1:])
+            position = match.start(match.lastgroup)
+            matches.append(RuleMatch(rules[index], position, match.end(match.lastgroup)))
+            # Earlier rules failed here; later ones may match at the same position
+            for later in range(index + 1, len(rules)):
+                other = rule_patterns[later].match(text_lower, position)
+                if other:
+                    matches.append(RuleMatch(rules[later], position, other.end()))
+        return matches
+
+
+_rule_set = None
+
+
+def get_rule_set():
+    """The compiled rule table, built on first use and shared by every analysis"""
+    global _rule_set
+    if _rule_set is None:
+        _rule_set = RuleSet(build_rules())
+    return _rule_set
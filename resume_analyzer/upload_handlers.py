@@ -0,0 +1,107 @@
+import hashlib
+
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+from .upload_validation import UploadRejected, get_upload_validator
+
+
+class ContentHashUploadHandler(FileUploadHandler):
+    """Hash uploaded files while they stream in, before any other handler stores them
+
+    Digests are left on ``request.upload_content_hashes`` keyed by form field name
+    (the last file of each field), and on ``request.upload_file_hashes`` as a list
+    per field for fields posting several files. Chunks are passed on unchanged to
+    the next handler.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not hasattr(self.request, 'upload_content_hashes'):
+            self.request.upload_content_hashes = {}
+        if not hasattr(self.request, 'upload_file_hashes'):
+            self.request.upload_file_hashes = {}
+        digest = self.hasher.hexdigest()
+        self.request.upload_content_hashes[self.field_name] = digest
+        self.request.upload_file_hashes.setdefault(self.field_name, []).append(digest)
+        return None
+
+
+class ValidatingUploadHandler(FileUploadHandler):
+    """Validate uploaded files while they stream in (see upload_validation.py)
+
+    Must come before the handlers that store uploads: a file that fails is
+    skipped as soon as it is known to be bad, so its remaining chunks never
+    reach memory, disk or a parser. Reasons are left on
+    ``request.upload_errors`` keyed by form field name; see rejected_uploads().
+    Every file is also reported on ``request.upload_reports``, in posting order
+    per field; see posted_files().
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.validator = get_upload_validator(self.file_name)
+        if not hasattr(self.request, 'upload_reports'):
+            self.request.upload_reports = {}
+        self.report = {'name': self.file_name, 'error': None, 'stored': False}
+        self.request.upload_reports.setdefault(self.field_name, []).append(self.report)
+
+    def reject(self, error):
+        if not hasattr(self.request, 'upload_errors'):
+            self.request.upload_errors = {}
+        self.request.upload_errors[self.field_name] = str(error)
+        self.report['error'] = str(error)
+
+    def receive_data_chunk(self, raw_data, start):
+        try:
+            self.validator.feed(raw_data)
+        except UploadRejected as error:
+            self.reject(error)
+            raise SkipFile()
+        return raw_data
+
+    def file_complete(self, file_size):
+        # The file reaches request.FILES even if it fails here
+        self.report['stored'] = True
+        # Too late to skip the file here; rejected_uploads() tells the form to drop it
+        try:
+            self.validator.finish()
+        except UploadRejected as error:
+            self.reject(error)
+        return None
+
+
+def rejected_uploads(request):
+    """Reasons uploaded files were rejected while streaming, keyed by form field name"""
+    return getattr(request, 'upload_errors', {})
+
+
+def posted_files(request, field_name):
+    """Every file posted under field_name, in order, as (name, uploaded file, rejection reason, content hash)
+
+    Unlike request.FILES this includes the files that were skipped while
+    streaming (with no uploaded file). The uploaded file of a rejected file is
+    always None and its hash empty.
+    """
+    files = request.FILES.getlist(field_name)
+    hashes = getattr(request, 'upload_file_hashes', {}).get(field_name, [])
+    reports = getattr(request, 'upload_reports', {}).get(field_name)
+    if reports is None:
+        # Uploads were not validated (ValidatingUploadHandler not installed)
+        reports = [{'name': uploaded.name, 'error': None, 'stored': True} for uploaded in files]
+
+    # Stored files are in request.FILES and hashed, in the order they were posted
+    stored = iter(zip(files, hashes + [''] * (len(files) - len(hashes))))
+    posted = []
+    for report in reports:
+        uploaded, content_hash = next(stored, (None, '')) if report['stored'] else (None, '')
+        if report['error']:
+            uploaded, content_hash = None, ''
+        posted.append((report['name'], uploaded, report['error'], content_hash))
+    return posted
@@ -0,0 +1,199 @@
+import os
+import re
+import struct
+
+from django.conf import settings
+
+from .extraction import OLE2_SIGNATURE
+
+
+PDF_SIGNATURE = b'%PDF-'
+PDF_HEADER_WINDOW = 1024                 # readers accept the header anywhere in the first KB
+ZIP_SIGNATURE = b'PK\x03\x04'
+
+# Raw-byte markers checked while a PDF streams in. The trailer (or cross-reference
+# stream dictionary) is never compressed, so /Encrypt is always visible; page tree
+# /Count entries are only visible when not packed into object streams, so the page
+# limit is best-effort and the extraction page limit still applies.
+PDF_ENCRYPT_PATTERN = re.compile(rb'/Encrypt(?=[\s/<\[\d])')
+PDF_COUNT_PATTERN = re.compile(rb'/Count\s+(\d+)')
+PDF_MARKER_OVERLAP = 32                  # bytes kept between chunks so markers split across them are found
+
+# ZIP end of central directory and central directory entries (see zipfile)
+ZIP_END_SIGNATURE = b'PK\x05\x06'
+ZIP_END_STRUCT = struct.Struct('<4s4H2LH')
+ZIP_ENTRY_SIGNATURE = b'PK\x01\x02'
+ZIP_ENTRY_STRUCT = struct.Struct('<4s4B4HL2L5H2L')
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_MAX_COMMENT = 0xFFFF
+# The central directory must fit in this many trailing bytes (thousands of entries)
+ZIP_TAIL_BYTES = 256 * 1024 + ZIP_END_STRUCT.size + ZIP_MAX_COMMENT
+# Entries smaller than this are not held to the compression ratio (tiny XML parts compress well)
+ZIP_RATIO_MIN_BYTES = 1024 * 1024
+
+
+class UploadRejected(Exception):
+    """An uploaded file failed validation and must not be stored or parsed"""
+
+
+def upload_limits():
+    """Upload validation limits from settings"""
+    return {
+        'max_bytes': getattr(settings, 'RESUME_UPLOAD_MAX_BYTES', 10 * 1024 * 1024),
+        'max_pages': getattr(settings, 'RESUME_UPLOAD_MAX_PAGES', 50),
+        'max_compression_ratio': getattr(settings, 'RESUME_UPLOAD_MAX_COMPRESSION_RATIO', 100),
+        'max_uncompressed_bytes': getattr(settings, 'RESUME_UPLOAD_MAX_UNCOMPRESSED_BYTES', 50 * 1024 * 1024),
+    }
+
+
+def format_megabytes(size):
+    return f'{size / (1024 * 1024):g} MB'
+
+
+class UploadValidator:
+    """Checks run on an uploaded file chunk by chunk, as it streams in
+
+    feed() and finish() raise UploadRejected as soon as the file is known
+    to be bad, so the caller can drop it before it is stored or parsed.
+    This base class only enforces the size cap.
+    """
+
+    def __init__(self, limits=None):
+        self.limits = limits or upload_limits()
+        self.size = 0
+
+    def feed(self, chunk):
+        self.size += len(chunk)
+        max_bytes = self.limits['max_bytes']
+        if max_bytes and self.size > max_bytes:
+            raise UploadRejected(f'Files are limited to {format_megabytes(max_bytes)}.')
+
+    def finish(self):
+        """Checks that need the whole file, after the last chunk"""
+
+
+class PdfUploadValidator(UploadValidator):
+    """PDF signature, encryption and page count"""
+
+    def __init__(self, limits=None):
+        super().__init__(limits)
+        self.head = b''
+        self.carry = b''
+        self.pages = 0
+
+    def feed(self, chunk):
+        super().feed(chunk)
+
+        if len(self.head) < PDF_HEADER_WINDOW and PDF_SIGNATURE not in self.head:
+            self.head = (self.head + chunk)[:PDF_HEADER_WINDOW]
+            if len(self.head) == PDF_HEADER_WINDOW and PDF_SIGNATURE not in self.head:
+                raise UploadRejected('The file is not a valid PDF.')
+
+        window = self.carry + chunk
+        self.carry = window[-PDF_MARKER_OVERLAP:]
+        if PDF_ENCRYPT_PATTERN.search(window):
+            raise UploadRejected('Password-protected PDFs cannot be analyzed. Please upload an unprotected copy.')
+
+        # The page tree root carries the largest /Count
+        max_pages = self.limits['max_pages']
+        for match in PDF_COUNT_PATTERN.finditer(window):
+            self.pages = max(self.pages, int(match.group(1)))
+        if max_pages and self.pages > max_pages:
+            raise UploadRejected(f'PDFs are limited to {max_pages} pages.')
+
+    def finish(self):
+        if PDF_SIGNATURE not in self.head:
+            raise UploadRejected('The file is not a valid PDF.')
+
+
+class DocxUploadValidator(UploadValidator):
+    """ZIP signature and decompressed sizes (zip bombs) of Word documents
+
+    The central directory at the end of the archive declares every part's
+    compressed and uncompressed size, and the extractor never inflates a part
+    past its declared size. Only the last ZIP_TAIL_BYTES are kept, and the
+    directory is checked whenever the data received so far ends with a
+    complete end-of-central-directory record, i.e. while the last chunk is
+    being handled.
+    """
+
+    def __init__(self, limits=None):
+        super().__init__(limits)
+        self.head = b''
+        self.tail = bytearray()
+        self.checked = False
+
+    def check_signature(self):
+        if self.head.startswith(ZIP_SIGNATURE):
+            return
+        if self.head == OLE2_SIGNATURE:
+            raise UploadRejected('Legacy Word .doc files are not supported. Please save the resume as PDF or DOCX.')
+        raise UploadRejected('The file is not a valid Word document.')
+
+    def feed(self, chunk):
+        super().feed(chunk)
+
+        if len(self.head) < len(OLE2_SIGNATURE):
+            self.head = (self.head + chunk)[:len(OLE2_SIGNATURE)]
+            if len(self.head) == len(OLE2_SIGNATURE):
+                self.check_signature()
+
+        self.tail += chunk
+        if len(self.tail) > ZIP_TAIL_BYTES:
+            del self.tail[:-ZIP_TAIL_BYTES]
+        self.checked = self.check_central_directory()
+
+    def check_central_directory(self):
+        """Validate the directory if the tail ends with its end record; return whether it did"""
+        tail = self.tail
+        position = tail.rfind(ZIP_END_SIGNATURE, max(0, len(tail) - ZIP_END_STRUCT.size - ZIP_MAX_COMMENT))
+        if position < 0 or len(tail) - position < ZIP_END_STRUCT.size:
+            return False
+        end = ZIP_END_STRUCT.unpack_from(tail, position)
+        entry_count, directory_size, comment_length = end[4], end[5], end[7]
+        if position + ZIP_END_STRUCT.size + comment_length != len(tail):
+            return False
+
+        if entry_count == 0xFFFF or directory_size == ZIP64_LIMIT:
+            raise UploadRejected('The Word document is too large to analyze.')
+        offset = position - directory_size
+        if offset < 0:
+            raise UploadRejected('The Word document has too many parts to analyze.')
+
+        limits = self.limits
+        total = 0
+        for _ in range(entry_count):
+            if offset + ZIP_ENTRY_STRUCT.size > position or tail[offset:offset + 4] != ZIP_ENTRY_SIGNATURE:
+                raise UploadRejected('The Word document is damaged.')
+            entry = ZIP_ENTRY_STRUCT.unpack_from(tail, offset)
+            compressed, uncompressed = entry[10], entry[11]
+            if ZIP64_LIMIT in (compressed, uncompressed):
+                raise UploadRejected('The Word document is too large to analyze.')
+            total += uncompressed
+            ratio_limit = limits['max_compression_ratio']
+            if ratio_limit and uncompressed > ZIP_RATIO_MIN_BYTES and uncompressed > compressed * ratio_limit:
+                raise UploadRejected('The Word document is compressed suspiciously well and was not analyzed.')
+            offset += ZIP_ENTRY_STRUCT.size + entry[12] + entry[13] + entry[14]
+
+        if limits['max_uncompressed_bytes'] and total > limits['max_uncompressed_bytes']:
+            raise UploadRejected(
+                f"Word documents are limited to {format_megabytes(limits['max_uncompressed_bytes'])} uncompressed."
+            )
+        return True
+
+    def finish(self):
+        self.check_signature()
+        if not self.checked:
+            raise UploadRejected('The file is not a valid Word document.')
+
+
+def get_upload_validator(file_name, limits=None):
+    """Validator for an uploaded file, chosen by its extension (other files only get the size cap)"""
+    extension = os.path.splitext(file_name or '')[1].lower()
+    if extension == '.pdf':
+        return PdfUploadValidator(limits)
+    if extension in ('.docx', '.doc'):
+        # .doc uploads are only accepted when they are really DOCX (see extract_docx_text)
+        return DocxUploadValidator(limits)
+    return UploadValidator(limits)
+
@@ -1,14 +1,25 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 urlpatterns = [
-    path('', views.home, name='home'),
+    path('', views.home_async if getattr(settings, 'ANALYSIS_ASYNC_UPLOADS', False) else views.home, name='home'),
+    path('upload/', views.home_async, name='home_async'),
+    path('jobs/<int:job_id>/', views.analysis_status, name='analysis_status'),
+    path('jobs/<int:job_id>/status/', views.analysis_status_json, name='analysis_status_json'),
     path('analysis/<int:analysis_id>/', views.analysis_result, name='analysis_result'),
     path('analysis/<int:analysis_id>/enhanced/', views.enhanced_analysis_result, name='enhanced_analysis_result'),
     path('analysis/<int:analysis_id>/interactive/', views.interactive_review, name='interactive_review'),
     path('analyses/', views.analysis_list, name='analysis_list'),
+    path('search/', views.search, name='search'),
+    path('api/search/', views.search_api, name='search_api'),
+    path('api/batch/', views.batch_api, name='batch_api'),
+    path('api/jobs/', views.jobs_api, name='jobs_api'),
+    path('api/analyses/', views.analyses_api, name='analyses_api'),
+    path('api/analyses/<int:analysis_id>/', views.analysis_api, name='analysis_api'),
     path('keywords/', views.manage_keywords, name='manage_keywords'),
     path('keywords/delete/<int:keyword_id>/', views.delete_keyword, name='delete_keyword'),
     path('about/', views.about, name='about'),
     path('tips/', views.tips, name='tips'),
+    path('metrics', views.metrics, name='metrics'),
 ]
@@ -1,16 +1,35 @@
-import os
-import re
-import docx
-import PyPDF2
-import textstat
-from django.conf import settings
-from .models import JobKeyword, ATSAnalysis
-from collections import Counter
-import nltk
+import time
+from django.db import transaction
+from .models import ATSAnalysis, Resume
+from .analysis_context import AnalysisContext
+from .extraction import (
+    extract_text_from_docx, extract_text_from_path, extract_text_from_pdf,
+    extract_text_from_resume, extract_text_with_info, uploaded_file_source,
+)
+from .content_cache import cache_analysis, cache_text, get_cached_analysis, get_cached_text, hash_bytes, hash_path
+from .keyword_catalog import resolve_catalog
+from .job_description import JobDescriptionCatalog, get_job_description_catalog
+from .metrics import StageTimer, file_type_of, observe_timings
+from .text_rules import GENERIC_PHRASES, WEAK_PHRASES
+from .readability import flesch_reading_ease
+from .scoring import (
+    KEYWORD_FULL_DENSITY, KEYWORD_LOW_DENSITY, KEYWORD_POINTS, READABILITY_BANDS, READABILITY_MIN_POINTS,
+    SECTION_POINTS, TECHNICAL_PENALTY, TECHNICAL_POINTS, scoring_version,
+)
+
+# Heavy libraries (nltk, the hyphenation dictionary) are loaded on first use so
+# management commands and web workers that never analyze a resume don't pay for them.
+_nltk_data_checked = False
 
 
 def download_nltk_data():
-    """Download required NLTK data"""
+    """Download required NLTK data (checked once per process)"""
+    global _nltk_data_checked
+    if _nltk_data_checked:
+        return
+    
+    import nltk
+    
     try:
         nltk.data.find('tokenizers/punkt')
     except LookupError:
@@ -20,70 +39,24 @@ def download_nltk_data():
         nltk.data.find('corpora/stopwords')
     except LookupError:
         nltk.download('stopwords')
+    
+    _nltk_data_checked = True
 
 
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF file"""
-    try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
-    except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
-        return ""
-
-
-def extract_text_from_docx(file_path):
-    """Extract text from DOCX file"""
-    try:
-        doc = docx.Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
-    except Exception as e:
-        print(f"Error extracting text from DOCX: {e}")
-        return ""
-
-
-def extract_text_from_resume(resume):
-    """Extract text from uploaded resume file"""
-    file_path = resume.file.path
-    file_extension = os.path.splitext(file_path)[1].lower()
-    
-    if file_extension == '.pdf':
-        return extract_text_from_pdf(file_path)
-    elif file_extension in ['.docx', '.doc']:
-        return extract_text_from_docx(file_path)
-    else:
-        return ""
+def calculate_readability(text):
+    """Flesch reading ease of the text (see readability.py)"""
+    return flesch_reading_ease(text)
 
 
-def check_contact_info(text):
+def check_contact_info(context):
     """Check if resume contains contact information"""
-    text_lower = text.lower()
-    
-    # Check for email
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    has_email = bool(re.search(email_pattern, text, re.IGNORECASE))
-    
-    # Check for phone number
-    phone_patterns = [
-        r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',  # US format
-        r'\(\d{3}\)\s?\d{3}[-.\s]?\d{4}',      # (123) 456-7890
-        r'\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}'  # International
-    ]
-    has_phone = any(re.search(pattern, text) for pattern in phone_patterns)
-    
-    return has_email or has_phone
+    context = AnalysisContext.of(context)
+    return context.has_email or context.has_phone
 
 
-def check_section_presence(text):
+def check_section_presence(context):
     """Check for presence of common resume sections"""
-    text_lower = text.lower()
+    text_lower = AnalysisContext.of(context).text_lower
     
     # Define section keywords
     sections = {
@@ -99,38 +72,25 @@ def check_section_presence(text):
     return results
 
 
-def calculate_keyword_density(text, industry):
+def calculate_keyword_density(context, industry):
     """Calculate keyword density based on industry-specific keywords"""
-    if not text:
+    context = AnalysisContext.of(context)
+    if not context.text:
         return 0.0
     
-    # Get keywords for the industry
-    keywords = JobKeyword.objects.filter(industry=industry).values_list('keyword', 'weight')
+    # Compiled keywords for the industry (falls back to general keywords)
+    keyword_scan = context.keyword_scan(industry)
+    catalog = keyword_scan.catalog
     
-    if not keywords:
-        # Use general keywords if industry-specific ones don't exist
-        keywords = JobKeyword.objects.filter(industry='general').values_list('keyword', 'weight')
-    
-    if not keywords:
+    if not catalog or catalog.total_weight == 0:
         return 0.0
     
-    text_lower = text.lower()
-    total_weight = 0
-    matched_weight = 0
-    
-    for keyword, weight in keywords:
-        total_weight += weight
-        if keyword.lower() in text_lower:
-            matched_weight += weight
-    
-    if total_weight == 0:
-        return 0.0
-    
-    return (matched_weight / total_weight) * 100
+    return (catalog.matched_weight(keyword_scan) / catalog.total_weight) * 100
 
 
-def check_formatting_issues(text):
+def check_formatting_issues(context):
     """Check for common formatting issues that affect ATS readability"""
+    context = AnalysisContext.of(context)
     issues = {
         'has_images': False,  # Can't detect from text, would need file analysis
         'has_tables': False,  # Simple check for table-like structures
@@ -138,96 +98,83 @@ def check_formatting_issues(text):
     }
     
     # Check for table-like structures (multiple tabs or excessive spacing)
-    if re.search(r'\t{2,}|\s{5,}', text):
+    if context.has_table_layout:
         issues['has_tables'] = True
     
     # Check for excessive special characters
-    special_char_count = len(re.findall(r'[^\w\s\-.,;:!?()@]', text))
-    if special_char_count > len(text) * 0.05:  # More than 5% special characters
+    if context.special_char_count > len(context.text) * 0.05:  # More than 5% special characters
         issues['has_special_characters'] = True
     
     return issues
 
 
-def analyze_missing_keywords(text, industry):
+def analyze_missing_keywords(context, industry):
     """Analyze what keywords are missing from the resume"""
-    keywords = JobKeyword.objects.filter(industry=industry).order_by('-weight')[:20]
-    if not keywords:
-        keywords = JobKeyword.objects.filter(industry='general').order_by('-weight')[:15]
+    keyword_scan = AnalysisContext.of(context).keyword_scan(industry)
+    catalog = keyword_scan.catalog
+    keywords = catalog.top(20 if catalog.serves(industry) else 15)
     
-    text_lower = text.lower()
     missing_keywords = []
     present_keywords = []
     
-    for keyword_obj in keywords:
-        keyword = keyword_obj.keyword.lower()
-        if keyword in text_lower:
-            present_keywords.append((keyword_obj.keyword, keyword_obj.weight))
+    for keyword, weight in keywords:
+        if keyword_scan.contains(keyword):
+            present_keywords.append((keyword, weight))
         else:
-            missing_keywords.append((keyword_obj.keyword, keyword_obj.weight))
+            missing_keywords.append((keyword, weight))
     
     return missing_keywords[:10], present_keywords  # Return top 10 missing
 
 
-def analyze_text_issues(text, industry):
+def analyze_text_issues(context, industry):
     """Analyze specific text issues that can be highlighted and improved"""
+    context = AnalysisContext.of(context)
     issues = []
-    lines = text.split('\n')
     
     # Get industry keywords for suggestions
-    keywords_objs = JobKeyword.objects.filter(industry=industry).order_by('-weight')[:15]
-    if not keywords_objs:
-        keywords_objs = JobKeyword.objects.filter(industry='general').order_by('-weight')[:10]
-    
-    industry_keywords = [kw.keyword.lower() for kw in keywords_objs]
-    
-    # Define weak phrases to strong alternatives
-    weak_to_strong = {
-        'responsible for': ['Led', 'Managed', 'Oversaw', 'Directed'],
-        'duties included': ['Achieved', 'Delivered', 'Executed', 'Accomplished'],
-        'worked on': ['Developed', 'Built', 'Created', 'Implemented'],
-        'helped with': ['Collaborated on', 'Contributed to', 'Assisted in', 'Supported'],
-        'worked with': ['Partnered with', 'Collaborated with', 'Coordinated with'],
-        'was involved in': ['Participated in', 'Contributed to', 'Played a key role in'],
-        'did': ['Executed', 'Performed', 'Completed', 'Delivered'],
-        'made': ['Created', 'Developed', 'Built', 'Established'],
-    }
-    
-    # Analyze each line for issues
-    for line_num, line in enumerate(lines, 1):
-        line_lower = line.lower().strip()
-        if not line_lower or len(line_lower) < 10:  # Skip short lines
+    keyword_scan = context.keyword_scan(industry)
+    catalog = keyword_scan.catalog
+    keywords = catalog.top(15 if catalog.serves(industry) else 10)
+    
+    industry_keywords = [keyword.lower() for keyword, _ in keywords]
+    
+    # Every phrase and signal occurrence, found in one pass over the text (see text_rules.py);
+    # lines without any can't have issues
+    for line_index, matches in sorted(context.rule_matches_by_line.items()):
+        line = context.lines[line_index]
+        line_lower = context.lines_lower[line_index]
+        stripped = line_lower.strip()
+        if not stripped or len(stripped) < 10:  # Skip short lines
             continue
         
+        # Offsets are reported relative to the stripped line text
+        line_start = context.line_offsets[line_index][0] + len(line_lower) - len(line_lower.lstrip())
+        line_text = line.strip()
+        signals = {match.rule.key for match in matches if match.rule.kind == 'signal'}
+        
         line_issues = []
         
         # Check for weak verbs
-        for weak_phrase, strong_alternatives in weak_to_strong.items():
-            if weak_phrase in line_lower:
-                # Find the position of the weak phrase
-                start_pos = line_lower.find(weak_phrase)
-                end_pos = start_pos + len(weak_phrase)
-                
+        for match in matches:
+            if match.rule.kind == 'weak_verb':
+                alternatives = WEAK_PHRASES[match.rule.key]
                 line_issues.append({
                     'type': 'weak_verb',
-                    'start': start_pos,
-                    'end': end_pos,
-                    'text': weak_phrase,
-                    'suggestion': f"Replace with stronger verbs like: {', '.join(strong_alternatives[:3])}",
-                    'alternatives': strong_alternatives,
+                    'start': match.start - line_start,
+                    'end': match.end - line_start,
+                    'text': line_text[match.start - line_start:match.end - line_start],
+                    'suggestion': f"Replace with stronger verbs like: {', '.join(alternatives[:3])}",
+                    'alternatives': alternatives,
                     'priority': 'high'
                 })
         
         # Check for missing quantifiable data
-        has_numbers = bool(re.search(r'\d+%|\$[\d,]+|\d+\+|\d+ (years|months|people|clients|projects)', line_lower))
-        has_achievement_words = any(word in line_lower for word in ['increased', 'decreased', 'improved', 'reduced', 'grew', 'achieved', 'delivered', 'completed'])
-        
-        if has_achievement_words and not has_numbers:
+        if 'achievement' in signals and 'quantified' not in signals:
             line_issues.append({
                 'type': 'missing_quantification',
                 'start': 0,
-                'end': len(line),
-                'text': line.strip(),
+                'end': len(line_text),
+                'text': line_text,
                 'suggestion': 'Add specific numbers, percentages, or metrics to quantify this achievement',
                 'examples': ['25% increase', '$50K savings', '10+ projects', '3 years experience'],
                 'priority': 'medium'
@@ -235,39 +182,32 @@ def analyze_text_issues(text, industry):
         
         # Check for missing keywords
         missing_keywords_in_line = []
-        for keyword in industry_keywords[:8]:  # Check top keywords
-            if keyword not in line_lower and any(word in line_lower for word in ['skills', 'experience', 'expertise', 'proficient']):
-                missing_keywords_in_line.append(keyword)
+        if 'section_cue' in signals:
+            line_keywords = keyword_scan.found_between(*context.line_offsets[line_index])
+            for keyword in industry_keywords[:8]:  # Check top keywords
+                if keyword not in line_keywords:
+                    missing_keywords_in_line.append(keyword)
         
         if missing_keywords_in_line and ('skills' in line_lower or 'experience' in line_lower):
             line_issues.append({
                 'type': 'missing_keywords',
                 'start': 0,
-                'end': len(line),
-                'text': line.strip(),
+                'end': len(line_text),
+                'text': line_text,
                 'suggestion': f"Consider adding relevant keywords: {', '.join(missing_keywords_in_line[:4])}",
                 'keywords': missing_keywords_in_line[:4],
                 'priority': 'medium'
             })
         
         # Check for generic phrases
-        generic_phrases = {
-            'team player': 'Collaborated effectively with cross-functional teams',
-            'hard worker': 'Delivered consistent high-quality results',
-            'detail oriented': 'Maintained 99%+ accuracy in data analysis',
-            'fast learner': 'Rapidly acquired new technical skills',
-            'go-getter': 'Proactively identified and pursued opportunities'
-        }
-        
-        for generic, specific in generic_phrases.items():
-            if generic in line_lower:
-                start_pos = line_lower.find(generic)
-                end_pos = start_pos + len(generic)
+        for match in matches:
+            if match.rule.kind == 'generic_phrase':
+                specific = GENERIC_PHRASES[match.rule.key]
                 line_issues.append({
                     'type': 'generic_phrase',
-                    'start': start_pos,
-                    'end': end_pos,
-                    'text': generic,
+                    'start': match.start - line_start,
+                    'end': match.end - line_start,
+                    'text': line_text[match.start - line_start:match.end - line_start],
                     'suggestion': f'Replace with specific example: "{specific}"',
                     'alternative': specific,
                     'priority': 'low'
@@ -275,22 +215,22 @@ def analyze_text_issues(text, industry):
         
         if line_issues:
             issues.append({
-                'line_number': line_num,
-                'line_text': line.strip(),
+                'line_number': line_index + 1,
+                'line_text': line_text,
                 'issues': line_issues
             })
     
     return issues
 
 
-def analyze_content_gaps(text):
+def analyze_content_gaps(context):
     """Analyze specific content gaps in the resume"""
-    text_lower = text.lower()
+    context = AnalysisContext.of(context)
+    text_lower = context.text_lower
     gaps = []
     
     # Check for quantifiable achievements
-    has_numbers = bool(re.search(r'\d+%|\$\d+|\d+\+|increased by \d+|reduced \d+|managed \d+', text))
-    if not has_numbers:
+    if not context.has_metrics:
         gaps.append({
             'type': 'quantifiable_achievements',
             'title': 'Add Quantifiable Achievements',
@@ -462,92 +402,136 @@ def generate_recommendations(analysis):
 
 
 def calculate_overall_score(analysis):
-    """Calculate overall ATS compatibility score"""
+    """Calculate overall ATS compatibility score (weights live in scoring.py)"""
     score = 0
     
     # Section completeness (40 points total)
     section_score = 0
     if analysis.has_contact_info:
-        section_score += 10
+        section_score += SECTION_POINTS
     if analysis.has_work_experience:
-        section_score += 10
+        section_score += SECTION_POINTS
     if analysis.has_education:
-        section_score += 10
+        section_score += SECTION_POINTS
     if analysis.has_skills:
-        section_score += 10
+        section_score += SECTION_POINTS
     
     score += section_score
     
     # Keyword density (25 points)
-    if analysis.keyword_density >= 20:
-        keyword_score = min(25, analysis.keyword_density * 25 / 60)  # Cap at 25 points
+    if analysis.keyword_density >= KEYWORD_LOW_DENSITY:
+        keyword_score = min(KEYWORD_POINTS, analysis.keyword_density * KEYWORD_POINTS / KEYWORD_FULL_DENSITY)  # Cap at 25 points
     else:
-        keyword_score = analysis.keyword_density * 25 / 20
+        keyword_score = analysis.keyword_density * KEYWORD_POINTS / KEYWORD_LOW_DENSITY
     
     score += keyword_score
     
     # Readability (20 points)
-    if 30 <= analysis.readability_score <= 70:
-        readability_score = 20
-    elif 20 <= analysis.readability_score < 30 or 70 < analysis.readability_score <= 80:
-        readability_score = 15
-    elif 10 <= analysis.readability_score < 20 or 80 < analysis.readability_score <= 90:
-        readability_score = 10
-    else:
-        readability_score = 5
+    readability_score = READABILITY_MIN_POINTS
+    for (low, high), points in READABILITY_BANDS:
+        if low <= analysis.readability_score <= high:
+            readability_score = points
+            break
     
     score += readability_score
     
     # Technical issues (15 points - deductions)
-    technical_score = 15
+    technical_score = TECHNICAL_POINTS
     if analysis.has_tables:
-        technical_score -= 5
+        technical_score -= TECHNICAL_PENALTY
     if analysis.has_special_characters:
-        technical_score -= 5
+        technical_score -= TECHNICAL_PENALTY
     if analysis.has_images:
-        technical_score -= 5
+        technical_score -= TECHNICAL_PENALTY
     
     score += max(0, technical_score)
     
     return min(100, max(0, score))
 
 
-def analyze_resume(resume, industry='general'):
-    """Perform complete ATS analysis on a resume"""
-    # Ensure NLTK data is downloaded
-    download_nltk_data()
-    
-    # Extract text
-    extracted_text = extract_text_from_resume(resume)
+EXTRACTION_FAILURE_MESSAGES = {
+    'error': "Unable to analyze resume - file may be corrupted or in unsupported format.",
+    'timeout': "Unable to analyze resume - the file took too long to process. Try saving it again as a standard PDF or DOCX.",
+    'memory_limit': "Unable to analyze resume - the file is too large or complex to process. Try a simpler export of your resume.",
+    'unsupported': "Legacy Word (.doc) files can't be read reliably - save your resume as .docx or PDF and upload it again.",
+    'crashed': "Unable to analyze resume - the file could not be processed safely. Try saving it again as a standard PDF or DOCX.",
+}
+
+
+def keyword_source(industry='general', job_description=''):
+    """What to score keywords against: the job description's catalog if one was given, else the industry"""
+    if job_description and job_description.strip():
+        return get_job_description_catalog(job_description)
+    return industry
+
+
+def job_description_summary(keywords):
+    """What additional_data records about a job description catalog (None for industry keywords)"""
+    if not isinstance(keywords, JobDescriptionCatalog):
+        return None
+    return {'hash': keywords.content_hash, 'keywords': keywords.keywords}
+
+
+def build_analysis(extracted_text, industry='general', extraction=None, timer=None, job_description=''):
+    """Run every analysis stage in memory and return an unsaved ATSAnalysis (without a resume)
+    
+    ``extraction`` is the info dict from extract_text_with_info (pages read, truncation),
+    stored with the analysis. Stage timings are collected on ``timer`` (a StageTimer)
+    and stored in ``additional_data['timings']``. With a ``job_description``, keywords
+    come from it instead of the industry catalog.
+    """
+    extraction = extraction or {}
+    extraction_status = extraction.get('outcome', 'ok')
+    timer = timer or StageTimer()
+    
+    with timer.stage('keyword_source'):
+        keywords = keyword_source(industry, job_description)
+        catalog = resolve_catalog(keywords)
     
     if not extracted_text:
-        # Create minimal analysis if text extraction failed
-        analysis = ATSAnalysis.objects.create(
-            resume=resume,
+        # Minimal analysis if text extraction failed
+        return ATSAnalysis(
             extracted_text="Failed to extract text",
             word_count=0,
             overall_score=0,
-            recommendations="Unable to analyze resume - file may be corrupted or in unsupported format."
+            recommendations=EXTRACTION_FAILURE_MESSAGES.get(extraction_status, EXTRACTION_FAILURE_MESSAGES['error']),
+            extraction_status='error' if extraction_status == 'ok' else extraction_status,
+            industry=industry,
+            keyword_catalog=catalog.industry,
+            keyword_catalog_version=catalog.version,
+            additional_data={
+                'industry': industry,
+                'extraction': extraction,
+                'job_description': job_description_summary(keywords),
+                'timings': timer.rounded()
+            }
         )
-        return analysis
+    
+    # Lowercase, split and scan the text once for every check below
+    context = AnalysisContext(extracted_text)
     
     # Basic text analysis
-    word_count = len(extracted_text.split())
+    with timer.stage('word_count'):
+        word_count = context.word_count
     
     # Check sections
-    has_contact_info = check_contact_info(extracted_text)
-    sections = check_section_presence(extracted_text)
+    with timer.stage('contact_info'):
+        has_contact_info = check_contact_info(context)
+    with timer.stage('sections'):
+        sections = check_section_presence(context)
     
     # Calculate scores
-    keyword_density = calculate_keyword_density(extracted_text, industry)
-    readability_score = textstat.flesch_reading_ease(extracted_text)
+    with timer.stage('keyword_density'):
+        keyword_density = calculate_keyword_density(context, keywords)
+    with timer.stage('readability'):
+        readability_score = calculate_readability(extracted_text)
     
     # Check formatting issues
-    formatting_issues = check_formatting_issues(extracted_text)
+    with timer.stage('formatting'):
+        formatting_issues = check_formatting_issues(context)
     
     # Create analysis object
-    analysis = ATSAnalysis.objects.create(
-        resume=resume,
+    analysis = ATSAnalysis(
         extracted_text=extracted_text,
         word_count=word_count,
         has_contact_info=has_contact_info,
@@ -558,20 +542,30 @@ def analyze_resume(resume, industry='general'):
         readability_score=readability_score,
         has_tables=formatting_issues['has_tables'],
         has_special_characters=formatting_issues['has_special_characters'],
-        has_images=formatting_issues['has_images']
+        has_images=formatting_issues['has_images'],
+        extraction_status=extraction_status,
+        analysis_version=scoring_version(),
+        industry=industry,
+        keyword_catalog=catalog.industry,
+        keyword_catalog_version=catalog.version
     )
     
-    # Calculate overall score
-    analysis.overall_score = calculate_overall_score(analysis)
-    
-    # Generate recommendations
-    analysis.recommendations = generate_recommendations(analysis)
+    with timer.stage('scoring'):
+        # Calculate overall score
+        analysis.overall_score = calculate_overall_score(analysis)
+        
+        # Generate recommendations
+        analysis.recommendations = generate_recommendations(analysis)
     
     # Analyze additional details
-    missing_keywords, present_keywords = analyze_missing_keywords(extracted_text, industry)
-    content_gaps = analyze_content_gaps(extracted_text)
-    section_improvements = analyze_section_improvements(analysis)
-    text_issues = analyze_text_issues(extracted_text, industry)
+    with timer.stage('missing_keywords'):
+        missing_keywords, present_keywords = analyze_missing_keywords(context, keywords)
+    with timer.stage('content_gaps'):
+        content_gaps = analyze_content_gaps(context)
+    with timer.stage('section_improvements'):
+        section_improvements = analyze_section_improvements(analysis)
+    with timer.stage('text_issues'):
+        text_issues = analyze_text_issues(context, keywords)
     
     # Store additional analysis data in JSON field
     analysis.additional_data = {
@@ -580,14 +574,165 @@ def analyze_resume(resume, industry='general'):
         'content_gaps': content_gaps,
         'section_improvements': section_improvements,
         'text_issues': text_issues,
-        'industry': industry
+        'industry': industry,
+        'extraction': extraction,
+        'job_description': job_description_summary(keywords),
+        'timings': timer.rounded()
     }
     
-    # Save analysis
-    analysis.save()
+    return analysis
+
+
+def refresh_keyword_stages(analysis, industry='general'):
+    """Recompute the keyword-dependent results of a stored analysis against the current catalog
+    
+    Only keyword density (and the score and recommendations derived from it),
+    missing/present keywords and text issues are redone, from the stored
+    extracted text; readability, formatting and section checks are kept.
+    The score comes from the current weights, so the analysis is stamped
+    with the current scoring version.
+    """
+    context = AnalysisContext(analysis.extracted_text)
+    
+    analysis.keyword_density = calculate_keyword_density(context, industry)
+    analysis.overall_score = calculate_overall_score(analysis)
+    analysis.analysis_version = scoring_version()
+    analysis.recommendations = generate_recommendations(analysis)
+    missing_keywords, present_keywords = analyze_missing_keywords(context, industry)
+    text_issues = analyze_text_issues(context, industry)
+    
+    # Record the catalog the scan actually used
+    catalog = context.keyword_scan(industry).catalog
+    analysis.keyword_catalog = catalog.industry
+    analysis.keyword_catalog_version = catalog.version
+    analysis.additional_data = dict(
+        analysis.additional_data or {},
+        missing_keywords=missing_keywords,
+        present_keywords=present_keywords,
+        text_issues=text_issues,
+    )
+    return analysis
+
+
+def build_analysis_for_file(file_path, industry='general', content_hash=None, timer=None, job_description='',
+                            content=None):
+    """Analyze a file on disk, reusing cached extraction and analysis for identical content
+    
+    With content (the file's bytes, e.g. an upload still in memory) nothing is
+    read from file_path. Returns (unsaved ATSAnalysis, content hash).
+    """
+    timer = timer or StageTimer()
+    started = time.perf_counter()
+    
+    if not content_hash:
+        with timer.stage('hash'):
+            content_hash = hash_path(file_path) if content is None else hash_bytes(content)
+    
+    # Analyses are cached per keyword set: the industry's catalog, or the job description's
+    catalog = resolve_catalog(keyword_source(industry, job_description))
+    cache_scope = f'{industry}:{catalog.industry}' if isinstance(catalog, JobDescriptionCatalog) else industry
+    catalog_version = catalog.version
+    
+    with timer.stage('cache_lookup'):
+        analysis = get_cached_analysis(content_hash, cache_scope, catalog_version)
+    if analysis is None:
+        with timer.stage('cache_lookup'):
+            cached = get_cached_text(content_hash)
+        if cached is None:
+            with timer.stage('extraction'):
+                extracted_text, extraction = extract_text_with_info(file_path, content)
+            if extracted_text:
+                with timer.stage('cache_write'):
+                    cache_text(content_hash, extracted_text, extraction)
+        else:
+            extracted_text, extraction = cached
+        
+        analysis = build_analysis(extracted_text, industry, extraction, timer, job_description)
+        if extracted_text:
+            with timer.stage('cache_write'):
+                cache_analysis(content_hash, cache_scope, catalog_version, analysis)
+    
+    # Entries cached before these columns existed lack them; the key pins their values anyway
+    analysis.industry = industry
+    analysis.keyword_catalog = catalog.industry
+    analysis.keyword_catalog_version = catalog_version
+    
+    # Record this run's timings (a cached analysis carries those of the run that computed it)
+    timer.add('total', (time.perf_counter() - started) * 1000)
+    analysis.additional_data = dict(analysis.additional_data or {}, timings=timer.rounded())
+    return analysis, content_hash
+
+
+def save_analysis(resume, analysis, content_hash='', timer=None):
+    """Insert a computed analysis and mark its resume processed in one transaction
+    
+    One INSERT for the analysis and one targeted UPDATE of the resume's
+    processed/content_hash columns, so concurrent uploads hold SQLite's write
+    lock as briefly as possible. With a timer, the time spent writing (lock
+    wait included) is added to it as db_write and stored with the analysis's
+    other timings by one more UPDATE in the same transaction.
+    """
+    processed = analysis.word_count > 0
+    started = time.perf_counter()
+    with transaction.atomic():
+        analysis.resume = resume
+        analysis.save(force_insert=True)
+        Resume.objects.filter(pk=resume.pk).update(processed=processed, content_hash=content_hash)
+        if timer is not None:
+            timer.add('db_write', (time.perf_counter() - started) * 1000)
+            analysis.additional_data = dict(analysis.additional_data or {}, timings=timer.rounded())
+            ATSAnalysis.objects.filter(pk=analysis.pk).update(additional_data=analysis.additional_data)
+    
+    resume.processed = processed
+    resume.content_hash = content_hash
+    return analysis
+
+
+def bulk_save_analyses(pairs):
+    """Insert (unsaved resume, unsaved analysis) pairs with one bulk INSERT per table
+    
+    Each resume is marked processed if its text was extracted. Returns the
+    saved analyses in the same order.
+    """
+    pairs = list(pairs)
+    with transaction.atomic():
+        for resume, analysis in pairs:
+            resume.processed = analysis.word_count > 0
+        resumes = Resume.objects.bulk_create([resume for resume, _ in pairs])
+        
+        analyses = []
+        for resume, (_, analysis) in zip(resumes, pairs):
+            analysis.resume = resume
+            analyses.append(analysis)
+        return ATSAnalysis.objects.bulk_create(analyses)
+
+
+def resume_source(resume, upload=None):
+    """(file path, content) to extract a saved resume from, preferring its upload if still in memory"""
+    if upload is not None and not hasattr(upload, 'temporary_file_path'):
+        return uploaded_file_source(upload)
+    # Larger uploads were spooled to a temporary file that storage moved into
+    # place, so the stored copy is that same file
+    return resume.file.path, None
+
+
+def analyze_resume(resume, industry='general', job_description='', upload=None):
+    """Perform complete ATS analysis on a resume, optionally against a job description
+    
+    Pass the request's uploaded file as upload to extract from it directly
+    instead of reading back the stored copy.
+    """
+    timer = StageTimer()
+    file_path, content = resume_source(resume, upload)
+    
+    # Extract text, score and build recommendations in memory (or reuse results for identical content)
+    analysis, content_hash = build_analysis_for_file(
+        file_path, industry, resume.content_hash, timer, job_description, content
+    )
+    
+    # Persist everything at once
+    save_analysis(resume, analysis, content_hash, timer)
     
-    # Mark resume as processed
-    resume.processed = True
-    resume.save()
+    observe_timings(timer.timings, file_type_of(resume.file.name))
     
     return analysis
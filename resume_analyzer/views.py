@@ -1,25 +1,55 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import HttpResponseRedirect
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
 from django.urls import reverse
-from .models import Resume, ATSAnalysis, JobKeyword
+from .models import Resume, ATSAnalysis, JobKeyword, AnalysisJob
 from .forms import ResumeUploadForm, JobKeywordForm
 from .utils import analyze_resume
-from django.core.paginator import Paginator
+from .jobs import enqueue_analysis
+from .metrics import PROMETHEUS_CONTENT_TYPE, render_prometheus
+from .page_cache import analysis_page
+from .pagination import approximate_count, keyset_page
+from .search import search_analyses
+from .reanalysis import affected_industries, stale_counts
+from .upload_handlers import posted_files, rejected_uploads
+from .analysis_pool import analyze_resume_async
+from .api import (
+    analysis_documents, api_view, job_documents, ordered_results, parse_ids, parse_manifest, select_fields,
+    submit_batch,
+)
 import os
 
 
+def _bound_upload_form(request):
+    """The upload form bound to the request; reading request.FILES runs the upload handlers"""
+    form = ResumeUploadForm(request.POST, request.FILES, upload_errors=rejected_uploads(request))
+    form.is_valid()
+    return form
+
+
 def home(request):
     """Home page with upload form"""
     if request.method == 'POST':
-        form = ResumeUploadForm(request.POST, request.FILES)
+        form = _bound_upload_form(request)
         if form.is_valid():
-            resume = form.save()
+            resume = form.save(commit=False)
+            # Digest computed while the upload streamed in (see ContentHashUploadHandler)
+            resume.content_hash = getattr(request, 'upload_content_hashes', {}).get('file', '')
+            resume.save()
             industry = form.cleaned_data.get('industry', 'general')
+            job_description = form.cleaned_data.get('job_description', '')
+            
+            if getattr(settings, 'ANALYSIS_USE_QUEUE', False):
+                # Hand off to the background workers (manage.py run_analysis_workers)
+                job = enqueue_analysis(resume, industry, job_description)
+                return redirect('analysis_status', job_id=job.id)
             
             try:
                 # Analyze the resume
-                analysis = analyze_resume(resume, industry)
+                # Extracted from the upload itself rather than read back from storage
+                analysis = analyze_resume(resume, industry, job_description, upload=form.cleaned_data['file'])
                 messages.success(request, f'Resume analyzed successfully! Your ATS score is {analysis.overall_score:.1f}')
                 return redirect('interactive_review', analysis_id=analysis.id)
             except Exception as e:
@@ -31,7 +61,7 @@ def home(request):
         form = ResumeUploadForm()
     
     # Get recent analyses for display
-    recent_analyses = ATSAnalysis.objects.select_related('resume').order_by('-analyzed_at')[:5]
+    recent_analyses = ATSAnalysis.objects.summaries().order_by('-analyzed_at')[:5]
     
     context = {
         'form': form,
@@ -40,6 +70,90 @@ def home(request):
     return render(request, 'resume_analyzer/home.html', context)
 
 
+async def home_async(request):
+    """Home page with upload form, as an async view for ASGI servers
+    
+    The request body is parsed and validated in a worker thread, the file is
+    written to storage in another, database access goes through sync_to_async
+    and the analysis runs in the analysis process pool, so the event loop is
+    never blocked and one process can hold many uploads in flight.
+    """
+    if request.method == 'POST':
+        # Parsing runs the upload handlers (hashing, validation), and the form may
+        # extract an uploaded job description; neither touches the database
+        form = await sync_to_async(_bound_upload_form, thread_sensitive=False)(request)
+        if form.is_valid():
+            resume = form.save(commit=False)
+            resume.content_hash = getattr(request, 'upload_content_hashes', {}).get('file', '')
+            upload = form.cleaned_data['file']
+            resume.original_filename = upload.name
+            await sync_to_async(resume.file.save, thread_sensitive=False)(upload.name, upload, save=False)
+            await sync_to_async(resume.save)()
+            industry = form.cleaned_data.get('industry', 'general')
+            job_description = form.cleaned_data.get('job_description', '')
+            
+            if getattr(settings, 'ANALYSIS_USE_QUEUE', False):
+                job = await sync_to_async(enqueue_analysis)(resume, industry, job_description)
+                return redirect('analysis_status', job_id=job.id)
+            
+            try:
+                analysis = await analyze_resume_async(resume, industry, job_description, upload=upload)
+                messages.success(request, f'Resume analyzed successfully! Your ATS score is {analysis.overall_score:.1f}')
+                return redirect('interactive_review', analysis_id=analysis.id)
+            except Exception as e:
+                messages.error(request, f'Error analyzing resume: {str(e)}')
+                return redirect('home')
+        else:
+            messages.error(request, 'Please correct the errors below.')
+    else:
+        form = ResumeUploadForm()
+    
+    recent_analyses = await sync_to_async(list)(ATSAnalysis.objects.summaries().order_by('-analyzed_at')[:5])
+    
+    context = {
+        'form': form,
+        'recent_analyses': recent_analyses,
+    }
+    return render(request, 'resume_analyzer/home.html', context)
+
+
+def analysis_status(request, job_id):
+    """Waiting page for a queued analysis; polls analysis_status_json until done"""
+    job = get_object_or_404(AnalysisJob.objects.select_related('resume'), id=job_id)
+    
+    if job.status == AnalysisJob.STATUS_DONE and job.analysis_id:
+        score = ATSAnalysis.objects.filter(id=job.analysis_id).values_list('overall_score', flat=True).first() or 0
+        messages.success(request, f'Resume analyzed successfully! Your ATS score is {score:.1f}')
+        return redirect('interactive_review', analysis_id=job.analysis_id)
+    
+    context = {
+        'job': job,
+    }
+    return render(request, 'resume_analyzer/analysis_status.html', context)
+
+
+def analysis_status_json(request, job_id):
+    """Lightweight job status for polling"""
+    job = (
+        AnalysisJob.objects.filter(id=job_id)
+        .values('status', 'analysis_id', 'error')
+        .first()
+    )
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    
+    data = {
+        'status': job['status'],
+        'analysis_id': job['analysis_id'],
+    }
+    if job['status'] == AnalysisJob.STATUS_DONE and job['analysis_id']:
+        data['redirect_url'] = reverse('analysis_status', args=[job_id])
+    elif job['status'] == AnalysisJob.STATUS_FAILED:
+        data['error'] = job['error']
+    return JsonResponse(data)
+
+
+@analysis_page
 def analysis_result(request, analysis_id):
     """Display analysis results"""
     analysis = get_object_or_404(ATSAnalysis, id=analysis_id)
@@ -76,6 +190,7 @@ def analysis_result(request, analysis_id):
     return render(request, 'resume_analyzer/analysis_result.html', context)
 
 
+@analysis_page
 def enhanced_analysis_result(request, analysis_id):
     """Display enhanced analysis results with detailed suggestions"""
     analysis = get_object_or_404(ATSAnalysis, id=analysis_id)
@@ -93,10 +208,12 @@ def enhanced_analysis_result(request, analysis_id):
         'present_keywords': present_keywords,
         'content_gaps': content_gaps,
         'section_improvements': section_improvements,
+        'job_description': additional_data.get('job_description'),
     }
     return render(request, 'resume_analyzer/enhanced_analysis_result.html', context)
 
 
+@analysis_page
 def interactive_review(request, analysis_id):
     """Display interactive resume review with highlighted text and inline suggestions"""
     analysis = get_object_or_404(ATSAnalysis, id=analysis_id)
@@ -127,12 +244,17 @@ def interactive_review(request, analysis_id):
 
 def analysis_list(request):
     """Display list of all analyses"""
-    analyses = ATSAnalysis.objects.select_related('resume').order_by('-analyzed_at')
+    analyses = ATSAnalysis.objects.summaries()
     
-    # Pagination
-    paginator = Paginator(analyses, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination on (analyzed_at, id): every page is an index range scan, no OFFSET
+    page_obj = keyset_page(
+        analyses,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+        per_page=20,
+    )
+    if getattr(settings, 'ANALYSIS_LIST_SHOW_COUNT', True):
+        page_obj.count = approximate_count(ATSAnalysis.objects.all(), 'analysis_list_count')
     
     context = {
         'page_obj': page_obj,
@@ -140,23 +262,163 @@ def analysis_list(request):
     return render(request, 'resume_analyzer/analysis_list.html', context)
 
 
+def _search_params(request):
+    """Query and filters from the search form / API query string (invalid values are ignored)"""
+    def number(name, cast=float):
+        try:
+            return cast(request.GET.get(name, ''))
+        except ValueError:
+            return None
+    
+    industry = request.GET.get('industry', '')
+    page = number('page', int)
+    per_page = number('per_page', int)
+    return {
+        'query': request.GET.get('q', '').strip(),
+        'min_score': number('min_score'),
+        'max_score': number('max_score'),
+        'industry': industry if industry in dict(JobKeyword.INDUSTRY_CHOICES) else None,
+        'page': page if page and page > 0 else 1,
+        'per_page': min(per_page, 100) if per_page and per_page > 0 else 20,
+    }
+
+
+def search(request):
+    """Full-text search across analyzed resumes, best match first"""
+    params = _search_params(request)
+    page_obj = search_analyses(**params) if params['query'] else None
+    
+    # Query string without the page number, for the pagination links
+    query = request.GET.copy()
+    query.pop('page', None)
+    
+    context = {
+        'page_obj': page_obj,
+        'params': params,
+        'query_string': query.urlencode(),
+        'industries': JobKeyword.INDUSTRY_CHOICES,
+    }
+    return render(request, 'resume_analyzer/search.html', context)
+
+
+@api_view(['GET'])
+def search_api(request):
+    """JSON search results: ranked analyses with highlighted snippets"""
+    params = _search_params(request)
+    if not params['query']:
+        return JsonResponse({'error': 'Missing search query (q)'}, status=400)
+    
+    page_obj = search_analyses(**params)
+    results = [
+        {
+            'id': analysis.id,
+            'filename': analysis.resume.original_filename,
+            'overall_score': analysis.overall_score,
+            'industry': analysis.industry,
+            'analyzed_at': analysis.analyzed_at.isoformat(),
+            'rank': analysis.rank,
+            'snippet': analysis.snippet,
+            'url': reverse('analysis_result', args=[analysis.id]),
+        }
+        for analysis in page_obj
+    ]
+    return JsonResponse({'page': page_obj.number, 'has_next': page_obj.has_next, 'results': results})
+
+
+@api_view(['POST'])
+def batch_api(request):
+    """Submit many resumes in one multipart request and get job (or analysis) ids back
+    
+    Files are posted as repeated "files" fields. industry, job_description,
+    name and email apply to every file; a "manifest" field (a JSON list, one
+    object per file) overrides them per file and may carry a "reference"
+    that is echoed back.
+    """
+    posted = posted_files(request, 'files')
+    if not posted:
+        return JsonResponse({'error': 'No files posted (files)'}, status=400)
+    max_files = getattr(settings, 'API_BATCH_MAX_FILES', 50)
+    if len(posted) > max_files:
+        return JsonResponse({'error': f'At most {max_files} files can be submitted at once'}, status=400)
+    try:
+        manifest = parse_manifest(request.POST.get('manifest', ''), len(posted))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    defaults = {key: request.POST[key] for key in ('industry', 'job_description', 'name', 'email') if key in request.POST}
+    use_queue = getattr(settings, 'ANALYSIS_USE_QUEUE', False)
+    items = submit_batch(posted, defaults, manifest, use_queue)
+    
+    data = {'items': items}
+    job_ids = [item['job_id'] for item in items if 'job_id' in item]
+    analysis_ids = [item['analysis_id'] for item in items if 'analysis_id' in item]
+    if job_ids:
+        data['jobs_url'] = f"{reverse('jobs_api')}?ids={','.join(map(str, job_ids))}"
+    if analysis_ids:
+        data['analyses_url'] = f"{reverse('analyses_api')}?ids={','.join(map(str, analysis_ids))}"
+    return JsonResponse(data, status=202 if job_ids else 200)
+
+
+@api_view(['GET'])
+def jobs_api(request):
+    """Status of many queued analyses at once (?ids=1,2,3), in the requested order"""
+    try:
+        ids = parse_ids(request.GET.get('ids', ''))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    results, missing = ordered_results(job_documents(ids), ids)
+    return JsonResponse({'results': results, 'missing': missing})
+
+
+@api_view(['GET'])
+def analyses_api(request):
+    """Result documents of many analyses at once (?ids=1,2,3), with ?fields= / ?exclude= selection"""
+    try:
+        ids = parse_ids(request.GET.get('ids', ''))
+        fields = select_fields(request.GET.get('fields', ''), request.GET.get('exclude', ''))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    results, missing = ordered_results(analysis_documents(ids, fields), ids)
+    return JsonResponse({'results': results, 'missing': missing})
+
+
+@api_view(['GET'])
+def analysis_api(request, analysis_id):
+    """Result document of one analysis, with ?fields= / ?exclude= selection"""
+    try:
+        fields = select_fields(request.GET.get('fields', ''), request.GET.get('exclude', ''))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    document = analysis_documents([analysis_id], fields).get(analysis_id)
+    if document is None:
+        return JsonResponse({'error': 'Analysis not found'}, status=404)
+    return JsonResponse(document)
+
+
 def manage_keywords(request):
     """Manage job keywords for different industries"""
     if request.method == 'POST':
         form = JobKeywordForm(request.POST)
         if form.is_valid():
-            form.save()
+            keyword = form.save()
             messages.success(request, 'Keyword added successfully!')
+            _report_stale_analyses(request, keyword.industry)
             return redirect('manage_keywords')
     else:
         form = JobKeywordForm()
     
-    # Get all keywords grouped by industry
-    keywords_by_industry = {}
-    for industry_code, industry_name in JobKeyword.INDUSTRY_CHOICES:
-        keywords = JobKeyword.objects.filter(industry=industry_code).order_by('keyword')
-        if keywords.exists():
-            keywords_by_industry[industry_name] = keywords
+    # Get all keywords grouped by industry (one query, industries in choice order)
+    keywords_by_code = {}
+    for keyword in JobKeyword.objects.order_by('keyword'):
+        keywords_by_code.setdefault(keyword.industry, []).append(keyword)
+    keywords_by_industry = {
+        industry_name: keywords_by_code[industry_code]
+        for industry_code, industry_name in JobKeyword.INDUSTRY_CHOICES
+        if industry_code in keywords_by_code
+    }
     
     context = {
         'form': form,
@@ -171,9 +433,21 @@ def delete_keyword(request, keyword_id):
     if request.method == 'POST':
         keyword.delete()
         messages.success(request, f'Keyword "{keyword.keyword}" deleted successfully!')
+        _report_stale_analyses(request, keyword.industry)
     return redirect('manage_keywords')
 
 
+def _report_stale_analyses(request, industry):
+    """Tell keyword editors how many stored analyses an edit of an industry's keywords left outdated"""
+    stale = sum(stale_counts(affected_industries(industry)).values())
+    if stale:
+        messages.info(
+            request,
+            f'{stale} stored analyses were scored with older keywords. '
+            f'Run "python manage.py reanalyze_keywords" to update them.'
+        )
+
+
 def about(request):
     """About page explaining ATS and the tool"""
     return render(request, 'resume_analyzer/about.html')
@@ -182,3 +456,10 @@ def about(request):
 def tips(request):
     """Tips for creating ATS-friendly resumes"""
     return render(request, 'resume_analyzer/tips.html')
+
+
+def metrics(request):
+    """Analysis stage latency histograms for Prometheus (analyses run in this process)"""
+    if not getattr(settings, 'ANALYSIS_METRICS_ENABLED', True):
+        raise Http404
+    return HttpResponse(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
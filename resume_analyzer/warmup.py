@@ -0,0 +1,40 @@
+import importlib
+import time
+
+from django.conf import settings
+
+
+def warmup(industries=None, nltk_data=True, extraction_pool=True):
+    """Load heavy libraries and build per-process caches once, before the first resume
+    
+    Returns a list of (step, milliseconds) so callers can report cold-start cost.
+    """
+    from .keyword_catalog import get_catalog
+    from .readability import get_syllable_counter
+    from .utils import download_nltk_data
+    
+    timings = []
+    
+    def timed(step, func):
+        started = time.perf_counter()
+        func()
+        timings.append((step, (time.perf_counter() - started) * 1000))
+    
+    timed('import PyPDF2', lambda: importlib.import_module('PyPDF2'))
+    timed('hyphenation patterns', get_syllable_counter)
+    if nltk_data:
+        timed('nltk data', download_nltk_data)
+    for industry in industries or []:
+        timed(f'keyword catalog ({industry})', lambda: get_catalog(industry))
+    if extraction_pool and getattr(settings, 'RESUME_EXTRACTION_ISOLATED', True):
+        from .extraction_pool import get_extraction_pool
+        timed('extraction workers', lambda: get_extraction_pool().prestart())
+    
+    return timings
+
+
+def format_timings(timings):
+    """One-line summary of warmup timings"""
+    total = sum(ms for _, ms in timings)
+    steps = ', '.join(f'{step} {ms:.0f} ms' for step, ms in timings)
+    return f'{total:.0f} ms ({steps})'